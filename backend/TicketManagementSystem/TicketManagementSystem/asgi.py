@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'TicketManagementSystem.settings')
+# Persistent connections are not closed reliably under ASGI (request_finished may run on another thread
+# than the one holding the connection), so unless DB_CONN_MAX_AGE is set explicitly they are turned off;
+# use DB_POOL on PostgreSQL instead.
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,20 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Drop-in for rest_framework's JSONRenderer backed by orjson. Types orjson does not know
+    (Decimal, lazy translations, querysets, ...) fall back to DRF's JSONEncoder. UTC datetimes end in
+    Z, as DRF writes them, instead of orjson's +00:00.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=JSONEncoder().default, option=self.options)
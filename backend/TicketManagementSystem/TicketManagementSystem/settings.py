@@ -10,6 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import os
+import sys
+import tempfile
+from importlib.util import find_spec
 from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
@@ -36,6 +39,8 @@ INSTALLED_APPS = [
     'comment.apps.CommentConfig',
     'attachment.apps.AttachmentConfig',
     'users.apps.UsersConfig',
+    'metrics.apps.MetricsConfig',
+    'events.apps.EventsConfig',
     'rest_framework',
     'django_filters',
     "rest_framework_simplejwt.token_blacklist",
@@ -48,6 +53,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'metrics.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +65,9 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'TicketManagementSystem.urls'
 
+# Fraction of requests measured by RequestMetricsMiddleware (report at /api/metrics/)
+REQUEST_METRICS_SAMPLE_RATE = float(os.getenv('REQUEST_METRICS_SAMPLE_RATE', 0.05))
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -87,22 +96,79 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # Keep connections open across requests (seconds; 0 = one connection per request, None = forever).
+        # asgi.py defaults DB_CONN_MAX_AGE to 0: persistent connections are only for WSGI workers
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        # Ping a persistent connection before reusing it in a new request
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'true').lower() in ('1', 'true', 'yes'),
+        'OPTIONS': {},
     }
 }
 
+DB_POOL = os.getenv('DB_POOL', 'false').lower() in ('1', 'true', 'yes')
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['OPTIONS'] = {
+        # WAL lets readers run alongside the writer; NORMAL only syncs at checkpoints, which is safe with WAL
+        'init_command': (f"PRAGMA journal_mode={os.getenv('SQLITE_JOURNAL_MODE', 'WAL')};"
+                         f"PRAGMA synchronous={os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')}"),
+        # seconds a connection waits on a locked database before raising "database is locked"
+        'timeout': float(os.getenv('SQLITE_BUSY_TIMEOUT', 5)),
+        'transaction_mode': os.getenv('SQLITE_TRANSACTION_MODE') or None,
+    }
+elif DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql' and DB_POOL:
+    # psycopg 3's built-in pool (needs `psycopg[pool]` instead of psycopg2); Django requires CONN_MAX_AGE = 0
+    # with it, the pool keeps the connections instead
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+    }
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+TESTING = sys.argv[1:2] == ['test']
+
+if TESTING:
+    # File-based so the cache behaves like a shared one (values are pickled, nothing is kept by reference)
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(tempfile.gettempdir(), f'ticket-management-test-cache-{os.getpid()}'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+            'LOCATION': os.getenv('CACHE_LOCATION', 'ticket-management'),
+        }
+    }
+
+# 'orjson' renders/parses JSON with orjson when it is installed; 'json' keeps DRF's stdlib-based classes
+JSON_BACKEND = os.getenv('JSON_BACKEND', 'orjson' if find_spec('orjson') else 'json')
+# 'index' leaves title/username/email uniqueness to the unique indexes; 'query' checks with a SELECT first
+UNIQUE_CHECKS = os.getenv('UNIQUE_CHECKS', 'index')
+# Ticket responses are built by ticket.compiled instead of walking DRF serializer fields per row
+COMPILED_SERIALIZERS = os.getenv('COMPILED_SERIALIZERS', 'true').lower() in ('1', 'true', 'yes')
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
     # 'DEFAULT_PERMISSION_CLASSES': [
     #     'rest_framework.permissions.IsAuthenticated',
     # ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'TicketManagementSystem.renderers.ORJSONRenderer' if JSON_BACKEND == 'orjson'
+        else 'rest_framework.renderers.JSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'TicketManagementSystem.parsers.ORJSONParser' if JSON_BACKEND == 'orjson'
+        else 'rest_framework.parsers.JSONParser',
     ],
     # 'DEFAULT_THROTTLE_CLASSES': [
     #     'rest_framework.throttling.AnonRateThrottle',
@@ -127,6 +193,40 @@ SIMPLE_JWT = {
 
 AUTH_USER_MODEL = "users.CustomUser"
 
+# Seconds an authenticated user is served from the cache instead of the users table
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 60))
+USER_STATS_CACHE_TIMEOUT = int(os.getenv('USER_STATS_CACHE_TIMEOUT', 300))
+# Seconds list responses are cached (users.response_cache); 0 disables it. Off in tests by default:
+# TestCase rolls writes back without bumping the generation, so cached lists would outlive their data.
+LIST_CACHE_TIMEOUT = int(os.getenv('LIST_CACHE_TIMEOUT', 0 if TESTING else 30))
+
+# Ticket change feed (events app). The in-memory broker only reaches clients of the same process.
+EVENT_BACKEND = os.getenv('EVENT_BACKEND', 'events.backends.InMemoryEventBackend')
+EVENT_HISTORY_SIZE = int(os.getenv('EVENT_HISTORY_SIZE', 5000))
+EVENT_QUEUE_SIZE = int(os.getenv('EVENT_QUEUE_SIZE', 1000))
+EVENT_KEEPALIVE_SECONDS = int(os.getenv('EVENT_KEEPALIVE_SECONDS', 15))
+EVENT_RETRY_MILLISECONDS = int(os.getenv('EVENT_RETRY_MILLISECONDS', 3000))
+
+# Ticket activity log (ticket.activity): events are buffered in memory and written in batches by a
+# background thread. In tests they are written inline once a batch is full, or on activity.flush().
+# At most TICKET_EVENT_BUFFER_LIMIT events wait in memory; a batch failing TICKET_EVENT_MAX_ATTEMPTS
+# times in a row is written event by event, dropping the events the database rejects.
+TICKET_EVENT_BATCH_SIZE = int(os.getenv('TICKET_EVENT_BATCH_SIZE', 500))
+TICKET_EVENT_FLUSH_INTERVAL = float(os.getenv('TICKET_EVENT_FLUSH_INTERVAL', 1))
+TICKET_EVENT_BACKGROUND_FLUSH = not TESTING
+TICKET_EVENT_BUFFER_LIMIT = int(os.getenv('TICKET_EVENT_BUFFER_LIMIT', 50000))
+TICKET_EVENT_MAX_ATTEMPTS = int(os.getenv('TICKET_EVENT_MAX_ATTEMPTS', 3))
+
+# Service levels (ticket.sla): hours until the first response and the resolution are due, per priority.
+# Existing tickets keep their deadlines when this changes; run `recompute_sla_deadlines` to move them.
+TICKET_SLA_POLICIES = {
+    'HIGH': (1, 8),
+    'MEDIUM': (4, 24),
+    'LOW': (8, 72),
+}
+# Open tickets whose next deadline is closer than this are reported as 'at_risk'
+TICKET_SLA_AT_RISK_MINUTES = int(os.getenv('TICKET_SLA_AT_RISK_MINUTES', 60))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -164,6 +264,15 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Ticket attachments, stored by SHA-256 under ATTACHMENT_ROOT/blobs.
+# Set ATTACHMENT_SENDFILE_HEADER to X-Accel-Redirect (nginx, PREFIX = internal location) or X-Sendfile
+# (Apache, PREFIX = ATTACHMENT_ROOT + '/') to let the front-end server send the files.
+
+ATTACHMENT_ROOT = os.getenv('ATTACHMENT_ROOT', str(BASE_DIR / 'attachments'))
+ATTACHMENT_MAX_SIZE = int(os.getenv('ATTACHMENT_MAX_SIZE', 100 * 1024 * 1024))
+ATTACHMENT_SENDFILE_HEADER = os.getenv('ATTACHMENT_SENDFILE_HEADER')
+ATTACHMENT_SENDFILE_PREFIX = os.getenv('ATTACHMENT_SENDFILE_PREFIX', '/protected/attachments/')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
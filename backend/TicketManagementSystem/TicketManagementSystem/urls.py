@@ -21,4 +21,10 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/users/', include("users.urls")),
     path('api/tickets/', include("ticket.urls")),
+    path('api/tickets/', include("attachment.urls")),
+    path('api/metrics/', include("metrics.urls")),
+    # async (ASGI) variants of the hot read endpoints
+    path('api/async/tickets/', include("ticket.async_urls")),
+    path('api/async/users/', include("users.async_urls")),
+    path('api/events/', include("events.urls")),
 ]
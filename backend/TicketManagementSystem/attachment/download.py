@@ -0,0 +1,92 @@
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header
+
+from . import storage
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+UNSATISFIABLE = object()
+
+
+class FileRange:
+    """
+    File-like view of bytes [start, start + length) of an open file. It keeps `fileno()` so WSGI servers
+    with a file_wrapper (e.g. gunicorn) can still send the range with sendfile().
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    (first, last) byte positions of a single `bytes=` range, UNSATISFIABLE if it starts past the end,
+    or None when the whole file should be sent (no header, multiple ranges or a malformed value).
+    """
+    match = RANGE_RE.match(header or '')
+    if not match or match.groups() == ('', ''):
+        return None
+
+    first, last = match.groups()
+    if first == '':
+        first, last = max(size - int(last), 0), size - 1
+    else:
+        first, last = int(first), min(int(last), size - 1) if last else size - 1
+
+    if first > last or first >= size:
+        return UNSATISFIABLE
+    return first, last
+
+
+def download_response(request, attachment):
+    sha256 = attachment.blob_id
+    size = attachment.blob.size
+    etag = f'"{sha256}"'
+
+    if settings.ATTACHMENT_SENDFILE_HEADER:
+        # the front-end server reads the file itself and takes care of Range requests
+        response = HttpResponse(content_type=attachment.content_type)
+        response[settings.ATTACHMENT_SENDFILE_HEADER] = settings.ATTACHMENT_SENDFILE_PREFIX + storage.blob_name(sha256)
+        response['Content-Disposition'] = content_disposition_header(True, attachment.filename)
+        return response
+
+    byte_range = parse_range(request.headers.get('Range'), size)
+    if request.headers.get('If-Range', etag) != etag:
+        byte_range = None
+
+    if byte_range is UNSATISFIABLE:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    file = open(storage.blob_path(sha256), 'rb')
+    if byte_range is None:
+        response = FileResponse(file, as_attachment=True, filename=attachment.filename,
+                                content_type=attachment.content_type)
+    else:
+        first, last = byte_range
+        response = FileResponse(FileRange(file, first, last - first + 1), status=206, as_attachment=True,
+                                filename=attachment.filename, content_type=attachment.content_type)
+        response['Content-Range'] = f'bytes {first}-{last}/{size}'
+        response['Content-Length'] = last - first + 1
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    return response
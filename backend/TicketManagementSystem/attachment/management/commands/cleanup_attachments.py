@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from attachment import storage
+from attachment.models import Blob, Upload
+from attachment.uploads import abort_upload, remove_blob
+
+
+class Command(BaseCommand):
+    help = "Remove abandoned chunked uploads and stored files no attachment refers to any more."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=24,
+                            help="Hours since the last chunk after which an upload is abandoned")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['older_than'])
+
+        uploads = 0
+        for upload in Upload.objects.filter(updated_at__lt=cutoff).iterator():
+            abort_upload(upload)
+            uploads += 1
+
+        blobs = 0
+        for sha256 in Blob.objects.filter(attachments__isnull=True, created_at__lt=cutoff).values_list(
+                'sha256', flat=True).iterator():
+            blobs += remove_blob(sha256)
+
+        # chunks spooled by requests that died before cleaning up after themselves
+        for chunk in storage.part_path(0).parent.glob('*.chunk'):
+            if chunk.stat().st_mtime < cutoff.timestamp():
+                storage.remove(chunk)
+
+        self.stdout.write(f"Removed {uploads} abandoned uploads and {blobs} unreferenced files")
@@ -0,0 +1,9 @@
+from rest_framework.parsers import BaseParser
+
+
+class ChunkParser(BaseParser):
+    """Hands the raw request stream to the view, so upload chunks are copied to disk without being buffered."""
+    media_type = 'application/octet-stream'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
@@ -0,0 +1,26 @@
+from rest_framework.permissions import BasePermission
+
+from ticket.permissions import is_assigned
+from users.models import Role
+
+
+def can_access_ticket(request, ticket):
+    if request.user.role == Role.ADMIN:
+        return True
+    if request.user.role == Role.SUPPORT and is_assigned(request, ticket.id):
+        return True
+    return ticket.created_by_id == request.user.id
+
+
+class CanAccessTicket(BasePermission):
+    """Admins reach attachments of every ticket, users of their own tickets, support of assigned ones."""
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        return can_access_ticket(request, view.get_ticket())
+
+
+class IsUploadOwner(CanAccessTicket):
+    def has_object_permission(self, request, view, obj):
+        return obj.created_by_id == request.user.id
@@ -0,0 +1,46 @@
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+from comment.models import Comment
+from .models import Attachment, Upload
+
+
+class UploadCreateSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    content_type = serializers.CharField(max_length=100, default='application/octet-stream')
+    comment = serializers.IntegerField(required=False)
+
+    def validate_size(self, value):
+        if value > settings.ATTACHMENT_MAX_SIZE:
+            raise serializers.ValidationError(f"Attachments are limited to {settings.ATTACHMENT_MAX_SIZE} bytes")
+        return value
+
+    def validate_comment(self, value):
+        if not Comment.objects.filter(id=value, ticket_id=self.context['ticket_id']).exists():
+            raise serializers.ValidationError("Comment must belong to the same ticket")
+        return value
+
+
+class UploadResponseSerializer(serializers.ModelSerializer):
+    offset = serializers.IntegerField(source='received')
+
+    class Meta:
+        model = Upload
+        fields = ['id', 'ticket', 'comment', 'filename', 'content_type', 'size', 'offset', 'created_at']
+
+
+class AttachmentResponseSerializer(serializers.ModelSerializer):
+    size = serializers.IntegerField(source='blob.size')
+    sha256 = serializers.CharField(source='blob_id')
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Attachment
+        fields = ['id', 'ticket', 'comment', 'filename', 'content_type', 'size', 'sha256', 'created_by',
+                  'created_at', 'download_url']
+
+    def get_download_url(self, obj):
+        return reverse('attachments-download', kwargs={'ticket_id': obj.ticket_id, 'id': obj.id},
+                       request=self.context.get('request'))
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+BLOCK_SIZE = 64 * 1024
+
+
+def root():
+    return Path(settings.ATTACHMENT_ROOT)
+
+
+def part_path(upload_id):
+    return root() / 'uploads' / f'{upload_id}.part'
+
+
+def blob_name(sha256):
+    return f'blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def blob_path(sha256):
+    return root() / blob_name(sha256)
+
+
+def part_size(path):
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def write_chunk(path, offset, stream, length):
+    """
+    Copy up to `length` bytes of `stream` into the part file at `offset`, one block at a time.
+    Anything past `offset` (left over from an interrupted chunk) is truncated first. Returns the bytes written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, 'r+b' if path.exists() else 'wb') as part:
+        part.seek(offset)
+        part.truncate()
+        while written < length:
+            block = stream.read(min(BLOCK_SIZE, length - written))
+            if not block:
+                break
+            part.write(block)
+            written += len(block)
+    return written
+
+
+def spool_chunk(path, stream, length):
+    """
+    Copy up to `length` bytes of `stream` into a new temporary file next to the part file `path`.
+    Returns the temporary file's path and the bytes written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f'{path.name}.', suffix='.chunk', delete=False) as chunk:
+        chunk_path = Path(chunk.name)
+    return chunk_path, write_chunk(chunk_path, 0, stream, length)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def commit_part(path, sha256):
+    """
+    Move a finished part file into content-addressed storage, dropping it if the content is already
+    there. Called with the Blob row of `sha256` locked, so cleanup cannot remove the file in between.
+    """
+    target = blob_path(sha256)
+    if target.exists():
+        path.unlink()
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+
+
+def remove(path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
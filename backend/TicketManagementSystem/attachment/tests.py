@@ -1,3 +1,159 @@
-from django.test import TestCase
+import hashlib
+import shutil
+import tempfile
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.reverse import reverse
+
+from comment.models import Comment
+from ticket.tests.utils import BaseTest
+from . import storage
+from .models import Attachment, Blob, Upload
+from .uploads import append_chunk, remove_blob
+
+
+class AttachmentUploadTests(BaseTest):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(ATTACHMENT_ROOT=cls.root, ATTACHMENT_SENDFILE_HEADER=None)
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.authenticate(self.user_data1)
+        self.uploads_url = reverse('attachment_uploads-list', kwargs={'ticket_id': self.ticket1.id})
+        self.content = bytes(range(256)) * 40
+
+    def start(self, **extra):
+        response = self.client.post(self.uploads_url, {'filename': 'log.bin', 'size': len(self.content), **extra},
+                                    format='json')
+        self.assertEqual(response.status_code, 201)
+        return reverse('attachment_uploads-detail', kwargs={'ticket_id': self.ticket1.id, 'id': response.data['id']})
+
+    def send(self, url, offset, chunk):
+        return self.client.patch(url, chunk, content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset))
+
+    def upload(self, chunk_size=4000):
+        url = self.start()
+        for offset in range(0, len(self.content), chunk_size):
+            response = self.send(url, offset, self.content[offset:offset + chunk_size])
+        return response
+
+    def test_chunked_upload_and_resume(self):
+        url = self.start()
+        self.assertEqual(self.send(url, 0, self.content[:3000]).data['offset'], 3000)
+
+        response = self.send(url, 1000, self.content[1000:5000])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.get(url)['Upload-Offset'], '3000')
+
+        response = self.send(url, 3000, self.content[3000:])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['sha256'], hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(response.data['size'], len(self.content))
+        self.assertFalse(Upload.objects.exists())
+        self.assertEqual(storage.blob_path(response.data['sha256']).read_bytes(), self.content)
+
+    def test_losing_retry_leaves_part_untouched(self):
+        url = self.start()
+        self.send(url, 0, self.content[:3000])
+        upload = Upload.objects.get()
+
+        # a retry of the first chunk that passed the view's offset check before the original finished
+        self.assertIsNone(append_chunk(upload, 0, BytesIO(b'x' * 3000), 3000))
+        self.assertEqual(storage.part_path(upload.id).read_bytes(), self.content[:3000])
+        self.assertEqual(list(storage.part_path(upload.id).parent.glob('*.chunk')), [])
+
+    def test_identical_content_stored_once(self):
+        first = self.upload().data
+        second = self.upload(chunk_size=1024).data
+
+        self.assertNotEqual(first['id'], second['id'])
+        self.assertEqual(first['sha256'], second['sha256'])
+        self.assertEqual(Blob.objects.count(), 1)
+
+    def test_chunk_past_declared_size(self):
+        url = self.start()
+        response = self.send(url, 0, self.content + b'extra')
+        self.assertEqual(response.status_code, 400)
+
+    def test_comment_attachment(self):
+        comment = Comment.objects.create(created_by=self.user1, ticket=self.ticket2, comment_text="other ticket")
+        response = self.client.post(self.uploads_url, {'filename': 'a', 'size': 1, 'comment': comment.id},
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+
+        comment = Comment.objects.create(created_by=self.user1, ticket=self.ticket1, comment_text="with file")
+        url = self.start(comment=comment.id)
+        self.send(url, 0, self.content)
+        self.assertEqual(list(comment.attachments.values_list('filename', flat=True)), ['log.bin'])
+
+    def test_download_ranges(self):
+        attachment = self.upload().data
+        url = attachment['download_url']
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        response = self.client.get(url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.content)}')
+        self.assertEqual(b''.join(response.streaming_content), self.content[100:200])
+
+        response = self.client.get(url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-10:])
+
+        response = self.client.get(url, HTTP_RANGE='bytes=100-199', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+
+    @override_settings(ATTACHMENT_SENDFILE_HEADER='X-Accel-Redirect')
+    def test_download_sendfile(self):
+        attachment = self.upload().data
+        response = self.client.get(attachment['download_url'])
+        self.assertEqual(response['X-Accel-Redirect'],
+                         '/protected/attachments/' + storage.blob_name(attachment['sha256']))
+        self.assertEqual(response.content, b'')
+
+    def test_access(self):
+        attachment = self.upload().data
+        url = reverse('attachments-detail', kwargs={'ticket_id': self.ticket1.id, 'id': attachment['id']})
+
+        self.authenticate(self.user_data2)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        other_ticket_url = reverse('attachments-list', kwargs={'ticket_id': self.ticket2.id})
+        self.assertEqual(self.client.get(other_ticket_url).status_code, 403)
+
+    def test_cleanup_command(self):
+        self.start()
+        attachment = self.upload().data
+        Attachment.objects.all().delete()
+
+        call_command('cleanup_attachments', older_than=0, stdout=StringIO())
+
+        self.assertFalse(Upload.objects.exists())
+        self.assertFalse(Blob.objects.exists())
+        self.assertFalse(storage.blob_path(attachment['sha256']).exists())
+
+    def test_remove_blob_keeps_referenced_blob(self):
+        self.start()
+        attachment = self.upload().data
+
+        # the blob gained a reference after cleanup selected it
+        self.assertFalse(remove_blob(attachment['sha256']))
+        self.assertTrue(Blob.objects.filter(sha256=attachment['sha256']).exists())
+        self.assertTrue(storage.blob_path(attachment['sha256']).exists())
@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.utils import timezone
+
+from . import storage
+from .models import Attachment, Blob, Upload
+
+
+def append_chunk(upload, offset, stream, length):
+    """
+    Write a chunk at `offset` and advance the upload. Returns the new offset, or None when another
+    request moved the upload past `offset` in the meantime.
+
+    The chunk is spooled to a file of its own first and only copied into the part file by the request
+    that wins the compare-and-set on `received`, so a retry racing the original request at the same
+    offset never touches the part file.
+    """
+    part = storage.part_path(upload.id)
+    chunk, written = storage.spool_chunk(part, stream, length)
+    try:
+        advanced = Upload.objects.filter(id=upload.id, received=offset).update(
+            received=offset + written, updated_at=timezone.now())
+        if not advanced:
+            return None
+
+        with open(chunk, 'rb') as spooled:
+            storage.write_chunk(part, offset, spooled, written)
+    finally:
+        storage.remove(chunk)
+
+    upload.received = offset + written
+    return upload.received
+
+
+def complete_upload(upload):
+    """
+    Store the finished part under its digest and attach it. The Blob row is locked while the part is
+    deduplicated and the attachment inserted; cleanup_attachments takes the same lock before it
+    deletes a blob, so an attachment never ends up pointing at a removed file.
+    """
+    part = storage.part_path(upload.id)
+    sha256, size = storage.file_sha256(part), part.stat().st_size
+
+    with transaction.atomic():
+        # a new row is too recent for cleanup, so only an existing one needs the lock
+        blob = Blob.objects.select_for_update().filter(sha256=sha256).first()
+        if blob is None:
+            blob, _ = Blob.objects.get_or_create(sha256=sha256, defaults={'size': size})
+        storage.commit_part(part, sha256)
+        attachment = Attachment.objects.create(ticket_id=upload.ticket_id, comment_id=upload.comment_id, blob=blob,
+                                               filename=upload.filename, content_type=upload.content_type,
+                                               created_by_id=upload.created_by_id)
+        upload.delete()
+    return attachment
+
+
+def abort_upload(upload):
+    storage.remove(storage.part_path(upload.id))
+    upload.delete()
+
+
+def remove_blob(sha256):
+    """
+    Delete an unreferenced blob and its file with the row locked, as complete_upload locks it to reuse
+    the file; the reference check is repeated under the lock. Returns whether it was removed.
+    """
+    with transaction.atomic():
+        blob = Blob.objects.select_for_update().filter(sha256=sha256).first()
+        if blob is None or Attachment.objects.filter(blob=blob).exists():
+            return False
+        blob.delete()
+        storage.remove(storage.blob_path(sha256))
+    return True
@@ -0,0 +1,11 @@
+from rest_framework.routers import SimpleRouter
+
+from .views import AttachmentUploadViewSet, AttachmentViewSet
+
+attachment_router = SimpleRouter()
+
+attachment_router.register(r'(?P<ticket_id>\d+)/attachments/uploads', AttachmentUploadViewSet,
+                           basename='attachment_uploads')
+attachment_router.register(r'(?P<ticket_id>\d+)/attachments', AttachmentViewSet, basename='attachments')
+
+urlpatterns = attachment_router.urls
@@ -1,3 +1,111 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
 
-# Create your views here.
+from ticket.models import Ticket
+from . import storage
+from .download import download_response
+from .models import Attachment, Upload
+from .parsers import ChunkParser
+from .permissions import CanAccessTicket, IsUploadOwner
+from .serializers import AttachmentResponseSerializer, UploadCreateSerializer, UploadResponseSerializer
+from .uploads import abort_upload, append_chunk, complete_upload
+
+
+class TicketAttachmentMixin:
+    def get_ticket(self):
+        if not hasattr(self, '_ticket'):
+            self._ticket = get_object_or_404(Ticket.objects.only('id', 'created_by_id'), id=self.kwargs['ticket_id'])
+        return self._ticket
+
+
+class AttachmentUploadViewSet(TicketAttachmentMixin, viewsets.ViewSet):
+    """
+    Resumable uploads: POST declares the file, each PATCH appends an `application/octet-stream` chunk at
+    the `Upload-Offset` header, GET tells the offset to resume from. The last chunk turns the upload
+    into an attachment.
+    """
+    permission_classes = [IsUploadOwner]
+    parser_classes = [JSONParser, ChunkParser]
+    lookup_field = 'id'
+    lookup_value_regex = '[0-9a-f-]{36}'
+
+    def get_upload(self):
+        upload = get_object_or_404(Upload, id=self.kwargs['id'], ticket_id=self.kwargs['ticket_id'])
+        self.check_object_permissions(self.request, upload)
+        return upload
+
+    def offset_response(self, upload, status=200):
+        response = Response(UploadResponseSerializer(upload).data, status=status)
+        response['Upload-Offset'] = upload.received
+        return response
+
+    def create(self, request, *args, **kwargs):
+        serializer = UploadCreateSerializer(data=request.data, context={'ticket_id': self.kwargs['ticket_id']})
+        serializer.is_valid(raise_exception=True)
+
+        upload = Upload.objects.create(ticket=self.get_ticket(), comment_id=serializer.validated_data.get('comment'),
+                                       created_by=request.user, filename=serializer.validated_data['filename'],
+                                       content_type=serializer.validated_data['content_type'],
+                                       size=serializer.validated_data['size'])
+        return self.offset_response(upload, status=201)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.offset_response(self.get_upload())
+
+    def partial_update(self, request, *args, **kwargs):
+        upload = self.get_upload()
+
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers.get('Content-Length') or 0)
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset and Content-Length headers are required"}, status=400)
+
+        if storage.part_size(storage.part_path(upload.id)) < upload.received:
+            # the part file lost data (e.g. moved to another host): the client has to resend from there
+            Upload.objects.filter(id=upload.id).update(received=storage.part_size(storage.part_path(upload.id)))
+            upload.refresh_from_db()
+        if offset != upload.received:
+            return Response({"error": "Offset does not match the uploaded size", "offset": upload.received},
+                            status=409)
+        if length > upload.size - offset:
+            return Response({"error": "Chunk exceeds the declared file size"}, status=400)
+
+        stream = request.data if hasattr(request.data, 'read') else None
+        received = append_chunk(upload, offset, stream, length) if stream else offset
+        if received is None:
+            upload.refresh_from_db()
+            return Response({"error": "Offset does not match the uploaded size", "offset": upload.received},
+                            status=409)
+
+        if received < upload.size:
+            return self.offset_response(upload)
+
+        attachment = complete_upload(upload)
+        return Response(AttachmentResponseSerializer(attachment, context={'request': request}).data, status=201)
+
+    def destroy(self, request, *args, **kwargs):
+        abort_upload(self.get_upload())
+        return Response(status=204)
+
+
+class AttachmentViewSet(TicketAttachmentMixin, viewsets.ReadOnlyModelViewSet):
+    permission_classes = [CanAccessTicket]
+    serializer_class = AttachmentResponseSerializer
+    lookup_field = 'id'
+    lookup_value_regex = r'\d+'
+
+    def get_queryset(self):
+        queryset = Attachment.objects.filter(ticket_id=self.kwargs['ticket_id']).select_related('blob').order_by('id')
+        comment = self.request.query_params.get('comment')
+        if comment and comment.isdigit():
+            queryset = queryset.filter(comment_id=comment)
+        return queryset
+
+    @action(detail=True, methods=['get'], url_path='download')
+    def download(self, request, ticket_id=None, id=None):
+        """Stream the file; honours single `Range` requests and `If-Range` against the content hash ETag."""
+        return download_response(request, self.get_object())
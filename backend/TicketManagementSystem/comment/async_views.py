@@ -0,0 +1,13 @@
+from django.shortcuts import aget_object_or_404
+
+from ticket.models import Ticket
+from users.async_views import async_api_view, json_response
+from .models import Comment
+from .serializers import CommentResponseSerializer
+
+
+@async_api_view()
+async def comment_list(request, ticket_id):
+    ticket = await aget_object_or_404(Ticket.objects.only('id'), id=ticket_id)
+    comments = [comment async for comment in Comment.objects.filter(ticket=ticket).for_response()]
+    return json_response(CommentResponseSerializer(comments, many=True, context={'request': request}).data)
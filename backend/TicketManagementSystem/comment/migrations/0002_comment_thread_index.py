@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comment', '0001_initial'),
+        ('ticket', '0008_ticket_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['ticket', 'parent', 'created_on'], name='comment_ticket_thread_idx'),
+        ),
+    ]
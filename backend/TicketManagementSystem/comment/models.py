@@ -1,11 +1,60 @@
 from users.models import CustomUser
 from django.db import models
+from django.db.models.expressions import RawSQL
 from ticket.models import Ticket
 
 
+class CommentQuerySet(models.QuerySet):
+    def for_response(self):
+        return self.select_related('created_by', 'ticket', 'parent')
+
+    def descendants(self, root_ids, depth=None):
+        """Replies below `root_ids` (at most `depth` levels deep), fetched with a single recursive query."""
+        table = self.model._meta.db_table
+        placeholders = ', '.join(['%s'] * len(root_ids))
+        depth_limit = 'WHERE thread.depth < %s' if depth is not None else ''
+        params = list(root_ids) + ([depth] if depth is not None else [])
+
+        thread = RawSQL(
+            f"WITH RECURSIVE thread(id, depth) AS ("
+            f"SELECT id, 1 FROM {table} WHERE parent_id IN ({placeholders}) "
+            f"UNION ALL "
+            f"SELECT child.id, thread.depth + 1 FROM {table} child JOIN thread ON child.parent_id = thread.id "
+            f"{depth_limit}) "
+            f"SELECT id FROM thread",
+            params
+        )
+        return self.filter(id__in=thread)
+
+
 class Comment(models.Model):
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name='comments')
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='children')
     comment_text = models.TextField(max_length=500)
-    created_on = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # thread roots: ticket=?, parent IS NULL, ordered by created_on
+            models.Index(fields=['ticket', 'parent', 'created_on'], name='comment_ticket_thread_idx'),
+        ]
+
+
+def build_thread(ticket, roots, replies):
+    """Nest `replies` under their parents in memory; every comment gets a `thread_replies` list."""
+    nodes = {comment.id: comment for comment in roots}
+    nodes.update((comment.id, comment) for comment in replies)
+
+    for comment in nodes.values():
+        comment.ticket = ticket
+        comment.thread_replies = []
+
+    for comment in sorted(replies, key=lambda c: (c.created_on, c.id)):
+        parent = nodes[comment.parent_id]
+        comment.parent = parent
+        parent.thread_replies.append(comment)
+
+    return roots
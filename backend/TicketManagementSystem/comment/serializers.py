@@ -50,6 +50,17 @@ class CommentResponseSerializer(serializers.ModelSerializer):
         fields = ['id', 'created_by', 'ticket', 'parent', 'comment_text', 'created_on']
 
 
+class CommentThreadSerializer(CommentResponseSerializer):
+    replies = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Comment
+        fields = CommentResponseSerializer.Meta.fields + ['replies']
+
+    def get_replies(self, obj):
+        return CommentThreadSerializer(obj.thread_replies, many=True, context=self.context).data
+
+
 class AdminCreateCommentSerializer(serializers.ModelSerializer):
     created_by = serializers.IntegerField(required=True)
     parent = serializers.IntegerField(required=False)
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from ticket import counters, sla
+from users.response_cache import TICKETS, bump_generation
+from .models import Comment
+
+
+@receiver(post_save, sender=Comment)
+def count_created_comment(sender, instance, created, **kwargs):
+    if created:
+        counters.bump(instance.ticket_id, 'comment_count', 1)
+        sla.respond(instance.ticket_id, instance.created_by_id)
+    else:
+        counters.touch(instance.ticket_id)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    counters.bump(instance.ticket_id, 'comment_count', -1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_ticket_lists(sender, **kwargs):
+    bump_generation(TICKETS)
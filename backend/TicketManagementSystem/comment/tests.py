@@ -1,3 +1,66 @@
-from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
 
-# Create your tests here.
+from ticket.tests.utils import BaseTest
+from .models import Comment
+
+
+class CommentThreadTests(BaseTest):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.thread_url = reverse('user_comments-thread', kwargs={'ticket_id': cls.ticket1.id})
+
+        cls.root = Comment.objects.create(created_by=cls.user1, ticket=cls.ticket1, comment_text="root")
+        cls.reply = Comment.objects.create(created_by=cls.user2, ticket=cls.ticket1, parent=cls.root,
+                                           comment_text="reply")
+        cls.nested_reply = Comment.objects.create(created_by=cls.user1, ticket=cls.ticket1, parent=cls.reply,
+                                                  comment_text="nested reply")
+        cls.second_root = Comment.objects.create(created_by=cls.user1, ticket=cls.ticket1, comment_text="second root")
+
+    def setUp(self):
+        self.authenticate(self.user_data1)
+
+    def test_thread_nests_replies(self):
+        response = self.client.get(self.thread_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+
+        root = response.data['results'][0]
+        self.assertEqual(root['id'], self.root.id)
+        self.assertEqual(root['replies'][0]['id'], self.reply.id)
+        self.assertEqual(root['replies'][0]['parent']['id'], self.root.id)
+        self.assertEqual(root['replies'][0]['replies'][0]['id'], self.nested_reply.id)
+        self.assertEqual(response.data['results'][1]['replies'], [])
+
+    def test_thread_depth_limit(self):
+        response = self.client.get(self.thread_url, {'depth': 1})
+        reply = response.data['results'][0]['replies'][0]
+        self.assertEqual(reply['id'], self.reply.id)
+        self.assertEqual(reply['replies'], [])
+
+        response = self.client.get(self.thread_url, {'depth': 0})
+        self.assertEqual(response.data['results'][0]['replies'], [])
+
+    def test_thread_invalid_depth(self):
+        response = self.client.get(self.thread_url, {'depth': 'deep'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_thread_query_count_is_constant(self):
+        self.client.get(self.thread_url)
+        with CaptureQueriesContext(connection) as small_thread:
+            self.client.get(self.thread_url)
+
+        parent = self.nested_reply
+        for i in range(10):
+            parent = Comment.objects.create(created_by=self.user2, ticket=self.ticket1, parent=parent,
+                                            comment_text=f"deeper {i}")
+            Comment.objects.create(created_by=self.user1, ticket=self.ticket1, parent=self.root,
+                                   comment_text=f"sibling {i}")
+
+        with CaptureQueriesContext(connection) as large_thread:
+            self.client.get(self.thread_url)
+
+        self.assertEqual(len(small_thread.captured_queries), len(large_thread.captured_queries))
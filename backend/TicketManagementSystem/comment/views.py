@@ -1,17 +1,20 @@
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets
-from .models import Comment
+from .models import Comment, build_thread
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from .permissions import IsCommentOwner
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 
 
 from .serializers import (CommentResponseSerializer, CommentCreateSerializer, CommentUpdateSerializer,
-                          AdminUpdateCommentSerializer, AdminResponseCommentSerializer, AdminCreateCommentSerializer)
+                          CommentThreadSerializer, AdminUpdateCommentSerializer, AdminResponseCommentSerializer,
+                          AdminCreateCommentSerializer)
 
+from metrics.collector import serializing
 from ticket.models import Ticket
 
 from users.permissions import IsSuperUserPermission
@@ -29,13 +32,13 @@ class CommentViewSet(viewsets.ModelViewSet):
         return CommentResponseSerializer
 
     def get_permissions(self):
-        if self.action in ['create', 'retrieve', 'list']:
+        if self.action in ['create', 'retrieve', 'list', 'thread']:
             return [IsAuthenticated()]
         else:
             return [IsCommentOwner()]
 
     def get_queryset(self):
-        return Comment.objects.filter(ticket__id=self.kwargs['ticket_id'])
+        return Comment.objects.filter(ticket__id=self.kwargs['ticket_id']).for_response()
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -60,7 +63,7 @@ class CommentViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         ticket = Ticket.objects.get(id=self.kwargs['ticket_id'])
 
-        queryset = ticket.comments.all()
+        queryset = ticket.comments.for_response()
         serializer = CommentResponseSerializer(queryset, many=True, context={'request': request})
         return Response(serializer.data)
 
@@ -91,6 +94,37 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer = CommentResponseSerializer(queryset, many=True, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['get'], url_path='thread')
+    def thread(self, request, ticket_id=None):
+        """
+        Root comments of the ticket, paginated, each with its replies nested under `replies`.
+        `?depth=N` limits how many reply levels are returned.
+        """
+        ticket = get_object_or_404(Ticket, id=ticket_id)
+
+        depth = request.query_params.get('depth')
+        if depth is not None:
+            if not depth.isdigit():
+                raise ValidationError({"depth": "Must be a non-negative integer"})
+            depth = int(depth)
+
+        roots = (Comment.objects.filter(ticket=ticket, parent__isnull=True)
+                 .select_related('created_by').order_by('created_on', 'id'))
+        page = self.paginate_queryset(roots)
+        roots = list(page if page is not None else roots)
+
+        replies = []
+        if roots and depth != 0:
+            replies = list(Comment.objects.descendants([root.id for root in roots], depth)
+                           .select_related('created_by'))
+
+        with serializing(request):
+            data = CommentThreadSerializer(build_thread(ticket, roots, replies), many=True,
+                                           context={'request': request}).data
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data, status=status.HTTP_200_OK)
+
 
 class AdminCommentViewSet(viewsets.ModelViewSet):
     permission_classes = [IsSuperUserPermission]
@@ -103,7 +137,7 @@ class AdminCommentViewSet(viewsets.ModelViewSet):
         return AdminResponseCommentSerializer
 
     def get_queryset(self):
-        return Comment.objects.filter(ticket_id=self.kwargs['ticket_id'])
+        return Comment.objects.filter(ticket_id=self.kwargs['ticket_id']).for_response()
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -0,0 +1,119 @@
+import asyncio
+import functools
+import json
+import threading
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+class Event:
+    def __init__(self, id, type, payload):
+        self.id = id
+        self.type = type
+        self.payload = payload
+        self.created_at = timezone.now()
+
+    def to_sse(self):
+        data = json.dumps({'id': self.id, 'type': self.type, 'created_at': self.created_at.isoformat(),
+                           **self.payload})
+        return f"id: {self.id}\nevent: {self.type}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """Queue of one connected client, living on the event loop that serves its stream."""
+
+    def __init__(self, channels, queue_size):
+        self.channels = frozenset(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def push(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class BaseEventBackend:
+    """
+    Fans events out to subscribers by channel ("user:<id>", "role:<role>") and keeps a short history
+    for `Last-Event-ID` resume. Backends for multi-process deployments (e.g. Redis pub/sub plus a capped
+    stream for the history) implement the same methods.
+    """
+
+    def publish(self, channels, type, payload):
+        raise NotImplementedError
+
+    def subscribe(self, channels):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def since(self, channels, last_id):
+        """Events on `channels` after `last_id`, or None when the history no longer reaches back that far."""
+        raise NotImplementedError
+
+
+class InMemoryEventBackend(BaseEventBackend):
+    """Single-process broker: every worker process only sees the events published in it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_id = 0
+        self.history = deque(maxlen=settings.EVENT_HISTORY_SIZE)
+        self.subscribers = defaultdict(set)
+
+    def publish(self, channels, type, payload):
+        channels = frozenset(channels)
+        with self.lock:
+            self.last_id += 1
+            event = Event(self.last_id, type, payload)
+            self.history.append((channels, event))
+            targets = {subscription for channel in channels for subscription in self.subscribers.get(channel, ())}
+
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # the loop of a client that went away is already closed
+                self.unsubscribe(subscription)
+        return event
+
+    def subscribe(self, channels):
+        subscription = Subscription(channels, settings.EVENT_QUEUE_SIZE)
+        with self.lock:
+            for channel in subscription.channels:
+                self.subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                self.subscribers[channel].discard(subscription)
+                if not self.subscribers[channel]:
+                    del self.subscribers[channel]
+
+    def since(self, channels, last_id):
+        with self.lock:
+            oldest = self.history[0][1].id if self.history else self.last_id + 1
+            if last_id > self.last_id or last_id < oldest - 1:
+                return None
+            return [event for event_channels, event in self.history
+                    if event.id > last_id and event_channels & channels]
+
+
+@functools.cache
+def get_event_backend():
+    """The process-wide broker; cached because subscribers and history live in the instance."""
+    return import_string(settings.EVENT_BACKEND)()
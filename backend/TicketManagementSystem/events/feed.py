@@ -0,0 +1,51 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from ticket.models import Ticket
+from users.models import Role
+from .backends import get_event_backend
+
+ADMIN_CHANNEL = f'role:{Role.ADMIN}'
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+def channels_for(user):
+    """Channels a user's stream listens on: their own, plus every ticket event for admins."""
+    channels = {user_channel(user.id)}
+    if user.role == Role.ADMIN:
+        channels.add(ADMIN_CHANNEL)
+    return channels
+
+
+def ticket_audiences(ticket_ids):
+    """{ticket_id: user ids of the creator and assignees}, in two queries."""
+    audiences = defaultdict(set)
+    for ticket_id, created_by_id in Ticket.objects.filter(id__in=ticket_ids).values_list('id', 'created_by_id'):
+        audiences[ticket_id].add(created_by_id)
+    for ticket_id, user_id in Ticket.assigned_to.through.objects.filter(ticket_id__in=ticket_ids).values_list(
+            'ticket_id', 'customuser_id'):
+        audiences[ticket_id].add(user_id)
+    return audiences
+
+
+def publish(type, ticket_ids, payload=None, user_ids=()):
+    """
+    Publish one event per ticket once the current transaction commits, to everyone involved in the ticket
+    (creator, assignees at commit time, `user_ids`) and to admins.
+    """
+    ticket_ids = list(ticket_ids)
+    if not ticket_ids:
+        return
+
+    def send():
+        audiences = ticket_audiences(ticket_ids)
+        backend = get_event_backend()
+        for ticket_id in ticket_ids:
+            channels = {user_channel(user_id) for user_id in audiences[ticket_id] | set(user_ids)}
+            backend.publish(channels | {ADMIN_CHANNEL}, type, {'ticket': ticket_id, **(payload or {})})
+
+    transaction.on_commit(send)
@@ -0,0 +1,69 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from comment.models import Comment
+from ticket.models import Ticket, SupportTicketMarks
+from ticket.signals import tickets_bulk_changed
+from . import feed
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, created, **kwargs):
+    feed.publish('ticket.created' if created else 'ticket.updated', [instance.pk],
+                 {'status': instance.status, 'priority': instance.priority})
+
+
+@receiver(tickets_bulk_changed, sender=Ticket)
+def tickets_bulk_saved(sender, action, ticket_ids, **kwargs):
+    feed.publish(f'ticket.{action}', ticket_ids)
+
+
+@receiver(pre_delete, sender=Ticket)
+def remember_ticket_audience(sender, instance, **kwargs):
+    instance._event_user_ids = feed.ticket_audiences([instance.pk])[instance.pk]
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs):
+    feed.publish('ticket.deleted', [instance.pk], user_ids=getattr(instance, '_event_user_ids', ()))
+
+
+@receiver(post_save, sender=SupportTicketMarks)
+def mark_saved(sender, instance, created, **kwargs):
+    feed.publish('mark.created' if created else 'mark.updated', [instance.ticket_id],
+                 {'mark': instance.pk, 'support_status': instance.support_status})
+
+
+@receiver(post_delete, sender=SupportTicketMarks)
+def mark_deleted(sender, instance, **kwargs):
+    feed.publish('mark.deleted', [instance.ticket_id], {'mark': instance.pk})
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    feed.publish('comment.created' if created else 'comment.updated', [instance.ticket_id],
+                 {'comment': instance.pk})
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    feed.publish('comment.deleted', [instance.ticket_id], {'comment': instance.pk})
+
+
+@receiver(m2m_changed, sender=Ticket.assigned_to.through)
+def assignment_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """take/release and admin (re)assignment; unassigned users are told as well."""
+    if action == 'pre_clear':
+        instance._event_cleared_ids = set(
+            (instance.assigned_supports if reverse else instance.assigned_to).values_list('pk', flat=True))
+        return
+    if action == 'post_clear':
+        action, pk_set = 'post_remove', getattr(instance, '_event_cleared_ids', set())
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+
+    event_type = 'ticket.assigned' if action == 'post_add' else 'ticket.unassigned'
+    if not reverse:
+        feed.publish(event_type, [instance.pk], {'users': sorted(pk_set)}, user_ids=pk_set)
+    else:
+        feed.publish(event_type, pk_set, {'users': [instance.pk]}, user_ids=[instance.pk])
@@ -0,0 +1,102 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from rest_framework.reverse import reverse
+
+from ticket.bulk import bulk_close_tickets
+from ticket.tests.utils import BaseTest
+from comment.models import Comment
+from .backends import get_event_backend
+from .feed import ADMIN_CHANNEL, user_channel
+from .views import ASGIRequired, event_stream
+
+
+class TicketEventTests(BaseTest):
+
+    def setUp(self):
+        get_event_backend.cache_clear()
+        self.backend = get_event_backend()
+
+    def events_for(self, user):
+        return [(event.type, event.payload['ticket']) for event in self.backend.since({user_channel(user.id)}, 0)]
+
+    def test_changes_reach_creator_assignees_and_admins(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ticket1.assigned_to.add(self.user3)
+            self.ticket1.assigned_to.remove(self.user2)
+            Comment.objects.create(created_by=self.user1, ticket=self.ticket2, comment_text="Some comment")
+
+        self.assertEqual(self.events_for(self.user1), [('ticket.assigned', self.ticket1.id),
+                                                       ('ticket.unassigned', self.ticket1.id),
+                                                       ('comment.created', self.ticket2.id)])
+        # audiences are taken at commit time: user2 only hears about being released
+        self.assertEqual(self.events_for(self.user2), [('ticket.unassigned', self.ticket1.id)])
+        self.assertEqual(len(self.backend.since({ADMIN_CHANNEL}, 0)), 3)
+
+    def test_take_release_and_bulk_close(self):
+        self.authenticate(self.user_data2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('ticket_support-take', kwargs={'id': self.ticket2.id}))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('ticket_support-release', kwargs={'id': self.ticket2.id}))
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_close_tickets([self.ticket1.id])
+
+        self.assertEqual(self.events_for(self.user2), [('ticket.assigned', self.ticket2.id),
+                                                       ('ticket.unassigned', self.ticket2.id),
+                                                       ('ticket.updated', self.ticket1.id)])
+
+    def test_rolled_back_changes_are_not_published(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.ticket1.save()
+        self.assertEqual(self.events_for(self.user1), [])
+
+    @override_settings(EVENT_HISTORY_SIZE=2)
+    def test_history_gap(self):
+        get_event_backend.cache_clear()
+        backend = get_event_backend()
+        for _ in range(3):
+            backend.publish({'user:1'}, 'ticket.updated', {'ticket': 1})
+
+        self.assertIsNone(backend.since({'user:1'}, 0))
+        self.assertEqual([event.id for event in backend.since({'user:1'}, 1)], [2, 3])
+        self.assertIsNone(backend.since({'user:1'}, 10))
+
+    async def read(self, stream):
+        return await asyncio.wait_for(anext(stream), timeout=5)
+
+    async def test_stream_resumes_and_delivers_live_events(self):
+        token = (await self.async_client.post(reverse('token_obtain_pair'), {
+            "username": self.user_data1["username"], "password": self.user_data1["password"]},
+            content_type='application/json')).json()['access']
+        first = self.backend.publish({user_channel(self.user1.id)}, 'ticket.updated', {'ticket': self.ticket1.id})
+        second = self.backend.publish({user_channel(self.user1.id)}, 'comment.created', {'ticket': self.ticket1.id})
+        self.backend.publish({user_channel(self.user2.id)}, 'ticket.updated', {'ticket': self.ticket2.id})
+
+        response = await self.async_client.get(reverse('ticket_events'), headers={
+            'Authorization': f'Bearer {token}', 'Last-Event-ID': str(first.id)})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        stream = response.streaming_content
+        self.assertTrue((await self.read(stream)).startswith(b'retry:'))
+        self.assertTrue((await self.read(stream)).startswith(f'id: {second.id}\nevent: comment.created'.encode()))
+
+        await sync_to_async(self.backend.publish)({user_channel(self.user1.id)}, 'ticket.deleted',
+                                                  {'ticket': self.ticket1.id})
+        self.assertIn(b'event: ticket.deleted', await self.read(stream))
+
+    def test_stream_refused_under_wsgi(self):
+        self.authenticate(self.user_data1)
+        response = self.client.get(reverse('ticket_events'))
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(response.json()['detail'], ASGIRequired.default_detail)
+        self.assertEqual(self.backend.subscribers, {})
+
+    async def test_stream_unsubscribes_on_disconnect(self):
+        stream = event_stream(self.backend, {user_channel(self.user1.id)}, None)
+        await self.read(stream)
+        self.assertIn(user_channel(self.user1.id), self.backend.subscribers)
+
+        await stream.aclose()
+        self.assertEqual(self.backend.subscribers, {})
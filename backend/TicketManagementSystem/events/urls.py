@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import ticket_events
+
+urlpatterns = [
+    path('', ticket_events, name='ticket_events'),
+]
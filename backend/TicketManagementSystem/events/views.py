@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import exceptions, status
+
+from users.async_views import async_api_view
+from .backends import get_event_backend
+from .feed import channels_for
+
+
+async def event_stream(backend, channels, last_id):
+    """
+    SSE body: replays the events missed since `last_id`, then waits for new ones, sending a comment line
+    every EVENT_KEEPALIVE_SECONDS. A `reset` event tells the client its position is lost and it must refetch.
+    """
+    subscription = backend.subscribe(channels)
+    try:
+        yield f"retry: {settings.EVENT_RETRY_MILLISECONDS}\n\n"
+
+        if last_id is not None:
+            missed = backend.since(subscription.channels, last_id)
+            if missed is None:
+                yield "event: reset\ndata: {}\n\n"
+            else:
+                for event in missed:
+                    last_id = event.id
+                    yield event.to_sse()
+
+        while True:
+            event = await subscription.get(settings.EVENT_KEEPALIVE_SECONDS)
+            if subscription.overflowed:
+                subscription.overflowed = False
+                yield "event: reset\ndata: {}\n\n"
+            if event is None:
+                yield ": keepalive\n\n"
+            elif last_id is None or event.id > last_id:
+                # events published while the history was replayed are both replayed and queued
+                last_id = event.id
+                yield event.to_sse()
+    finally:
+        backend.unsubscribe(subscription)
+
+
+class ASGIRequired(exceptions.APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = "The event stream is only served over ASGI (TicketManagementSystem.asgi)."
+    default_code = 'asgi_required'
+
+
+@async_api_view()
+async def ticket_events(request):
+    """
+    Server-Sent Events feed of changes to the tickets the user created or is assigned to (all, for admins).
+
+    Needs ASGI (e.g. `uvicorn TicketManagementSystem.asgi:application`): under WSGI Django collects an
+    async streaming body in full before sending it, and this stream never ends, so such requests get a
+    501 instead of a connection that never receives a byte.
+    """
+    if not isinstance(request._request, ASGIRequest):
+        raise ASGIRequired()
+
+    last_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+    last_id = int(last_id) if last_id and last_id.isdigit() else None
+
+    response = StreamingHttpResponse(event_stream(get_event_backend(), channels_for(request.user), last_id),
+                                     content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,356 @@
+import random
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Max
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient, APIRequestFactory
+
+from comment.models import Comment
+from ticket import compiled, rollups, sla
+from ticket.counters import repair_counters
+from ticket.models import Ticket, SupportTicketMarks
+from ticket.search import get_search_backend
+from ticket.serializers import (AdminTicketResponseSerializer, SupportTicketResponseSerializer,
+                                TicketResponseSerializer)
+from users.models import CustomUser, Role
+from users.response_cache import TICKETS, USERS, bump_generation
+from users.stats import invalidate_user_stats
+
+BENCH_PASSWORD = 'Bench-password-1'
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+
+def seed(users=100, supports=10, tickets=1000, assignees=2, marks=1, comments=5, comment_depth=3,
+         batch_size=1000, rng=None):
+    """Bulk-insert a synthetic data set; returns the number of rows created per model."""
+    rng = rng or random.Random(0)
+    password = make_password(BENCH_PASSWORD)
+    # numbered past the highest id, not the row count: after deletions a count can repeat taken names
+    user_offset = next_id(CustomUser)
+    ticket_offset = next_id(Ticket)
+
+    def make_users(role, count):
+        prefix = f"bench_{role.lower()}"
+        return [CustomUser(username=f"{prefix}_{user_offset + i}", email=f"{prefix}_{user_offset + i}@bench.local",
+                           password=password, role=role, is_staff=role != Role.USER,
+                           is_superuser=role == Role.ADMIN)
+                for i in range(count)]
+
+    with transaction.atomic():
+        regular = CustomUser.objects.bulk_create(make_users(Role.USER, users), batch_size=batch_size)
+        support = CustomUser.objects.bulk_create(make_users(Role.SUPPORT, supports), batch_size=batch_size)
+        CustomUser.objects.bulk_create(make_users(Role.ADMIN, 1))
+        invalidate_user_stats()
+        bump_generation(USERS)
+
+        now = timezone.now()
+        ticket_objects = []
+        for i in range(tickets):
+            status = rng.choice(Ticket.Status.values)
+            priority = rng.choice(Ticket.Priority.values)
+            closed = status == Ticket.Status.CLOSED
+            ticket_objects.append(Ticket(
+                title=f"Bench {ticket_offset + i}",
+                description=f"Synthetic ticket {ticket_offset + i} for benchmarks",
+                status=status,
+                priority=priority,
+                created_by=rng.choice(regular),
+                completed_by=rng.choice(support) if closed else None,
+                closed_at=now - timedelta(minutes=rng.randint(0, 60 * 24 * 30)) if closed else None,
+                first_responded_at=None if status == Ticket.Status.OPEN else now,
+                # deadlines as if opened over the last three days: a mix of breached, due soon and on track
+                **sla.deadlines(now - timedelta(minutes=rng.randint(0, 60 * 24 * 3)), priority),
+            ))
+
+        created_tickets = []
+        for batch in chunks(ticket_objects, batch_size):
+            created_tickets += Ticket.objects.bulk_create(batch)
+            get_search_backend().index_many(batch)
+
+        through = Ticket.assigned_to.through
+        assignments = {
+            ticket.id: rng.sample(support, min(assignees, len(support))) for ticket in created_tickets
+        }
+        through.objects.bulk_create(
+            [through(ticket_id=ticket_id, customuser_id=user.id)
+             for ticket_id, assigned in assignments.items() for user in assigned],
+            batch_size=batch_size
+        )
+
+        created_marks = SupportTicketMarks.objects.bulk_create(
+            [SupportTicketMarks(ticket_id=ticket_id, support_user=rng.choice(assigned),
+                                support_status=rng.choice(SupportTicketMarks.SUPPORT_STATUS.values))
+             for ticket_id, assigned in assignments.items() if assigned for _ in range(marks)],
+            batch_size=batch_size
+        )
+
+        comment_count = seed_comments(created_tickets, regular + support, comments, comment_depth, batch_size, rng)
+        repair_counters(Ticket.objects.filter(id__in=[ticket.id for ticket in created_tickets]))
+        rollups.refresh_hours([ticket.created_at for ticket in created_tickets])
+        bump_generation(TICKETS)
+
+    return {'users': users + supports + 1, 'tickets': tickets, 'assignments': sum(map(len, assignments.values())),
+            'marks': len(created_marks), 'comments': comment_count}
+
+
+def seed_comments(tickets, authors, per_ticket, depth, batch_size, rng):
+    """Comments are created level by level so that every reply can point at an already inserted parent."""
+    levels = max(depth, 1)
+    per_level = [per_ticket // levels + (1 if level < per_ticket % levels else 0) for level in range(levels)]
+
+    parents = {ticket.id: [None] for ticket in tickets}
+    total = 0
+    for count in per_level:
+        level = [Comment(ticket_id=ticket_id, parent=rng.choice(candidates), created_by=rng.choice(authors),
+                         comment_text=f"Synthetic comment on ticket {ticket_id}")
+                 for ticket_id, candidates in parents.items() for _ in range(count)]
+        created = Comment.objects.bulk_create(level, batch_size=batch_size)
+        total += len(created)
+
+        parents = {}
+        for comment in created:
+            parents.setdefault(comment.ticket_id, []).append(comment)
+    return total
+
+
+def bench_users():
+    return {
+        role: CustomUser.objects.filter(role=role, username__startswith='bench_').order_by('id').first()
+        for role in (Role.USER, Role.SUPPORT, Role.ADMIN)
+    }
+
+
+def endpoints():
+    """(name, role, method, url, body) for every benchmarked request."""
+    users = bench_users()
+    if not all(users.values()):
+        raise ValueError("No benchmark users found, run `manage.py seed_data` first")
+
+    ticket = Ticket.objects.filter(created_by=users[Role.USER]).order_by('id').first()
+    token_body = {'username': users[Role.USER].username, 'password': BENCH_PASSWORD}
+
+    result = [
+        ('token_obtain', None, 'post', reverse('token_obtain_pair'), token_body),
+        ('user_tickets', Role.USER, 'get', reverse('ticket-list'), None),
+        ('support_tickets', Role.SUPPORT, 'get', reverse('ticket_support-list'), None),
+        ('admin_tickets', Role.ADMIN, 'get', reverse('ticket_admin-list'), None),
+        ('admin_most_active', Role.ADMIN, 'get', reverse('ticket_admin-most-active-support'), None),
+        ('admin_users_by_role', Role.ADMIN, 'get', reverse('admin_count_roles'), None),
+        ('admin_users_active', Role.ADMIN, 'get', reverse('admin_count_active'), None),
+        ('admin_users_stats', Role.ADMIN, 'get', reverse('admin_user_stats'), None),
+        ('users_me', Role.USER, 'get', reverse('users_me'), None),
+    ]
+    if ticket:
+        result += [
+            ('comments', Role.USER, 'get', reverse('user_comments-list', kwargs={'ticket_id': ticket.id}), None),
+            ('comment_thread', Role.USER, 'get', reverse('user_comments-thread', kwargs={'ticket_id': ticket.id}),
+             None),
+        ]
+    return result, users
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def login(client, users):
+    tokens = {}
+    for role, user in users.items():
+        response = client.post(reverse('token_obtain_pair'),
+                               {'username': user.username, 'password': BENCH_PASSWORD}, format='json')
+        tokens[role] = response.data['access']
+    return tokens
+
+
+def measure(client, method, url, body, repeat, warmup, recycle=False):
+    """
+    Latency/query stats of `repeat` identical requests. With `recycle`, connections are closed or kept
+    after each request the way the request handler does (the test client skips that).
+    """
+    latencies, queries, errors = [], [], 0
+    for i in range(warmup + repeat):
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            if method == 'get':
+                response = client.get(url)
+            else:
+                response = getattr(client, method)(url, body, format='json')
+            if recycle:
+                close_old_connections()
+            elapsed = time.perf_counter() - started
+        if i < warmup:
+            continue
+        latencies.append(elapsed)
+        queries.append(len(context.captured_queries))
+        errors += response.status_code >= 400
+
+    return {
+        'url': url,
+        'requests': repeat,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'queries': round(statistics.mean(queries), 2),
+        'throughput_rps': round(repeat / sum(latencies), 2),
+    }
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'], REQUEST_METRICS_SAMPLE_RATE=0.0)
+def run(repeat=20, warmup=2):
+    requests, users = endpoints()
+    client = APIClient()
+    tokens = login(client, users)
+
+    report = {}
+    for name, role, method, url, body in requests:
+        if role:
+            client.credentials(HTTP_AUTHORIZATION='Bearer ' + tokens[role])
+        else:
+            client.credentials()
+        report[name] = measure(client, method, url, body, repeat, warmup)
+
+    return {'commit': git_commit(), 'created_at': timezone.now().isoformat(), 'repeat': repeat, 'endpoints': report}
+
+
+CONNECTION_VARIANTS = {
+    'per_request': {'CONN_MAX_AGE': 0},
+    'persistent': {'CONN_MAX_AGE': 60},
+}
+SQLITE_VARIANTS = {
+    'per_request': {'CONN_MAX_AGE': 0, 'init_command': 'PRAGMA journal_mode=DELETE;PRAGMA synchronous=FULL'},
+    'persistent': {'CONN_MAX_AGE': 60, 'init_command': 'PRAGMA journal_mode=DELETE;PRAGMA synchronous=FULL'},
+    'persistent_wal': {'CONN_MAX_AGE': 60, 'init_command': 'PRAGMA journal_mode=WAL;PRAGMA synchronous=NORMAL'},
+}
+
+
+@contextmanager
+def connection_settings(conn_max_age, init_command=None):
+    """Reconnect the default database with another CONN_MAX_AGE (and SQLite init_command) for the block."""
+    settings_dict = connection.settings_dict
+    saved = settings_dict['CONN_MAX_AGE'], dict(settings_dict['OPTIONS'])
+    connection.close()
+    settings_dict['CONN_MAX_AGE'] = conn_max_age
+    if init_command is not None:
+        settings_dict['OPTIONS']['init_command'] = init_command
+    try:
+        yield
+    finally:
+        connection.close()
+        settings_dict['CONN_MAX_AGE'], settings_dict['OPTIONS'] = saved
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'], REQUEST_METRICS_SAMPLE_RATE=0.0)
+def run_connections(repeat=200, warmup=5, names=('users_me', 'user_tickets', 'users_update')):
+    """
+    Requests per second of cheap endpoints with one connection per request, persistent connections and,
+    on SQLite, persistent WAL connections. The pool option of PostgreSQL is fixed when the process
+    starts: compare it by running this twice with and without DB_POOL.
+    """
+    requests, users = endpoints()
+    user = users[Role.USER]
+    requests.append(('users_update', Role.USER, 'put', reverse('user-detail', kwargs={'id': user.id}),
+                     {'email': user.email}))
+    client = APIClient()
+    tokens = login(client, users)
+
+    variants = SQLITE_VARIANTS if connection.vendor == 'sqlite' else CONNECTION_VARIANTS
+    report = {}
+    for variant, options in variants.items():
+        with connection_settings(options['CONN_MAX_AGE'], options.get('init_command')):
+            report[variant] = {}
+            for name, role, method, url, body in requests:
+                if name in names:
+                    client.credentials(HTTP_AUTHORIZATION='Bearer ' + tokens[role])
+                    report[variant][name] = measure(client, method, url, body, repeat, warmup, recycle=True)
+
+    return {'commit': git_commit(), 'created_at': timezone.now().isoformat(), 'repeat': repeat,
+            'vendor': connection.vendor, 'connections': report}
+
+
+def compare(current, baseline):
+    """Per-endpoint relative change of p50/p95/queries against an earlier result file."""
+    changes = {}
+    for name, stats in current['endpoints'].items():
+        previous = baseline['endpoints'].get(name)
+        if not previous:
+            continue
+        changes[name] = {
+            metric: round((stats[metric] - previous[metric]) / previous[metric] * 100, 1) if previous[metric] else None
+            for metric in ('p50_ms', 'p95_ms', 'queries')
+        }
+    return changes
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+def run_serializers(rows=100, repeat=20, warmup=2):
+    """
+    Time rendering a `rows`-ticket page: DRF serializer + JSONRenderer against ticket.compiled + the
+    configured default renderer (orjson when JSON_BACKEND is 'orjson').
+    """
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    request = Request(APIRequestFactory().get('/'))
+    cases = [
+        ('user', TicketResponseSerializer, Ticket.objects.for_user()),
+        ('support', SupportTicketResponseSerializer, Ticket.objects.for_support()),
+        ('admin', AdminTicketResponseSerializer, Ticket.objects.for_admin()),
+    ]
+    paths = {
+        'drf': lambda serializer_class, page: JSONRenderer().render(
+            serializer_class(page, many=True, context={'request': request}).data),
+        'compiled': lambda serializer_class, page: renderer.render(
+            compiled.serialize(serializer_class, page, request, many=True)),
+    }
+
+    report = {}
+    for name, serializer_class, queryset in cases:
+        page = list(queryset.order_by('-created_at')[:rows])
+        if not page:
+            raise ValueError("No tickets found, run `manage.py seed_data` first")
+
+        timings = {}
+        for path, render in paths.items():
+            latencies = []
+            for i in range(warmup + repeat):
+                started = time.perf_counter()
+                render(serializer_class, page)
+                if i >= warmup:
+                    latencies.append(time.perf_counter() - started)
+            timings[path] = percentile(latencies, 0.5)
+
+        report[name] = {
+            'rows': len(page),
+            'drf_p50_ms': round(timings['drf'] * 1000, 3),
+            'compiled_p50_ms': round(timings['compiled'] * 1000, 3),
+            'speedup': round(timings['drf'] / timings['compiled'], 2),
+        }
+
+    return {'commit': git_commit(), 'created_at': timezone.now().isoformat(), 'repeat': repeat, 'serializers': report}
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+
+class RequestMetrics:
+    """Measurements of one sampled request; passed to the DB execute wrapper while the view runs."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+        self.serializer_time = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.query_count += 1
+            self.statements[sql] += 1
+
+    def start_render(self):
+        self.render_started = time.perf_counter()
+
+    def finish_render(self, response):
+        self.render_time = time.perf_counter() - self.render_started
+
+
+@contextmanager
+def serializing(request):
+    """
+    Count the block as serializer time of `request` if it is sampled. Views wrap the code that builds
+    the response data (serializer `.data`); queries run lazily in there count as SQL time too.
+    """
+    metrics = getattr(request, 'request_metrics', None)
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - started
+
+
+class EndpointStats:
+    def __init__(self, window):
+        self.requests = 0
+        self.queries = 0
+        self.sql_time = 0.0
+        self.render_time = 0.0
+        self.serializer_time = 0.0
+        self.latencies = deque(maxlen=window)
+        self.max_queries = 0
+        self.duplicates = {}
+
+    def add(self, metrics, latency, duplicate_threshold):
+        self.requests += 1
+        self.queries += metrics.query_count
+        self.sql_time += metrics.sql_time
+        self.render_time += metrics.render_time
+        self.serializer_time += metrics.serializer_time
+        self.latencies.append(latency)
+        self.max_queries = max(self.max_queries, metrics.query_count)
+
+        for sql, repeats in metrics.statements.items():
+            if repeats >= duplicate_threshold:
+                self.duplicates[sql] = max(self.duplicates.get(sql, 0), repeats)
+
+    def percentile(self, fraction):
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def report(self):
+        return {
+            'requests': self.requests,
+            'avg_queries': round(self.queries / self.requests, 2),
+            'max_queries': self.max_queries,
+            'avg_sql_ms': round(self.sql_time / self.requests * 1000, 3),
+            'avg_serializer_ms': round(self.serializer_time / self.requests * 1000, 3),
+            'avg_render_ms': round(self.render_time / self.requests * 1000, 3),
+            'p50_ms': round(self.percentile(0.5) * 1000, 3),
+            'p95_ms': round(self.percentile(0.95) * 1000, 3),
+            'duplicated_sql': [{'sql': sql, 'max_repeats': repeats}
+                               for sql, repeats in sorted(self.duplicates.items(), key=lambda item: -item[1])],
+        }
+
+
+class MetricsCollector:
+    """Per-process aggregate of sampled requests, keyed by resolved URL name."""
+
+    def __init__(self, window=500, duplicate_threshold=3):
+        self.window = window
+        self.duplicate_threshold = duplicate_threshold
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, url_name, metrics):
+        latency = time.perf_counter() - metrics.started
+        with self.lock:
+            stats = self.endpoints.setdefault(url_name, EndpointStats(self.window))
+            stats.add(metrics, latency, self.duplicate_threshold)
+
+    def report(self):
+        with self.lock:
+            return {url_name: stats.report() for url_name, stats in sorted(self.endpoints.items())}
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+
+
+collector = MetricsCollector()
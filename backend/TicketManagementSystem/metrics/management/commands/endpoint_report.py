@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from metrics.collector import collector
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Request API paths through the test client and print the per-endpoint query/latency report."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help="Paths to GET, e.g. /api/tickets/admin/")
+        parser.add_argument('--user', help="Username to authenticate as")
+        parser.add_argument('--repeat', type=int, default=10, help="Requests per path")
+
+    def handle(self, *args, **options):
+        client = APIClient()
+        if options['user']:
+            try:
+                client.force_authenticate(user=CustomUser.objects.get(username=options['user']))
+            except CustomUser.DoesNotExist:
+                raise CommandError(f"User {options['user']} does not exist")
+
+        collector.reset()
+        with override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0, ALLOWED_HOSTS=['testserver']):
+            for _ in range(options['repeat']):
+                for path in options['paths']:
+                    client.get(path)
+
+        self.stdout.write(json.dumps(collector.report(), indent=2))
@@ -0,0 +1,41 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from metrics.benchmark import compare, run, run_connections, run_serializers
+
+
+class Command(BaseCommand):
+    help = "Benchmark the main API endpoints against the seeded database and report p50/p95, queries and throughput."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help="Measured requests per endpoint")
+        parser.add_argument('--warmup', type=int, default=2, help="Unmeasured requests per endpoint")
+        parser.add_argument('--output', help="Write the JSON result to this file")
+        parser.add_argument('--compare', help="Earlier JSON result to compare against")
+        parser.add_argument('--serializers', action='store_true',
+                            help="Compare DRF and compiled rendering of ticket pages instead of the endpoints")
+        parser.add_argument('--rows', type=int, default=100, help="Tickets per page with --serializers")
+        parser.add_argument('--connections', action='store_true',
+                            help="Compare requests per second with per-request and persistent connections")
+
+    def handle(self, *args, **options):
+        try:
+            if options['serializers']:
+                result = run_serializers(rows=options['rows'], repeat=options['repeat'], warmup=options['warmup'])
+            elif options['connections']:
+                result = run_connections(repeat=options['repeat'], warmup=options['warmup'])
+            else:
+                result = run(repeat=options['repeat'], warmup=options['warmup'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['compare'] and 'endpoints' in result:
+            with open(options['compare']) as baseline:
+                result['change_percent'] = compare(result, json.load(baseline))
+
+        output = json.dumps(result, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output)
+        self.stdout.write(output)
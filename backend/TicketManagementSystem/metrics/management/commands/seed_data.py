@@ -0,0 +1,35 @@
+import random
+
+from django.core.management.base import BaseCommand
+
+from metrics.benchmark import seed
+
+
+class Command(BaseCommand):
+    help = "Bulk-insert synthetic users, tickets, assignments, support marks and comment trees for benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--supports', type=int, default=10)
+        parser.add_argument('--tickets', type=int, default=1000)
+        parser.add_argument('--assignees', type=int, default=2, help="Support users assigned per ticket")
+        parser.add_argument('--marks', type=int, default=1, help="Support marks per ticket")
+        parser.add_argument('--comments', type=int, default=5, help="Comments per ticket")
+        parser.add_argument('--comment-depth', type=int, default=3)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=0, help="Random seed, for reproducible data sets")
+
+    def handle(self, *args, **options):
+        created = seed(
+            users=options['users'],
+            supports=options['supports'],
+            tickets=options['tickets'],
+            assignees=options['assignees'],
+            marks=options['marks'],
+            comments=options['comments'],
+            comment_depth=options['comment_depth'],
+            batch_size=options['batch_size'],
+            rng=random.Random(options['seed']),
+        )
+        for name, count in created.items():
+            self.stdout.write(f"{name}: {count}")
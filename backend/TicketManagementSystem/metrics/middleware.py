@@ -0,0 +1,59 @@
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+from .collector import RequestMetrics, collector
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, SQL time, serializer time (blocks marked with metrics.collector.serializing),
+    response render time and latency for a sample of requests (REQUEST_METRICS_SAMPLE_RATE, 0..1);
+    unsampled requests only pay for one random() call. Under ASGI it stays async so async views are
+    not pushed into a thread; their queries run in the ORM's executor thread, so for them only
+    latency and render time are recorded.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if random.random() >= settings.REQUEST_METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        request.request_metrics = metrics
+        with connection.execute_wrapper(metrics):
+            response = self.get_response(request)
+
+        if request.resolver_match and request.resolver_match.view_name:
+            collector.record(request.resolver_match.view_name, metrics)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= settings.REQUEST_METRICS_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        request.request_metrics = metrics
+        response = await self.get_response(request)
+
+        if request.resolver_match and request.resolver_match.view_name:
+            collector.record(request.resolver_match.view_name, metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        metrics = getattr(request, 'request_metrics', None)
+        if metrics is not None:
+            metrics.start_render()
+            response.add_post_render_callback(metrics.finish_render)
+        return response
@@ -0,0 +1,38 @@
+import re
+from contextlib import contextmanager
+
+from django.db import connection
+
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+class QueryRecorder:
+    """DB execute wrapper keeping (sql, params) of every SELECT run while it is installed."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def record_queries():
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        yield recorder.queries
+
+
+def explain(sql, params=()):
+    """SQLite's EXPLAIN QUERY PLAN of a statement, one detail string per plan step."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def full_scans(plan):
+    """Tables the plan reads row by row without any index."""
+    tables = set(connection.introspection.table_names())
+    return [match[1] for match in map(FULL_SCAN.match, plan) if match and match[1] in tables]
@@ -0,0 +1,135 @@
+import json
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from comment.models import Comment
+from ticket.models import Ticket
+from ticket.tests.utils import BaseTest
+from users.models import CustomUser
+from .benchmark import compare
+from .collector import MetricsCollector, RequestMetrics, collector
+
+
+@override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0)
+class RequestMetricsMiddlewareTests(BaseTest):
+
+    def setUp(self):
+        collector.reset()
+        self.authenticate(self.user_data3)
+
+    def test_requests_recorded_per_url_name(self):
+        self.client.get(self.admin_ticket_url)
+        self.client.get(self.admin_ticket_url)
+
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+
+        stats = response.data['endpoints']['ticket_admin-list']
+        self.assertEqual(stats['requests'], 2)
+        self.assertGreater(stats['avg_queries'], 0)
+        self.assertGreater(stats['avg_serializer_ms'], 0)
+        self.assertLess(stats['avg_serializer_ms'], stats['p95_ms'])
+        self.assertGreater(stats['p95_ms'], 0)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_not_recorded(self):
+        self.client.get(self.admin_ticket_url)
+        self.assertNotIn('ticket_admin-list', collector.report())
+
+    def test_report_admin_only(self):
+        self.authenticate(self.user_data1)
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_reset(self):
+        self.client.get(self.admin_ticket_url)
+        self.client.delete('/api/metrics/')
+        self.assertNotIn('ticket_admin-list', collector.report())
+
+    def test_endpoint_report_command(self):
+        out = StringIO()
+        call_command('endpoint_report', self.admin_ticket_url, user='admin', repeat=2, stdout=out)
+        self.assertIn('"ticket_admin-list"', out.getvalue())
+
+
+class MetricsCollectorTests(SimpleTestCase):
+
+    def test_duplicated_statements_flagged(self):
+        metrics_collector = MetricsCollector(duplicate_threshold=3)
+        metrics = RequestMetrics()
+        for _ in range(5):
+            metrics(lambda *args: None, 'SELECT * FROM users_customuser WHERE id = %s', [1], False, {})
+        metrics(lambda *args: None, 'SELECT * FROM ticket_ticket', [], False, {})
+
+        metrics_collector.record('ticket_admin-list', metrics)
+
+        report = metrics_collector.report()['ticket_admin-list']
+        self.assertEqual(report['avg_queries'], 6)
+        self.assertEqual(report['duplicated_sql'],
+                         [{'sql': 'SELECT * FROM users_customuser WHERE id = %s', 'max_repeats': 5}])
+
+
+class BenchmarkTests(TestCase):
+
+    def test_seed_and_run(self):
+        call_command('seed_data', users=3, supports=2, tickets=5, comments=4, comment_depth=2, stdout=StringIO())
+
+        self.assertEqual(CustomUser.objects.count(), 6)
+        self.assertEqual(Ticket.objects.count(), 5)
+        self.assertEqual(Comment.objects.count(), 20)
+        self.assertEqual(Comment.objects.filter(parent__isnull=False).count(), 10)
+
+        out = StringIO()
+        call_command('run_benchmarks', repeat=2, warmup=0, stdout=out)
+        result = json.loads(out.getvalue())
+
+        self.assertIn('admin_tickets', result['endpoints'])
+        self.assertIn('comment_thread', result['endpoints'])
+        for stats in result['endpoints'].values():
+            self.assertEqual(stats['errors'], 0)
+
+        self.assertEqual(compare(result, result)['admin_tickets']['p50_ms'], 0.0)
+
+    def test_seed_again_after_deletions(self):
+        call_command('seed_data', users=3, supports=2, tickets=5, comments=0, stdout=StringIO())
+        Ticket.objects.order_by('id').first().delete()
+        CustomUser.objects.filter(role='SUPPORT').order_by('id').first().delete()
+
+        call_command('seed_data', users=3, supports=2, tickets=5, comments=0, stdout=StringIO())
+        self.assertEqual(Ticket.objects.count(), 9)
+
+    def test_serializer_benchmark(self):
+        call_command('seed_data', users=3, supports=2, tickets=5, comments=0, stdout=StringIO())
+
+        out = StringIO()
+        call_command('run_benchmarks', serializers=True, repeat=2, warmup=0, stdout=out)
+        result = json.loads(out.getvalue())
+
+        self.assertEqual(set(result['serializers']), {'user', 'support', 'admin'})
+        self.assertEqual(result['serializers']['admin']['rows'], 5)
+
+    def test_connection_benchmark(self):
+        call_command('seed_data', users=3, supports=2, tickets=5, comments=0, stdout=StringIO())
+
+        out = StringIO()
+        call_command('run_benchmarks', connections=True, repeat=2, warmup=0, stdout=out)
+        result = json.loads(out.getvalue())
+
+        self.assertIn('persistent', result['connections'])
+        for endpoints in result['connections'].values():
+            self.assertEqual(set(endpoints), {'users_me', 'user_tickets', 'users_update'})
+            self.assertEqual([stats['errors'] for stats in endpoints.values()], [0, 0, 0])
+
+    @skipUnless(connection.vendor == 'sqlite', "SQLite connection pragmas")
+    def test_sqlite_pragmas_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            self.assertEqual(cursor.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+            self.assertEqual(cursor.execute('PRAGMA busy_timeout').fetchone()[0], 5000)
+
+    def test_run_without_seed(self):
+        with self.assertRaises(CommandError):
+            call_command('run_benchmarks', stdout=StringIO())
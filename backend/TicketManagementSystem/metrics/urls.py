@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import MetricsReportView
+
+urlpatterns = [
+    path('', MetricsReportView.as_view(), name='metrics_report'),
+]
@@ -0,0 +1,17 @@
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from users.permissions import IsSuperUserPermission
+from .collector import collector
+
+
+class MetricsReportView(APIView):
+    """Per-endpoint latency/query report of this worker process."""
+    permission_classes = [IsSuperUserPermission]
+
+    def get(self, request, *args, **kwargs):
+        return Response({"endpoints": collector.report()})
+
+    def delete(self, request, *args, **kwargs):
+        collector.reset()
+        return Response({"message": "Metrics have been reset"}, status=200)
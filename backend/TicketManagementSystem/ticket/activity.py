@@ -0,0 +1,187 @@
+"""
+Write-behind ticket event log. Transitions are captured from signals (and explicitly by the bulk
+endpoints), queued in memory once their transaction commits, and written with bulk_create by a
+daemon thread, so a request only pays for appending to a list.
+"""
+import atexit
+import contextvars
+import functools
+import logging
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework.decorators import action
+
+from .models import Ticket, TicketEvent
+
+logger = logging.getLogger(__name__)
+
+TRACKED_FIELDS = ('title', 'status', 'priority', 'completed_by_id')
+
+# id of the user whose request is running; set by TicketActivityMixin
+current_actor = contextvars.ContextVar('ticket_activity_actor', default=None)
+
+
+class EventBuffer:
+    """
+    Events waiting to be written. `add` only appends under a lock; a daemon thread writes them every
+    `interval` seconds, or as soon as `batch_size` are waiting. Without the thread (`background` off,
+    as in tests) a full batch is written by the caller and the rest waits for `flush()`.
+
+    At most `max_events` are kept (the oldest are dropped beyond that, while the database is down).
+    A batch that fails `max_attempts` times in a row is written one event at a time, and the events
+    the database still rejects are logged and dropped, so one bad event cannot block the log.
+    """
+
+    def __init__(self, batch_size, interval, background=True, max_events=None, max_attempts=3):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.background = background
+        self.max_events = max_events or 100 * batch_size
+        self.max_attempts = max_attempts
+        self.failures = 0
+        self.events = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def add(self, events):
+        with self.lock:
+            self.events.extend(events)
+            self.trim()
+            full = len(self.events) >= self.batch_size
+            if self.background and self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='ticket-events', daemon=True)
+                self.thread.start()
+                atexit.register(self.flush)
+
+        if full:
+            if self.background:
+                self.wakeup.set()
+            else:
+                # add() runs in on_commit callbacks: a failed write must not fail the caller's request
+                try:
+                    self.flush()
+                except DatabaseError:
+                    logger.exception("Could not write ticket events, keeping them for the next flush")
+
+    def trim(self):
+        dropped = len(self.events) - self.max_events
+        if dropped > 0:
+            del self.events[:dropped]
+            logger.error("Ticket event buffer is full, dropped the %s oldest events", dropped)
+
+    def flush(self):
+        """Write everything queued so far; returns the number of events written."""
+        with self.lock:
+            events, self.events = self.events, []
+        if not events:
+            return 0
+
+        try:
+            with transaction.atomic():
+                TicketEvent.objects.bulk_create(events, batch_size=self.batch_size)
+        except DatabaseError:
+            self.failures += 1
+            if self.failures < self.max_attempts:
+                with self.lock:
+                    self.events[:0] = events
+                    self.trim()
+                raise
+            self.failures = 0
+            return self.write_each(events)
+        self.failures = 0
+        return len(events)
+
+    def write_each(self, events):
+        written = 0
+        for event in events:
+            try:
+                with transaction.atomic():
+                    event.save(force_insert=True)
+                written += 1
+            except DatabaseError:
+                logger.exception("Dropped %s event of ticket %s", event.action, event.ticket_id)
+        return written
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except DatabaseError:
+                logger.exception("Could not write ticket events, retrying in %s s", self.interval)
+            finally:
+                close_old_connections()
+
+
+@functools.cache
+def get_buffer():
+    return EventBuffer(settings.TICKET_EVENT_BATCH_SIZE, settings.TICKET_EVENT_FLUSH_INTERVAL,
+                       settings.TICKET_EVENT_BACKGROUND_FLUSH, settings.TICKET_EVENT_BUFFER_LIMIT,
+                       settings.TICKET_EVENT_MAX_ATTEMPTS)
+
+
+def flush():
+    return get_buffer().flush()
+
+
+def as_text(value):
+    return None if value is None else str(value)[:255]
+
+
+def event(ticket_id, action, field='', old=None, new=None):
+    return TicketEvent(ticket_id=ticket_id, actor_id=current_actor.get(), action=action, field=field,
+                       old_value=as_text(old), new_value=as_text(new), created_at=timezone.now())
+
+
+def record(events):
+    """Queue `events` once the current transaction commits; they are dropped if it rolls back."""
+    events = list(events)
+    if events:
+        transaction.on_commit(lambda: get_buffer().add(events))
+
+
+def changes(ticket):
+    """CHANGED events for the tracked fields that differ from the values the ticket was loaded with."""
+    before, now = getattr(ticket, '_loaded', {}), ticket.loaded_values()
+    return [event(ticket.pk, TicketEvent.Action.CHANGED, field.removesuffix('_id'), before[field], now[field])
+            for field in TRACKED_FIELDS if field in before and field in now and before[field] != now[field]]
+
+
+def assignments(ticket_ids_with_users, action):
+    return [event(ticket_id, action, 'assigned_to', new=user_id) for ticket_id, user_id in ticket_ids_with_users]
+
+
+class TicketActivityMixin:
+    """
+    Ticket viewset mixin: events recorded while a request runs are attributed to request.user, and
+    `<ticket>/events/` lists a ticket's log oldest first with keyset pagination.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._actor_token = current_actor.set(request.user.id)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_actor_token', None)
+        if token is not None:
+            current_actor.reset(token)
+            self._actor_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    @action(detail=True, methods=['get'], url_path='events')
+    def events(self, request, id=None):
+        from .pagination import TicketEventPagination
+        from .serializers import TicketEventSerializer
+
+        ticket = get_object_or_404(Ticket.objects.only('id', 'created_by'), id=id)
+        self.check_object_permissions(request, ticket)
+
+        paginator = TicketEventPagination()
+        page = paginator.paginate_queryset(TicketEvent.objects.filter(ticket_id=ticket.id), request, view=self)
+        return paginator.get_paginated_response(TicketEventSerializer(page, many=True).data)
@@ -0,0 +1,117 @@
+"""
+Load-aware assignment of new tickets to support staff, run by the `assign_tickets` worker.
+
+Open-ticket counts per support user are kept in memory in a min-heap, so picking the least loaded
+support is O(log n) and needs no query; the worker reconciles them with the database periodically
+(tickets closed, taken or released in the meantime only show up then). Unassigned open tickets are
+read from a partial index, highest priority first, and assigned in batches with a constant number
+of statements per batch.
+"""
+import heapq
+
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from users.models import CustomUser, Role
+from . import activity
+from .counters import recount_assignees
+from .models import Ticket, TicketEvent
+from .signals import tickets_bulk_changed
+
+PRIORITY_ORDER = (Ticket.Priority.HIGH, Ticket.Priority.MEDIUM, Ticket.Priority.LOW)
+
+
+class SupportLoad:
+    """Open-ticket count per active support user, as a heap of (count, user id)."""
+
+    def __init__(self, counts=()):
+        self.reset(counts)
+
+    def reset(self, counts):
+        self.counts = dict(counts)
+        self.heap = [(count, user_id) for user_id, count in self.counts.items()]
+        heapq.heapify(self.heap)
+
+    def reconcile(self):
+        """Reload the counts with one grouped query over the active support users."""
+        open_tickets = Count('assigned_supports', filter=~Q(assigned_supports__status=Ticket.Status.CLOSED))
+        self.reset(CustomUser.objects.filter(role=Role.SUPPORT, is_active=True)
+                   .annotate(open_count=open_tickets).values_list('id', 'open_count'))
+
+    def pick(self):
+        """The least loaded support (lowest id on a tie), counted as one ticket busier; None without supports."""
+        while self.heap:
+            count, user_id = self.heap[0]
+            if self.counts.get(user_id) != count:
+                heapq.heappop(self.heap)  # left behind by unpick()
+                continue
+            heapq.heapreplace(self.heap, (count + 1, user_id))
+            self.counts[user_id] = count + 1
+            return user_id
+        return None
+
+    def unpick(self, user_id):
+        """Undo a pick() whose ticket was not assigned after all."""
+        self.counts[user_id] -= 1
+        heapq.heappush(self.heap, (self.counts[user_id], user_id))
+
+
+def unassigned_tickets(limit):
+    """Ids of up to `limit` open tickets without assignees, highest priority and oldest first."""
+    ticket_ids = []
+    for priority in PRIORITY_ORDER:
+        if len(ticket_ids) >= limit:
+            break
+        # skip_locked lets several workers share the queue; it is ignored where rows cannot be locked
+        ticket_ids += (Ticket.objects.select_for_update(skip_locked=True)
+                       .filter(status=Ticket.Status.OPEN, assignee_count=0, priority=priority)
+                       .order_by('id').values_list('id', flat=True)[:limit - len(ticket_ids)])
+    return ticket_ids
+
+
+def assign_open_tickets(load, limit):
+    """Assign up to `limit` waiting tickets to the least loaded supports in `load`; returns how many."""
+    if not load.counts:
+        return 0
+
+    with transaction.atomic():
+        ticket_ids = unassigned_tickets(limit)
+        if not ticket_ids:
+            return 0
+
+        assignments = [(ticket_id, load.pick()) for ticket_id in ticket_ids]
+        inserted = insert_unassigned(assignments)
+        for ticket_id, user_id in assignments:
+            if ticket_id not in inserted:
+                load.unpick(user_id)
+        assignments = [(ticket_id, user_id) for ticket_id, user_id in assignments if ticket_id in inserted]
+
+        # all of them: a ticket skipped as already assigned had a stale assignee_count of 0
+        recount_assignees(ticket_ids)
+        if assignments:
+            activity.record(activity.assignments(assignments, TicketEvent.Action.ASSIGNED))
+            tickets_bulk_changed.send(Ticket, action='updated', ticket_ids=sorted(inserted))
+
+    return len(assignments)
+
+
+def insert_unassigned(assignments):
+    """
+    Insert the (ticket id, user id) through rows of tickets that still have no assignee, checked by the
+    INSERT itself so a take() since the queue was read is not joined by a second support. Returns the
+    ids of the tickets that were assigned.
+    """
+    through = Ticket.assigned_to.through
+    quote = connection.ops.quote_name
+    table = quote(through._meta.db_table)
+    ticket_column = quote(through._meta.get_field('ticket').column)
+    user_column = quote(through._meta.get_field('customuser').column)
+
+    values = ', '.join(['(CAST(%s AS BIGINT), CAST(%s AS BIGINT))'] * len(assignments))
+    sql = (f'INSERT INTO {table} ({ticket_column}, {user_column}) '
+           f'SELECT v.column1, v.column2 FROM (VALUES {values}) AS v '
+           f'WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {ticket_column} = v.column1) '
+           f'RETURNING {ticket_column}')
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [value for assignment in assignments for value in assignment])
+        return {row[0] for row in cursor.fetchall()}
@@ -0,0 +1,15 @@
+from django.urls import path
+
+from comment.async_views import comment_list
+from .async_views import (user_ticket_list, user_ticket_detail, support_ticket_list, support_ticket_detail,
+                          admin_ticket_list, admin_ticket_detail)
+
+urlpatterns = [
+    path('user/', user_ticket_list, name='async_ticket_list'),
+    path('user/<int:id>/', user_ticket_detail, name='async_ticket_detail'),
+    path('user/<int:ticket_id>/comments/', comment_list, name='async_user_comments_list'),
+    path('support/', support_ticket_list, name='async_ticket_support_list'),
+    path('support/<int:id>/', support_ticket_detail, name='async_ticket_support_detail'),
+    path('admin/', admin_ticket_list, name='async_ticket_admin_list'),
+    path('admin/<int:id>/', admin_ticket_detail, name='async_ticket_admin_detail'),
+]
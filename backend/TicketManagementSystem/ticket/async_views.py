@@ -0,0 +1,65 @@
+from django.shortcuts import aget_object_or_404
+from rest_framework.exceptions import PermissionDenied
+
+from users.async_views import async_api_view, json_response
+from users.models import Role
+from .models import Ticket
+from .pagination import apaginate
+from .serializers import TicketResponseSerializer, SupportTicketResponseSerializer, AdminTicketResponseSerializer
+from .views import UserTicketViewSet, SupportTicketViewSet, AdminTicketViewSet
+
+
+def list_queryset(viewset_class, request):
+    """The sync viewset's filtered, ordered and searched list queryset; building it runs no query."""
+    view = viewset_class(request=request, format_kwarg=None, action='list', args=(), kwargs={})
+    return view, view.filter_queryset(view.get_queryset())
+
+
+async def page_response(request, view, queryset, serializer_class):
+    page, body = await apaginate(request, queryset, view)
+    return json_response(body(serializer_class(page, many=True, context={'request': request}).data))
+
+
+def is_assigned_to(ticket, user):
+    return any(assignee.id == user.id for assignee in ticket.assigned_to.all())
+
+
+@async_api_view()
+async def user_ticket_list(request):
+    view, queryset = list_queryset(UserTicketViewSet, request)
+    return await page_response(request, view, queryset.filter(created_by=request.user.id), TicketResponseSerializer)
+
+
+@async_api_view()
+async def user_ticket_detail(request, id):
+    ticket = await aget_object_or_404(Ticket.objects.for_user(), id=id)
+    if ticket.created_by_id != request.user.id:
+        raise PermissionDenied()
+    return json_response(TicketResponseSerializer(ticket, context={'request': request}).data)
+
+
+@async_api_view(roles=[Role.SUPPORT])
+async def support_ticket_list(request):
+    view, queryset = list_queryset(SupportTicketViewSet, request)
+    return await page_response(request, view, queryset.assigned_to_user(request.user),
+                               SupportTicketResponseSerializer)
+
+
+@async_api_view(roles=[Role.SUPPORT])
+async def support_ticket_detail(request, id):
+    ticket = await aget_object_or_404(Ticket.objects.for_support(), id=id)
+    if not is_assigned_to(ticket, request.user):
+        raise PermissionDenied()
+    return json_response(SupportTicketResponseSerializer(ticket, context={'request': request}).data)
+
+
+@async_api_view(roles=[Role.ADMIN])
+async def admin_ticket_list(request):
+    view, queryset = list_queryset(AdminTicketViewSet, request)
+    return await page_response(request, view, queryset, AdminTicketResponseSerializer)
+
+
+@async_api_view(roles=[Role.ADMIN])
+async def admin_ticket_detail(request, id):
+    ticket = await aget_object_or_404(Ticket.objects.for_admin(), id=id)
+    return json_response(AdminTicketResponseSerializer(ticket, context={'request': request}).data)
@@ -0,0 +1,229 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from users.models import CustomUser, Role
+from . import activity, rollups, sla
+from .counters import recount_assignees
+from .models import Ticket, TicketEvent
+from .search import get_search_backend
+from .serializers import AdminBulkTicketCreateSerializer, AdminBulkTicketUpdateSerializer
+from .signals import tickets_bulk_changed
+
+UNIQUE_TITLE_ERROR = 'This field must be unique.'
+MISSING_USER_ERROR = 'Invalid pk "{}" - object does not exist.'
+
+
+class BulkResult:
+    """Collects per-item outcomes of a bulk call; items are dropped from `valid` as soon as they fail."""
+
+    def __init__(self, serializer_class, items):
+        self.results = [None] * len(items)
+        self.valid = {}
+
+        for index, item in enumerate(items):
+            serializer = serializer_class(data=item)
+            if serializer.is_valid():
+                self.valid[index] = serializer.validated_data
+            else:
+                self.reject(index, serializer.errors)
+
+    def reject(self, index, errors):
+        self.valid.pop(index, None)
+        self.results[index] = {'index': index, 'errors': errors}
+
+    def accept(self, index, ticket_id, status):
+        self.results[index] = {'index': index, 'id': ticket_id, 'status': status}
+
+
+def check_titles(bulk, taken):
+    """Reject items whose title is in `taken` ({title: ticket_id}) or repeats an earlier item of the batch."""
+    seen = set()
+    for index, data in list(bulk.valid.items()):
+        title = data.get('title')
+        if title is None:
+            continue
+        if taken.get(title, data.get('id')) != data.get('id') or title in seen:
+            bulk.reject(index, {'title': [UNIQUE_TITLE_ERROR]})
+        seen.add(title)
+
+
+def taken_titles(bulk):
+    """{title: ticket_id} of existing tickets using any title of the batch, in one query."""
+    titles = [data['title'] for data in bulk.valid.values() if 'title' in data]
+    return dict(Ticket.objects.filter(title__in=titles).values_list('title', 'id'))
+
+
+def write_checked(bulk, write):
+    """
+    Run `write()` atomically. If the title index rejects it because another request took one of the
+    titles after `check_titles`, re-check the titles, drop the clashing items and write the rest once more.
+    """
+    try:
+        with transaction.atomic():
+            return write()
+    except IntegrityError:
+        check_titles(bulk, taken_titles(bulk))
+        with transaction.atomic():
+            return write()
+
+
+def check_users(bulk):
+    user_ids = set()
+    for data in bulk.valid.values():
+        user_ids.update(data.get('assigned_to') or [])
+        if 'created_by' in data:
+            user_ids.add(data['created_by'])
+    roles = dict(CustomUser.objects.filter(id__in=user_ids).values_list('id', 'role'))
+
+    for index, data in list(bulk.valid.items()):
+        errors = {}
+        if 'created_by' in data and data['created_by'] not in roles:
+            errors['created_by'] = [MISSING_USER_ERROR.format(data['created_by'])]
+        missing = [user_id for user_id in data.get('assigned_to') or [] if roles.get(user_id) != Role.SUPPORT]
+        if missing:
+            errors['assigned_to'] = [MISSING_USER_ERROR.format(user_id) for user_id in missing]
+        if errors:
+            bulk.reject(index, errors)
+
+
+def set_assignees(tickets_with_assignees, created=False):
+    """
+    Replace assignees of the given tickets with two statements on the through table (three when the
+    tickets already existed: the previous rows are read first so the changes reach the activity log).
+    """
+    through = Ticket.assigned_to.through
+    ticket_ids = [ticket.id for ticket, _ in tickets_with_assignees]
+
+    before = set()
+    if not created:
+        before = set(through.objects.filter(ticket_id__in=ticket_ids).values_list('ticket_id', 'customuser_id'))
+    after = {(ticket.id, user_id) for ticket, assigned_to in tickets_with_assignees for user_id in assigned_to}
+
+    through.objects.filter(ticket_id__in=ticket_ids).delete()
+    through.objects.bulk_create([
+        through(ticket_id=ticket.id, customuser_id=user_id)
+        for ticket, assigned_to in tickets_with_assignees
+        for user_id in dict.fromkeys(assigned_to)
+    ])
+    activity.record(activity.assignments(sorted(before - after), TicketEvent.Action.UNASSIGNED)
+                    + activity.assignments(sorted(after - before), TicketEvent.Action.ASSIGNED))
+
+
+def bulk_create_tickets(items):
+    bulk = BulkResult(AdminBulkTicketCreateSerializer, items)
+
+    check_titles(bulk, taken_titles(bulk))
+    check_users(bulk)
+
+    def write():
+        now = timezone.now()
+        tickets = Ticket.objects.bulk_create([
+            Ticket(title=data['title'], description=data['description'], created_by_id=data['created_by'],
+                   status=data['status'], priority=data['priority'],
+                   assignee_count=len(set(data['assigned_to'])),
+                   last_activity_at=now if data['assigned_to'] else None,
+                   first_responded_at=None if data['status'] == Ticket.Status.OPEN else now,
+                   **sla.deadlines(now, data['priority']))
+            for data in bulk.valid.values()
+        ])
+        activity.record(activity.event(ticket.id, TicketEvent.Action.CREATED) for ticket in tickets)
+        set_assignees([(ticket, data['assigned_to']) for ticket, data in zip(tickets, bulk.valid.values())],
+                      created=True)
+        get_search_backend().index_many(tickets)
+        rollups.refresh_hours([ticket.created_at for ticket in tickets])
+        tickets_bulk_changed.send(Ticket, action='created', ticket_ids=[ticket.id for ticket in tickets])
+        return tickets
+
+    tickets = write_checked(bulk, write)
+    for index, ticket in zip(bulk.valid, tickets):
+        bulk.accept(index, ticket.id, 'created')
+
+    return bulk.results
+
+
+def bulk_update_tickets(items):
+    bulk = BulkResult(AdminBulkTicketUpdateSerializer, items)
+
+    seen = set()
+    for index, data in list(bulk.valid.items()):
+        if data['id'] in seen:
+            bulk.reject(index, {'id': ['Ticket appears more than once in the batch.']})
+        seen.add(data['id'])
+
+    tickets = Ticket.objects.in_bulk([data['id'] for data in bulk.valid.values()])
+    for index, data in list(bulk.valid.items()):
+        if data['id'] not in tickets:
+            bulk.reject(index, {'id': ['Ticket not found.']})
+
+    check_titles(bulk, taken_titles(bulk))
+    check_users(bulk)
+
+    def write():
+        now = timezone.now()
+        fields = {'updated_at'}
+        updated = []
+        reprioritized = []
+        for data in bulk.valid.values():
+            ticket = tickets[data['id']]
+            for field in ('title', 'description', 'status', 'priority'):
+                if field in data:
+                    setattr(ticket, field, data[field])
+                    fields.add(field)
+            # the due fields are added whether or not this item changed them: write() may run twice
+            if 'priority' in data:
+                if sla.priority_changed(ticket):
+                    for field, due in sla.deadlines(ticket.created_at, ticket.priority).items():
+                        setattr(ticket, field, due)
+                    reprioritized.append(ticket.id)
+                fields.update(('first_response_due', 'resolve_due'))
+            ticket.updated_at = now
+            updated.append(ticket)
+
+        Ticket.objects.bulk_update(updated, sorted(fields))
+        if 'status' in fields:
+            Ticket.objects.filter(id__in=[ticket.id for ticket in updated], first_responded_at__isnull=True).exclude(
+                status=Ticket.Status.OPEN).update(first_responded_at=now)
+        if reprioritized:
+            sla.catch_up(Ticket.objects.filter(id__in=reprioritized))
+        activity.record(event for ticket in updated for event in activity.changes(ticket))
+        reassigned = [(tickets[data['id']], data['assigned_to'])
+                      for data in bulk.valid.values() if 'assigned_to' in data]
+        set_assignees(reassigned)
+        recount_assignees([ticket.id for ticket, _ in reassigned])
+        if fields & {'title', 'description'}:
+            get_search_backend().index_many(updated)
+        if fields & {'status', 'priority'}:
+            rollups.refresh_hours([ticket.created_at for ticket in updated])
+        tickets_bulk_changed.send(Ticket, action='updated', ticket_ids=[ticket.id for ticket in updated])
+
+    write_checked(bulk, write)
+    for index, data in bulk.valid.items():
+        bulk.accept(index, data['id'], 'updated')
+
+    return bulk.results
+
+
+def bulk_close_tickets(ids):
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(Ticket.objects.filter(id__in=ids).values_list('id', 'created_at', 'status'))
+        found = {ticket_id for ticket_id, _, _ in rows}
+        # already closed tickets are reported as closed but keep their closed_at and are not written
+        closing = [(ticket_id, created_at, status) for ticket_id, created_at, status in rows
+                   if status != Ticket.Status.CLOSED]
+        if closing:
+            Ticket.objects.filter(id__in=[ticket_id for ticket_id, _, _ in closing]).exclude(
+                status=Ticket.Status.CLOSED).update(status=Ticket.Status.CLOSED, closed_at=now, updated_at=now,
+                                                    first_responded_at=Coalesce('first_responded_at', Value(now)))
+            activity.record(activity.event(ticket_id, TicketEvent.Action.CHANGED, 'status', status,
+                                           Ticket.Status.CLOSED) for ticket_id, _, status in closing)
+            rollups.refresh_hours([created_at for _, created_at, _ in closing])
+            tickets_bulk_changed.send(Ticket, action='updated', ticket_ids=[ticket_id for ticket_id, _, _ in closing])
+
+    return [
+        {'index': index, 'id': ticket_id, 'status': 'closed'} if ticket_id in found
+        else {'index': index, 'errors': {'id': ['Ticket not found.']}}
+        for index, ticket_id in enumerate(ids)
+    ]
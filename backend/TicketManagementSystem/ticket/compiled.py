@@ -0,0 +1,106 @@
+"""
+Read-only fast path for the ticket response serializers.
+
+DRF rebuilds and walks the serializer's field tree for every row and reverses every hyperlink through
+the URL resolver. Here a serializer class is introspected once into a flat plan (cached per class),
+hyperlinks are reversed once per request with a marker id and formatted per row, and nested
+serializers are compiled the same way. Output is identical to `serializer_class(instance).data`.
+"""
+from functools import cache
+
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+from rest_framework.fields import SkipField, get_attribute
+from rest_framework.relations import HyperlinkedIdentityField
+from rest_framework.reverse import reverse
+
+URL_MARKER = '918273645'
+
+
+class URLTemplate:
+    """A hyperlink reversed once per request, with the lookup value substituted per row."""
+
+    def __init__(self, field, request):
+        url = reverse(field.view_name, kwargs={field.lookup_url_kwarg: URL_MARKER}, request=request)
+        self.prefix, _, self.suffix = url.rpartition(URL_MARKER)
+        self.lookup_field = field.lookup_field
+
+    def __call__(self, instance):
+        return f'{self.prefix}{getattr(instance, self.lookup_field)}{self.suffix}'
+
+
+@cache
+def plan_for(serializer_class):
+    return build_plan(serializer_class())
+
+
+def build_plan(serializer):
+    """(name, kind, source_attrs, field or nested plan) for each readable field of `serializer`."""
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.ListSerializer):
+            plan.append((name, 'many', field.source_attrs, build_plan(field.child)))
+        elif isinstance(field, serializers.BaseSerializer):
+            plan.append((name, 'nested', field.source_attrs, build_plan(field)))
+        elif isinstance(field, HyperlinkedIdentityField):
+            plan.append((name, 'url', None, field))
+        else:
+            plan.append((name, 'field', field.source_attrs, field))
+    return tuple(plan)
+
+
+def bind(plan, request):
+    """Turn a plan into a row -> dict function for one request."""
+    getters = []
+    for name, kind, source_attrs, target in plan:
+        if kind == 'url':
+            getters.append((name, URLTemplate(target, request)))
+        elif kind == 'many':
+            getters.append((name, many_getter(source_attrs, bind(target, request))))
+        elif kind == 'nested':
+            getters.append((name, nested_getter(source_attrs, bind(target, request))))
+        else:
+            getters.append((name, field_getter(target)))
+
+    def represent(instance):
+        row = {}
+        for name, getter in getters:
+            try:
+                row[name] = getter(instance)
+            except SkipField:
+                pass
+        return row
+
+    return represent
+
+
+def field_getter(field):
+    def getter(instance):
+        value = field.get_attribute(instance)
+        return None if value is None else field.to_representation(value)
+    return getter
+
+
+def nested_getter(source_attrs, represent):
+    def getter(instance):
+        value = get_attribute(instance, source_attrs)
+        return None if value is None else represent(value)
+    return getter
+
+
+def many_getter(source_attrs, represent):
+    def getter(instance):
+        value = get_attribute(instance, source_attrs)
+        items = value.all() if isinstance(value, BaseManager) else value
+        return [represent(item) for item in items]
+    return getter
+
+
+def serialize(serializer_class, data, request, many=False):
+    """Drop-in for `serializer_class(data, many=many, context={'request': request}).data` on reads."""
+    represent = bind(plan_for(serializer_class), request)
+    if many:
+        return [represent(instance) for instance in data]
+    return represent(data)
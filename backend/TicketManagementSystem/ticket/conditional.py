@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from rest_framework.response import Response
+
+from metrics.collector import serializing
+from users.conditional import has_conditional_headers, make_etag, not_modified, set_validators
+from . import compiled
+from .models import Ticket
+
+VALIDATOR_FIELDS = ('id', 'created_by', 'updated_at', 'last_activity_at', 'comment_count', 'mark_count',
+                    'assignee_count', 'status', 'first_response_due', 'resolve_due', 'first_responded_at')
+
+
+def ticket_etag(ticket):
+    """
+    ETag of a ticket response. Ticket writes move `updated_at`; comments, marks and assignments move
+    the counters and `last_activity_at` through ticket.counters. `sla_status` changes with time alone,
+    so it is part of the ETag too.
+    """
+    return make_etag(ticket.id, ticket.updated_at, ticket.last_activity_at, ticket.comment_count,
+                     ticket.mark_count, ticket.assignee_count, ticket.first_responded_at, ticket.sla_status)
+
+
+class ConditionalTicketMixin:
+    """
+    Conditional GET for ticket viewsets. `retrieve` answers If-None-Match from a
+    one-row validator query, before the ticket is loaded with its prefetches and serialized; list pages
+    get an ETag over the page's tickets and pagination links and skip serialization when it matches.
+    Rows are serialized by ticket.compiled unless COMPILED_SERIALIZERS is off.
+    """
+
+    def serialize(self, serializer_class, data, many=False):
+        with serializing(self.request):
+            if settings.COMPILED_SERIALIZERS:
+                return compiled.serialize(serializer_class, data, self.request, many=many)
+            return serializer_class(data, many=many, context={'request': self.request}).data
+
+    def conditional_retrieve(self, request, serializer_class):
+        if has_conditional_headers(request):
+            ticket = get_object_or_404(Ticket.objects.only(*VALIDATOR_FIELDS), id=self.kwargs[self.lookup_field])
+            self.check_object_permissions(request, ticket)
+            response = not_modified(request, ticket_etag(ticket))
+            if response is not None:
+                return response
+
+        ticket = self.get_object()
+        response = Response(self.serialize(serializer_class, ticket), status=200)
+        return set_validators(response, ticket_etag(ticket))
+
+    def conditional_list(self, request, queryset, serializer_class):
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(self.serialize(serializer_class, queryset, many=True), status=200)
+
+        etag = make_etag(request.user.id, self.paginator.page_signature(), [ticket_etag(ticket) for ticket in page])
+        response = not_modified(request, etag)
+        if response is None:
+            response = self.get_paginated_response(self.serialize(serializer_class, page, many=True))
+        return set_validators(response, etag)
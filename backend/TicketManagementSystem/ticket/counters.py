@@ -0,0 +1,51 @@
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Ticket, SupportTicketMarks
+
+
+def count_subquery(queryset, field='ticket'):
+    return Coalesce(Subquery(
+        queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(total=Count('*')).values('total'),
+        output_field=IntegerField()
+    ), 0)
+
+
+def max_subquery(queryset, field, ticket_field='ticket'):
+    return Subquery(
+        queryset.filter(**{ticket_field: OuterRef('pk')}).order_by().values(ticket_field).annotate(
+            latest=Max(field)).values('latest')
+    )
+
+
+def bump(ticket_id, field, delta):
+    """Atomically add `delta` to one counter column (never below zero) and record the activity."""
+    Ticket.objects.filter(pk=ticket_id).update(**{field: Greatest(F(field) + delta, 0)},
+                                               last_activity_at=timezone.now())
+
+
+def touch(ticket_id):
+    Ticket.objects.filter(pk=ticket_id).update(last_activity_at=timezone.now())
+
+
+def recount_assignees(ticket_ids):
+    Ticket.objects.filter(pk__in=ticket_ids).update(
+        assignee_count=count_subquery(Ticket.assigned_to.through.objects),
+        last_activity_at=timezone.now()
+    )
+
+
+def repair_counters(queryset):
+    """Recompute every counter of the tickets in `queryset` with a single UPDATE."""
+    from comment.models import Comment
+
+    last_comment = max_subquery(Comment.objects, 'created_on')
+    last_mark = max_subquery(SupportTicketMarks.objects, 'created_at')
+
+    return queryset.update(
+        comment_count=count_subquery(Comment.objects),
+        mark_count=count_subquery(SupportTicketMarks.objects),
+        assignee_count=count_subquery(Ticket.assigned_to.through.objects),
+        last_activity_at=Greatest(Coalesce(last_comment, last_mark), Coalesce(last_mark, last_comment)),
+    )
@@ -0,0 +1,64 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from users.models import CustomUser
+
+EXPORT_FIELDS = ['id', 'title', 'description', 'status', 'priority', 'created_by', 'completed_by', 'assigned_to',
+                 'mark_count', 'comment_count', 'created_at', 'updated_at', 'closed_at']
+
+CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() hands the line back, so csv.writer can feed a generator."""
+
+    def write(self, value):
+        return value
+
+
+def export_queryset(queryset):
+    return (queryset.select_related(None).prefetch_related(None).order_by('id')
+            .only('id', 'title', 'description', 'status', 'priority', 'created_by_id', 'completed_by_id',
+                  'mark_count', 'comment_count', 'created_at', 'updated_at', 'closed_at')
+            .prefetch_related(Prefetch('assigned_to', queryset=CustomUser.objects.only('id'))))
+
+
+def export_rows(queryset):
+    for ticket in export_queryset(queryset).iterator(chunk_size=CHUNK_SIZE):
+        yield {
+            'id': ticket.id,
+            'title': ticket.title,
+            'description': ticket.description,
+            'status': ticket.status,
+            'priority': ticket.priority,
+            'created_by': ticket.created_by_id,
+            'completed_by': ticket.completed_by_id,
+            'assigned_to': [user.id for user in ticket.assigned_to.all()],
+            'mark_count': ticket.mark_count,
+            'comment_count': ticket.comment_count,
+            'created_at': ticket.created_at,
+            'updated_at': ticket.updated_at,
+            'closed_at': ticket.closed_at,
+        }
+
+
+def ndjson_stream(queryset):
+    for row in export_rows(queryset):
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+def csv_stream(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in export_rows(queryset):
+        row['assigned_to'] = ' '.join(str(user_id) for user_id in row['assigned_to'])
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+EXPORT_FORMATS = {
+    'ndjson': (ndjson_stream, 'application/x-ndjson'),
+    'csv': (csv_stream, 'text/csv'),
+}
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+
+from ticket.assignment import SupportLoad, assign_open_tickets
+
+
+class Command(BaseCommand):
+    help = "Worker that assigns new open tickets to the least loaded support users, highest priority first."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Tickets assigned per transaction")
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help="Seconds to wait once no unassigned tickets are left")
+        parser.add_argument('--reconcile-interval', type=float, default=60.0,
+                            help="Seconds between reloading the support workloads from the database")
+        parser.add_argument('--once', action='store_true', help="Assign the tickets waiting now and exit")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        load = SupportLoad()
+        reconciled_at = None
+        assigned = 0
+
+        while True:
+            try:
+                if reconciled_at is None or time.monotonic() - reconciled_at >= options['reconcile_interval']:
+                    load.reconcile()
+                    reconciled_at = time.monotonic()
+                batch = assign_open_tickets(load, batch_size)
+            except DatabaseError as error:
+                # the in-memory counts may include the failed batch
+                self.stderr.write(f"Assignment failed, reloading workloads: {error}")
+                reconciled_at = None
+                batch = 0
+            finally:
+                close_old_connections()
+            assigned += batch
+
+            if batch < batch_size:
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+
+        self.stdout.write(f"Assigned {assigned} tickets")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from ticket.models import TicketHourlyStats
+from ticket.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the hourly ticket rollup used by the admin analytics endpoints from the tickets table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rollup rows inserted per statement")
+
+    def handle(self, *args, **options):
+        rebuild(options['batch_size'])
+        self.stdout.write(f"Rebuilt {TicketHourlyStats.objects.count()} hourly ticket stats rows")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from ticket.models import Ticket
+from ticket.sla import recompute_deadlines
+
+
+class Command(BaseCommand):
+    help = "Recompute first response and resolve deadlines from TICKET_SLA_POLICIES, e.g. after changing them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Include closed tickets")
+
+    def handle(self, *args, **options):
+        tickets = Ticket.objects.all() if options['all'] else Ticket.objects.exclude(status=Ticket.Status.CLOSED)
+        self.stdout.write(f"Recomputed deadlines of {recompute_deadlines(tickets)} tickets")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from ticket.counters import repair_counters
+from ticket.models import Ticket
+
+
+class Command(BaseCommand):
+    help = "Recompute comment/mark/assignee counters and last activity of tickets from the source tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="Tickets updated per statement")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = Ticket.objects.aggregate(last=Max('id'))['last'] or 0
+
+        repaired = 0
+        for start in range(0, last_id + 1, batch_size):
+            repaired += repair_counters(Ticket.objects.filter(id__gte=start, id__lt=start + batch_size))
+
+        self.stdout.write(f"Repaired counters of {repaired} tickets")
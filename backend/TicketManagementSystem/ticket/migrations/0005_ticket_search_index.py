@@ -0,0 +1,50 @@
+from django.db import migrations
+
+SEARCH_INDEXES = {
+    'ticket_title_search_idx': ('title',),
+    'ticket_title_description_search_idx': ('title', 'description'),
+}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS ticket_ticket_fts "
+            "USING fts5(title, description, tokenize='unicode61', prefix='2 3')"
+        )
+        schema_editor.execute(
+            "INSERT INTO ticket_ticket_fts (rowid, title, description) "
+            "SELECT id, title, description FROM ticket_ticket"
+        )
+
+    elif vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+
+        Ticket = apps.get_model('ticket', 'Ticket')
+        for name, fields in SEARCH_INDEXES.items():
+            schema_editor.add_index(Ticket, GinIndex(SearchVector(*fields, config='simple'), name=name))
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS ticket_ticket_fts")
+
+    elif vendor == 'postgresql':
+        for name in SEARCH_INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ticket', '0004_ticket_completed_by_remove_ticket_assigned_to_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
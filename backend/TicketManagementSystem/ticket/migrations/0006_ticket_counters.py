@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:03
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_counters(apps, schema_editor):
+    Ticket = apps.get_model('ticket', 'Ticket')
+    SupportTicketMarks = apps.get_model('ticket', 'SupportTicketMarks')
+    Comment = apps.get_model('comment', 'Comment')
+
+    def count(model):
+        return Coalesce(Subquery(
+            model.objects.filter(ticket=OuterRef('pk')).order_by().values('ticket')
+            .annotate(total=Count('*')).values('total'),
+            output_field=IntegerField()
+        ), 0)
+
+    def latest(model, field):
+        return Subquery(
+            model.objects.filter(ticket=OuterRef('pk')).order_by().values('ticket')
+            .annotate(latest=Max(field)).values('latest')
+        )
+
+    last_comment = latest(Comment, 'created_on')
+    last_mark = latest(SupportTicketMarks, 'created_at')
+    Ticket.objects.update(
+        comment_count=count(Comment),
+        mark_count=count(SupportTicketMarks),
+        assignee_count=count(Ticket.assigned_to.through),
+        last_activity_at=Greatest(Coalesce(last_comment, last_mark), Coalesce(last_mark, last_comment)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ticket', '0005_ticket_search_index'),
+        ('comment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='assignee_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='last_activity_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='mark_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:07
+
+from datetime import timezone
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Coalesce, TruncHour
+
+
+def backfill_stats(apps, schema_editor):
+    Ticket = apps.get_model('ticket', 'Ticket')
+    TicketHourlyStats = apps.get_model('ticket', 'TicketHourlyStats')
+
+    rows = (Ticket.objects.order_by()
+            .values(hour_bucket=TruncHour('created_at', tzinfo=timezone.utc))
+            .annotate(completer=Coalesce('completed_by_id', 0), total=Count('id'))
+            .values_list('hour_bucket', 'status', 'priority', 'created_by_id', 'completer', 'total'))
+    TicketHourlyStats.objects.bulk_create(
+        [TicketHourlyStats(hour=hour, status=status, priority=priority, created_by_id=created_by_id,
+                           completed_by_id=completed_by_id, count=total)
+         for hour, status, priority, created_by_id, completed_by_id, total in rows.iterator()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ticket', '0006_ticket_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketHourlyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('IN_PROGRESS', 'In Progress'), ('CLOSED', 'Closed')], max_length=20)),
+                ('priority', models.CharField(choices=[('LOW', 'Low'), ('MEDIUM', 'Medium'), ('HIGH', 'High')], max_length=10)),
+                ('created_by_id', models.BigIntegerField()),
+                ('completed_by_id', models.BigIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('hour', 'status', 'priority', 'created_by_id', 'completed_by_id'), name='ticket_hourly_stats_key')],
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
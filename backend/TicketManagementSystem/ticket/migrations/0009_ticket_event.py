@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ticket', '0008_ticket_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket_id', models.BigIntegerField()),
+                ('actor_id', models.BigIntegerField(blank=True, null=True)),
+                ('action', models.CharField(choices=[('CREATED', 'Created'), ('CHANGED', 'Changed'), ('ASSIGNED', 'Assigned'), ('UNASSIGNED', 'Unassigned'), ('DELETED', 'Deleted')], max_length=20)),
+                ('field', models.CharField(blank=True, default='', max_length=30)),
+                ('old_value', models.CharField(blank=True, max_length=255, null=True)),
+                ('new_value', models.CharField(blank=True, max_length=255, null=True)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ticket_id', 'id'], name='ticket_event_ticket_idx')],
+            },
+        ),
+    ]
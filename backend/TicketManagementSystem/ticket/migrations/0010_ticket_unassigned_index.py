@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ticket', '0009_ticket_event'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('assignee_count', 0), ('status', 'OPEN')), fields=['priority', 'id'], name='ticket_unassigned_idx'),
+        ),
+    ]
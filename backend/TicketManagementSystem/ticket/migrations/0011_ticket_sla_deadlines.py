@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:12
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_deadlines(apps, schema_editor):
+    Ticket = apps.get_model('ticket', 'Ticket')
+
+    for priority, (first_response, resolve) in settings.TICKET_SLA_POLICIES.items():
+        Ticket.objects.filter(priority=priority).update(
+            first_response_due=F('created_at') + timedelta(hours=first_response),
+            resolve_due=F('created_at') + timedelta(hours=resolve),
+        )
+    # tickets that have left OPEN were answered at some point; their last update is the best guess
+    Ticket.objects.exclude(status='OPEN').update(first_responded_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ticket', '0010_ticket_unassigned_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='first_responded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='first_response_due',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='resolve_due',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_deadlines, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='ticketevent',
+            name='action',
+            field=models.CharField(choices=[('CREATED', 'Created'), ('CHANGED', 'Changed'), ('ASSIGNED', 'Assigned'), ('UNASSIGNED', 'Unassigned'), ('DELETED', 'Deleted'), ('SLA_BREACHED', 'SLA breached')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('first_responded_at__isnull', True)), fields=['first_response_due'], name='ticket_response_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('status', 'CLOSED'), _negated=True), fields=['resolve_due'], name='ticket_resolve_due_idx'),
+        ),
+    ]
@@ -1,5 +1,37 @@
+from datetime import timedelta
+
 from users.models import CustomUser
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+
+class TicketQuerySet(models.QuerySet):
+    """Prefetch profiles matching the fields each role's response serializer reads."""
+
+    def assigned_to_user(self, user):
+        """
+        Tickets `user` is assigned to, as `id IN (...)` over the through table's customuser_id index
+        (no join, no duplicates, and no correlated probe per ticket row).
+        """
+        assignments = Ticket.assigned_to.through.objects.filter(customuser_id=user.id).values('ticket_id')
+        return self.filter(id__in=assignments)
+
+    def with_assignees(self):
+        return self.prefetch_related(Prefetch('assigned_to', queryset=CustomUser.objects.only('id')))
+
+    def with_marks(self):
+        return self.prefetch_related(Prefetch('ticket_mark', queryset=SupportTicketMarks.objects.only('id', 'ticket_id')))
+
+    def for_user(self):
+        return self.select_related('created_by').with_assignees()
+
+    def for_support(self):
+        return self.select_related('created_by', 'completed_by').with_assignees().with_marks()
+
+    def for_admin(self):
+        return self.select_related('created_by', 'completed_by').with_assignees().with_marks()
 
 
 class Ticket(models.Model):
@@ -29,9 +61,93 @@ class Ticket(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     closed_at = models.DateTimeField(null=True, blank=True)
 
+    # Denormalized counters, kept in sync by ticket.counters (repair_ticket_counters recomputes them)
+    comment_count = models.PositiveIntegerField(default=0)
+    mark_count = models.PositiveIntegerField(default=0)
+    assignee_count = models.PositiveIntegerField(default=0)
+    last_activity_at = models.DateTimeField(null=True, blank=True)  # last comment, mark or assignment change
+
+    # Service level deadlines, from created_at and the priority's policy (ticket.sla)
+    first_response_due = models.DateTimeField(null=True, blank=True)
+    resolve_due = models.DateTimeField(null=True, blank=True)
+    first_responded_at = models.DateTimeField(null=True, blank=True)  # first mark/comment by someone else, or leaving OPEN
+
+    objects = TicketQuerySet.as_manager()
+
+    # Written only with atomic UPDATEs (ticket.counters, ticket.sla); a regular save of an existing ticket
+    # leaves them out, so it cannot write back values loaded before a concurrent comment/mark/assignment.
+    DENORMALIZED_FIELDS = frozenset({'comment_count', 'mark_count', 'assignee_count', 'last_activity_at',
+                                     'first_responded_at'})
+
+    # Values as loaded, kept in `_loaded` so the save receivers can tell what changed (activity log,
+    # SLA deadlines, search index). Taken in from_db, so tickets built in memory pay nothing.
+    LOADED_FIELDS = ('title', 'description', 'status', 'priority', 'completed_by_id')
+
+    class Meta:
+        # Matched to the list filters of ticket.views; each ends in `id`, the default list ordering
+        indexes = [
+            models.Index(fields=['created_by', 'status', 'id'], name='ticket_creator_status_idx'),
+            models.Index(fields=['status', 'id'], name='ticket_status_idx'),
+            models.Index(fields=['priority', 'id'], name='ticket_priority_idx'),
+            models.Index(fields=['created_at', 'id'], name='ticket_created_at_idx'),
+            models.Index(fields=['last_activity_at'], name='ticket_last_activity_idx'),
+            # the assignment worker's queue: open tickets nobody is assigned to (ticket.assignment)
+            models.Index(fields=['priority', 'id'], name='ticket_unassigned_idx',
+                         condition=models.Q(status='OPEN', assignee_count=0)),
+            # running deadlines only: breach sweeps and "breaching within" filters are range scans over these
+            models.Index(fields=['first_response_due'], name='ticket_response_due_idx',
+                         condition=models.Q(first_responded_at__isnull=True)),
+            models.Index(fields=['resolve_due'], name='ticket_resolve_due_idx',
+                         condition=~models.Q(status='CLOSED')),
+        ]
+
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded = instance.loaded_values()
+        return instance
+
+    def loaded_values(self):
+        """The LOADED_FIELDS values held now; deferred fields are left out rather than fetched."""
+        return {field: self.__dict__[field] for field in self.LOADED_FIELDS if field in self.__dict__}
+
+    def save(self, **kwargs):
+        if self._state.adding or kwargs.get('force_insert'):
+            super().save(**kwargs)
+        else:
+            if kwargs.get('update_fields') is None:
+                deferred = self.get_deferred_fields()
+                kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                           if not field.primary_key and field.name not in self.DENORMALIZED_FIELDS
+                                           and field.attname not in deferred]
+            # the rollup receivers lock the stored row in pre_save (ticket.rollups.stored_values)
+            with transaction.atomic(using=kwargs.get('using')):
+                super().save(**kwargs)
+        self._loaded = self.loaded_values()
+
+    @property
+    def sla_status(self):
+        """
+        'breached', 'at_risk' (within TICKET_SLA_AT_RISK_MINUTES) or 'on_track' for the nearest running
+        deadline; None for closed tickets and tickets without deadlines.
+        """
+        if self.status == self.Status.CLOSED:
+            return None
+        running = [self.resolve_due, self.first_response_due if self.first_responded_at is None else None]
+        due = min(filter(None, running), default=None)
+        if due is None:
+            return None
+
+        left = due - timezone.now()
+        if left <= timedelta(0):
+            return 'breached'
+        if left <= timedelta(minutes=settings.TICKET_SLA_AT_RISK_MINUTES):
+            return 'at_risk'
+        return 'on_track'
+
 
 class SupportTicketMarks(models.Model):
     class SUPPORT_STATUS(models.TextChoices):
@@ -47,3 +163,52 @@ class SupportTicketMarks(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['ticket', '-created_at'], name='marks_ticket_created_idx'),
+        ]
+
+
+class TicketHourlyStats(models.Model):
+    """
+    Rollup of tickets by the hour they were created in and their current status, priority, creator and
+    completer (0 = not completed). Kept in sync by ticket.rollups; rebuild with `rebuild_ticket_stats`.
+    """
+    hour = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=Ticket.Status.choices)
+    priority = models.CharField(max_length=10, choices=Ticket.Priority.choices)
+    created_by_id = models.BigIntegerField()
+    completed_by_id = models.BigIntegerField(default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['hour', 'status', 'priority', 'created_by_id', 'completed_by_id'],
+                                    name='ticket_hourly_stats_key'),
+        ]
+
+
+class TicketEvent(models.Model):
+    """
+    Append-only log of ticket transitions, written behind the request by ticket.activity. Ids are plain
+    integers so the history outlives deleted tickets and users.
+    """
+    class Action(models.TextChoices):
+        CREATED = 'CREATED', 'Created'
+        CHANGED = 'CHANGED', 'Changed'
+        ASSIGNED = 'ASSIGNED', 'Assigned'
+        UNASSIGNED = 'UNASSIGNED', 'Unassigned'
+        DELETED = 'DELETED', 'Deleted'
+        SLA_BREACHED = 'SLA_BREACHED', 'SLA breached'
+
+    ticket_id = models.BigIntegerField()
+    actor_id = models.BigIntegerField(null=True, blank=True)  # None for changes made outside a request
+    action = models.CharField(max_length=20, choices=Action.choices)
+    field = models.CharField(max_length=30, blank=True, default='')
+    old_value = models.CharField(max_length=255, null=True, blank=True)
+    new_value = models.CharField(max_length=255, null=True, blank=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['ticket_id', 'id'], name='ticket_event_ticket_idx'),
+        ]
@@ -0,0 +1,120 @@
+import math
+
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TicketCursorPagination(CursorPagination):
+    """Keyset pagination over the ticket list orderings, without a COUNT query or OFFSET scan."""
+    ordering = ('id',)
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    keyset_orderings = {
+        'id': ('id',),
+        '-id': ('-id',),
+        'created_at': ('created_at', 'id'),
+        '-created_at': ('-created_at', '-id'),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        """
+        The keyset for the requested `ordering`. Anything else is refused rather than paged in a
+        different order, including the rank order searches fall back to without an explicit `ordering`.
+        """
+        ordering = request.query_params.get(api_settings.ORDERING_PARAM)
+        if ordering is None and queryset.query.order_by[:1] != ('-search_rank',):
+            return self.ordering
+        if ordering not in self.keyset_orderings:
+            raise ValidationError({api_settings.ORDERING_PARAM: [
+                f"Cursor pagination supports ordering by {', '.join(self.keyset_orderings)} only."]})
+        return self.keyset_orderings[ordering]
+
+
+class TicketEventPagination(CursorPagination):
+    """Keyset pagination over a ticket's activity log, oldest event first."""
+    ordering = ('id',)
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class TicketPagination(PageNumberPagination):
+    """
+    Page-number pagination that switches to keyset pagination when the client opts in
+    with `?pagination=cursor` (or follows a link that already carries a `cursor`).
+    """
+    mode_query_param = 'pagination'
+    cursor_pagination_class = TicketCursorPagination
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def use_cursor(self, request):
+        return (request.query_params.get(self.mode_query_param) == 'cursor'
+                or self.cursor_pagination_class.cursor_query_param in request.query_params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.use_cursor(request):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.cursor_paginator = self.cursor_pagination_class()
+        page = self.cursor_paginator.paginate_queryset(queryset, request, view)
+        self.display_page_controls = self.cursor_paginator.display_page_controls
+        return page
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def page_signature(self):
+        """What the response envelope of the current page is made of, besides its results."""
+        if self.cursor_paginator is not None:
+            return None, self.cursor_paginator.get_next_link(), self.cursor_paginator.get_previous_link()
+        return self.page.paginator.count, self.get_next_link(), self.get_previous_link()
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+
+async def apaginate(request, queryset, view=None, pagination_class=TicketPagination):
+    """
+    Paginated response body for async views, with the same query params and shape as `pagination_class`.
+    Page numbers are served with `acount()` and `async for`; cursor mode runs the sync paginator in one hop.
+    Returns the page and a function that wraps the serialized page into the response body.
+    """
+    paginator = pagination_class()
+    if getattr(paginator, 'use_cursor', None) and paginator.use_cursor(request):
+        cursor_paginator = paginator.cursor_pagination_class()
+        page = await sync_to_async(cursor_paginator.paginate_queryset)(queryset, request, view)
+        return page, lambda data: {'next': cursor_paginator.get_next_link(),
+                                   'previous': cursor_paginator.get_previous_link(), 'results': data}
+
+    page_size = paginator.get_page_size(request)
+    count = await queryset.acount()
+    try:
+        number = int(request.query_params.get(paginator.page_query_param, 1))
+    except ValueError:
+        number = 0
+    if number < 1 or number > max(math.ceil(count / page_size), 1):
+        raise NotFound(paginator.invalid_page_message)
+
+    start = (number - 1) * page_size
+    page = [obj async for obj in queryset[start:start + page_size]]
+
+    url = request.build_absolute_uri()
+    next_link = replace_query_param(url, paginator.page_query_param, number + 1) if start + page_size < count else None
+    if number == 1:
+        previous_link = None
+    elif number == 2:
+        previous_link = remove_query_param(url, paginator.page_query_param)
+    else:
+        previous_link = replace_query_param(url, paginator.page_query_param, number - 1)
+
+    return page, lambda data: {'count': count, 'next': next_link, 'previous': previous_link, 'results': data}
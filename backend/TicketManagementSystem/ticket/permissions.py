@@ -3,26 +3,49 @@ from rest_framework.permissions import BasePermission
 from ticket.models import Ticket
 
 
+def is_assigned(request, ticket_id):
+    """
+    Whether request.user is assigned to the ticket, answered with one EXISTS query
+    and memoized on the request so repeated checks for the same ticket are free.
+    """
+    checked = getattr(request, '_assigned_tickets', None)
+    if checked is None:
+        checked = request._assigned_tickets = {}
+
+    try:
+        ticket_id = int(ticket_id)
+    except (TypeError, ValueError):
+        return False
+
+    if ticket_id not in checked:
+        checked[ticket_id] = Ticket.assigned_to.through.objects.filter(
+            ticket_id=ticket_id, customuser_id=request.user.id).exists()
+    return checked[ticket_id]
+
+
 class IsOwnerPermission(BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        return obj.created_by == request.user
+        return obj.created_by_id == request.user.id
 
 class IsAssignedTo(BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        return request.user in obj.assigned_to.filter(id=request.user.id).all()
+        prefetched = getattr(obj, '_prefetched_objects_cache', {}).get('assigned_to')
+        if prefetched is not None:
+            return any(user.id == request.user.id for user in prefetched)
+        return is_assigned(request, obj.pk)
 
 class IsOwnerPermissionMarks(BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        return obj.support_user == request.user
+        return obj.support_user_id == request.user.id
 
 class IsAssignedToMarks(BasePermission):
     def has_permission(self, request, view):
@@ -30,10 +53,8 @@ class IsAssignedToMarks(BasePermission):
             return False
         ticket_id = view.kwargs.get('ticket_id')
         if ticket_id:
-            ticket = Ticket.objects.get(id=ticket_id)
-            return request.user in ticket.assigned_to.all()
+            return is_assigned(request, ticket_id)
         return True
 
     def has_object_permission(self, request, view, obj):
-        ticket = obj.ticket
-        return request.user in ticket.assigned_to.all()
\ No newline at end of file
+        return is_assigned(request, obj.ticket_id)
@@ -0,0 +1,124 @@
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDay, TruncHour
+
+from .models import Ticket, TicketHourlyStats
+
+KEY_FIELDS = ('hour', 'status', 'priority', 'created_by_id', 'completed_by_id')
+TRACKED_FIELDS = ('created_at', 'status', 'priority', 'created_by_id', 'completed_by_id')
+HOUR = timedelta(hours=1)
+
+
+def hour_of(moment):
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def key_of(created_at, status, priority, created_by_id, completed_by_id):
+    return hour_of(created_at), status, priority, created_by_id, completed_by_id or 0
+
+
+def is_saved(field, update_fields):
+    return update_fields is None or field in update_fields or field.removesuffix('_id') in update_fields
+
+
+def stored_values(pk):
+    """
+    TRACKED_FIELDS of the stored ticket `pk`, None if there is no such row. The row is locked until the
+    transaction ends, so a concurrent change cannot move the ticket to another rollup row in the
+    meantime (the values it was loaded with may already be stale).
+    """
+    return Ticket.objects.select_for_update().filter(pk=pk).values(*TRACKED_FIELDS).first()
+
+
+def written_key(ticket, stored, update_fields):
+    """Rollup key of the row written by saving `update_fields` of `ticket` over the `stored` values."""
+    return key_of(*(getattr(ticket, field) if stored is None or is_saved(field, update_fields) else stored[field]
+                    for field in TRACKED_FIELDS))
+
+
+def add(key, delta):
+    """Atomically move `delta` tickets into the rollup row `key`, creating it on first use."""
+    filters = dict(zip(KEY_FIELDS, key))
+    if TicketHourlyStats.objects.filter(**filters).update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            TicketHourlyStats.objects.create(**filters, count=delta)
+    except IntegrityError:
+        TicketHourlyStats.objects.filter(**filters).update(count=F('count') + delta)
+
+
+def aggregate(queryset):
+    return (queryset.order_by()
+            .values(hour_bucket=TruncHour('created_at', tzinfo=dt_timezone.utc))
+            .annotate(completer=Coalesce('completed_by_id', 0), total=Count('id'))
+            .values_list('hour_bucket', 'status', 'priority', 'created_by_id', 'completer', 'total'))
+
+
+def store(rows, batch_size=1000, **kwargs):
+    TicketHourlyStats.objects.bulk_create(
+        [TicketHourlyStats(**dict(zip(KEY_FIELDS, row[:5])), count=row[5]) for row in rows],
+        batch_size=batch_size, **kwargs
+    )
+
+
+def refresh_hours(hours):
+    """
+    Recompute the rollup rows of whole hours from the tickets table; used after bulk writes. Rows are
+    zeroed and upserted rather than deleted and re-inserted, so a concurrent add() creating a row in
+    the same hour cannot make the insert fail.
+    """
+    hours = {hour_of(hour) for hour in hours}
+    if not hours:
+        return
+
+    created_in = Q()
+    for hour in hours:
+        created_in |= Q(created_at__gte=hour, created_at__lt=hour + HOUR)
+
+    with transaction.atomic():
+        TicketHourlyStats.objects.filter(hour__in=hours).update(count=0)
+        store(aggregate(Ticket.objects.filter(created_in)), update_conflicts=True, unique_fields=KEY_FIELDS,
+              update_fields=['count'])
+
+
+def rebuild(batch_size=1000):
+    with transaction.atomic():
+        TicketHourlyStats.objects.all().delete()
+        store(aggregate(Ticket.objects.all()).iterator(chunk_size=batch_size), batch_size)
+
+
+def count_created(start, end):
+    """Tickets with start < created_at < end: whole hours from the rollup, partial edge hours from tickets."""
+    first_full = hour_of(start) + HOUR
+    last_full = hour_of(end)
+    tickets = Ticket.objects.filter(created_at__gt=start, created_at__lt=end)
+
+    if first_full >= last_full:
+        return tickets.count()
+
+    edges = tickets.filter(Q(created_at__lt=first_full) | Q(created_at__gte=last_full)).count()
+    full = TicketHourlyStats.objects.filter(hour__gte=first_full, hour__lt=last_full).aggregate(
+        total=Sum('count'))['total']
+    return edges + (full or 0)
+
+
+def most_active_support():
+    totals = (TicketHourlyStats.objects.exclude(completed_by_id=0).values('completed_by_id')
+              .annotate(total=Sum('count')).filter(total__gt=0).order_by())
+    best = max((row['total'] for row in totals), default=None)
+    return [{'completed_by': row['completed_by_id'], 'total': row['total']} for row in totals if row['total'] == best]
+
+
+def histogram(start, end, bucket='day', group_by=None):
+    """Ticket counts per hour/day bucket in [start, end), optionally split by one rollup dimension."""
+    trunc = TruncDay('hour', tzinfo=dt_timezone.utc) if bucket == 'day' else F('hour')
+    group = [] if group_by is None else [f'{group_by}_id' if group_by in ('created_by', 'completed_by') else group_by]
+
+    rows = (TicketHourlyStats.objects.filter(hour__gte=hour_of(start), hour__lt=end, count__gt=0)
+            .annotate(bucket=trunc).values('bucket', *group).annotate(count=Sum('count')).order_by('bucket', *group))
+
+    return [{'bucket': row['bucket'], **({group_by: row[group[0]]} if group else {}), 'count': row['count']}
+            for row in rows]
@@ -0,0 +1,116 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+DEFAULT_BACKENDS = {
+    'sqlite': 'ticket.search.SQLiteFTSSearchBackend',
+    'postgresql': 'ticket.search.PostgresSearchBackend',
+}
+
+
+def tokenize(terms):
+    return re.findall(r'\w+', ' '.join(terms).lower())
+
+
+class BaseTicketSearchBackend:
+    """
+    Keeps the ticket title/description index in sync and answers ranked, prefix-matching searches.
+    `search` must filter the queryset to matches and annotate it with `search_rank` (higher is better).
+    """
+
+    def index(self, ticket):
+        pass
+
+    def index_many(self, tickets):
+        for ticket in tickets:
+            self.index(ticket)
+
+    def remove(self, ticket_id):
+        pass
+
+    def search(self, queryset, terms, fields):
+        raise NotImplementedError
+
+
+class SQLiteFTSSearchBackend(BaseTicketSearchBackend):
+    """Inverted index kept in the `ticket_ticket_fts` FTS5 virtual table (rowid = ticket id)."""
+    table = 'ticket_ticket_fts'
+
+    def index(self, ticket):
+        self.index_many([ticket])
+
+    def index_many(self, tickets):
+        if not tickets:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [[ticket.pk] for ticket in tickets])
+            cursor.executemany(f'INSERT INTO {self.table} (rowid, title, description) VALUES (%s, %s, %s)',
+                               [[ticket.pk, ticket.title, ticket.description] for ticket in tickets])
+
+    def remove(self, ticket_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [ticket_id])
+
+    def search(self, queryset, terms, fields):
+        match = '{%s} : (%s)' % (' '.join(fields), ' '.join(f'"{token}"*' for token in tokenize(terms)))
+        matched_ids = RawSQL(f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', [match])
+        rank = RawSQL(f'SELECT -bm25({self.table}) FROM {self.table} '
+                      f'WHERE {self.table} MATCH %s AND rowid = {queryset.model._meta.db_table}.id', [match])
+        return queryset.filter(id__in=matched_ids).annotate(search_rank=rank)
+
+
+class PostgresSearchBackend(BaseTicketSearchBackend):
+    """`tsvector` search; the vectors are computed by Postgres and served from GIN expression indexes."""
+    config = 'simple'
+
+    def search(self, queryset, terms, fields):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector(*fields, config=self.config)
+        query = SearchQuery(' & '.join(f'{token}:*' for token in tokenize(terms)),
+                            search_type='raw', config=self.config)
+        return (queryset.annotate(search_vector=vector, search_rank=SearchRank(vector, query))
+                .filter(search_vector=query))
+
+
+class IContainsSearchBackend(BaseTicketSearchBackend):
+    """Unindexed fallback for database engines without a dedicated backend."""
+
+    def search(self, queryset, terms, fields):
+        for token in tokenize(terms):
+            condition = Q()
+            for field in fields:
+                condition |= Q(**{f'{field}__icontains': token})
+            queryset = queryset.filter(condition)
+        return queryset.annotate(search_rank=RawSQL('0', []))
+
+
+def get_search_backend():
+    path = getattr(settings, 'TICKET_SEARCH_BACKEND', None) or DEFAULT_BACKENDS.get(
+        connection.vendor, 'ticket.search.IContainsSearchBackend')
+    return import_string(path)()
+
+
+class TicketSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for SearchFilter on ticket viewsets, backed by the full-text index.
+    Results are ordered by rank unless the client asks for an explicit `ordering`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = [field.lstrip('^=@$') for field in self.get_search_fields(view, request) or []]
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not tokenize(search_terms):
+            return queryset
+
+        queryset = get_search_backend().search(queryset, search_terms, search_fields)
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by('-search_rank', 'id')
+        return queryset
@@ -1,15 +1,15 @@
 from users.models import CustomUser
 from rest_framework import serializers
-from .models import Ticket, SupportTicketMarks
-from rest_framework.validators import UniqueValidator
+from .models import Ticket, SupportTicketMarks, TicketEvent
 from users.serializers import UserResponseSerializer
+from users.unique import IndexedUniqueValidator, UniqueIndexMixin
 from django.utils import timezone
 
 
-class TicketBaseSerializer(serializers.HyperlinkedModelSerializer):
+class TicketBaseSerializer(UniqueIndexMixin, serializers.HyperlinkedModelSerializer):
     title = serializers.CharField(
         validators=[
-            UniqueValidator(
+            IndexedUniqueValidator(
                 queryset=Ticket.objects.all(),
             )
         ], required=False
@@ -57,7 +57,7 @@ class CompletedBySerializer(serializers.ModelSerializer):
 class TicketCreateSerializer(TicketBaseSerializer):
     title = serializers.CharField(
         validators=[
-            UniqueValidator(
+            IndexedUniqueValidator(
                 queryset=Ticket.objects.all(),
             )
         ], required=True
@@ -102,7 +102,8 @@ class TicketResponseSerializer(TicketBaseSerializer):
 
     class Meta:
         model = Ticket
-        fields = TicketBaseSerializer.Meta.fields + ['id', 'url', 'assigned_to', 'created_by', 'status']
+        fields = TicketBaseSerializer.Meta.fields + ['id', 'url', 'assigned_to', 'created_by', 'status',
+                                                     'comment_count', 'assignee_count', 'last_activity_at']
 
         extra_kwargs = {
             'url': {'view_name': 'ticket-detail', 'lookup_field': 'id'}
@@ -172,12 +173,15 @@ class SupportTicketResponseSerializer(TicketBaseSerializer):
     support_marks = SupportMarkSerializer(source='ticket_mark', read_only=True, many=True)
     assigned_to = AssignedUserSerializer(many=True, read_only=True)
     completed_by = CompletedBySerializer(read_only=True)
+    sla_status = serializers.CharField(read_only=True)
 
     class Meta:
         model = Ticket
         fields = TicketBaseSerializer.Meta.fields + ['id', 'url', "created_by", "completed_by", 'status',
                                                      'priority', 'created_at', 'assigned_to', 'updated_at', 'closed_at',
-                                                     'support_marks']
+                                                     'support_marks', 'comment_count', 'mark_count', 'assignee_count',
+                                                     'last_activity_at', 'first_response_due', 'resolve_due',
+                                                     'first_responded_at', 'sla_status']
 
         extra_kwargs = {
             'url': {'view_name': 'ticket_support-detail', 'lookup_field': 'id'}
@@ -187,7 +191,7 @@ class SupportTicketResponseSerializer(TicketBaseSerializer):
 class AdminTicketCreateSerializer(TicketBaseSerializer):
     title = serializers.CharField(
         validators=[
-            UniqueValidator(
+            IndexedUniqueValidator(
                 queryset=Ticket.objects.all(),
             )
         ], required=True
@@ -226,6 +230,7 @@ class AdminTicketCreateSerializer(TicketBaseSerializer):
         ticket = Ticket.objects.create(**validated_data)
         if assigned_to:
             ticket.assigned_to.set(assigned_to)
+            ticket.refresh_from_db(fields=['assignee_count', 'last_activity_at'])
 
 
         return ticket
@@ -255,11 +260,13 @@ class AdminTicketUpdateSerializer(TicketBaseSerializer):
 
         instance.updated_at = timezone.now()
 
+        instance.save()
+
         assigned_to = validated_data.get('assigned_to')
         if assigned_to is not None:
             instance.assigned_to.set(assigned_to)
-
-        instance.save()
+            # the m2m handlers moved the counters in the database only
+            instance.refresh_from_db(fields=['assignee_count', 'last_activity_at'])
 
         return instance
 
@@ -269,11 +276,15 @@ class AdminTicketResponseSerializer(TicketBaseSerializer):
     assigned_to = AssignedUserSerializer(many=True, read_only=True)
     completed_by = CompletedBySerializer(read_only=True)
     support_marks = SupportMarkSerializer(source='ticket_mark', read_only=True, many=True)
+    sla_status = serializers.CharField(read_only=True)
 
     class Meta:
         model = Ticket
         fields = TicketBaseSerializer.Meta.fields + ['id', 'url', 'created_by', 'assigned_to', "completed_by", 'status',
-                                                     'priority', 'created_at', 'updated_at', 'closed_at', 'support_marks']
+                                                     'priority', 'created_at', 'updated_at', 'closed_at', 'support_marks',
+                                                     'comment_count', 'mark_count', 'assignee_count', 'last_activity_at',
+                                                     'first_response_due', 'resolve_due', 'first_responded_at',
+                                                     'sla_status']
 
         extra_kwargs = {
             'url': {'view_name': 'ticket_admin-detail', "lookup_field": "id"}
@@ -281,4 +292,46 @@ class AdminTicketResponseSerializer(TicketBaseSerializer):
 
 class AdminCreatedTicketsSerializer(serializers.Serializer):
     created_first = serializers.DateTimeField(required=True)
-    created_second = serializers.DateTimeField(required=True)
\ No newline at end of file
+    created_second = serializers.DateTimeField(required=True)
+
+class AdminTicketHistogramSerializer(serializers.Serializer):
+    start = serializers.DateTimeField(required=True)
+    end = serializers.DateTimeField(required=True)
+    bucket = serializers.ChoiceField(choices=['hour', 'day'], default='day')
+    group_by = serializers.ChoiceField(choices=['status', 'priority', 'created_by', 'completed_by'], required=False)
+    max_buckets = 24 * 366
+
+    def validate(self, attrs):
+        span = attrs['end'] - attrs['start']
+        if span.total_seconds() <= 0:
+            raise serializers.ValidationError("end must be after start")
+        if span.total_seconds() / 3600 > self.max_buckets:
+            raise serializers.ValidationError("Range is limited to one year")
+        return attrs
+
+class AdminBulkTicketCreateSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=30)
+    description = serializers.CharField(max_length=250)
+    created_by = serializers.IntegerField()
+    assigned_to = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    status = serializers.ChoiceField(choices=Ticket.Status.choices, default=Ticket.Status.OPEN)
+    priority = serializers.ChoiceField(choices=Ticket.Priority.choices, default=Ticket.Priority.MEDIUM)
+
+
+class AdminBulkTicketUpdateSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField(max_length=30, required=False)
+    description = serializers.CharField(max_length=250, required=False)
+    assigned_to = serializers.ListField(child=serializers.IntegerField(), required=False)
+    status = serializers.ChoiceField(choices=Ticket.Status.choices, required=False)
+    priority = serializers.ChoiceField(choices=Ticket.Priority.choices, required=False)
+
+
+class AdminBulkTicketCloseSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+class TicketEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TicketEvent
+        fields = ['id', 'ticket_id', 'actor_id', 'action', 'field', 'old_value', 'new_value', 'created_at']
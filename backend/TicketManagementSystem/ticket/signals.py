@@ -0,0 +1,139 @@
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import Signal, receiver
+
+from users.response_cache import TICKETS, bump_generation
+
+from . import activity, counters, rollups, sla
+from .models import Ticket, SupportTicketMarks, TicketEvent
+from .search import get_search_backend
+
+# Sent by the bulk endpoints, which write with bulk_create/bulk_update/update() and so bypass
+# post_save: `action` is 'created' or 'updated', `ticket_ids` the affected tickets.
+tickets_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Ticket)
+def index_ticket(sender, instance, created, update_fields=None, **kwargs):
+    # only when a saved search field differs from the value loaded (or was not loaded at all)
+    loaded = getattr(instance, '_loaded', {})
+    saved = [field for field in ('title', 'description') if update_fields is None or field in update_fields]
+    if created or any(field not in loaded or loaded[field] != getattr(instance, field) for field in saved):
+        get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Ticket)
+def unindex_ticket(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+
+
+@receiver(pre_save, sender=Ticket)
+@receiver(pre_delete, sender=Ticket)
+def read_stored_stats(sender, instance, update_fields=None, **kwargs):
+    # Ticket.save() runs updates in a transaction, and deletes always run in one
+    instance._stored_stats = None
+    if not instance._state.adding and any(rollups.is_saved(field, update_fields) for field in rollups.TRACKED_FIELDS):
+        instance._stored_stats = rollups.stored_values(instance.pk)
+
+
+@receiver(post_save, sender=Ticket)
+def count_ticket_stats(sender, instance, created, update_fields=None, **kwargs):
+    stored = instance._stored_stats
+    if stored is None and not created:
+        return  # no rollup field was saved
+    old_key = None if stored is None else rollups.key_of(**stored)
+    new_key = rollups.written_key(instance, stored, update_fields)
+
+    if old_key != new_key:
+        if old_key is not None:
+            rollups.add(old_key, -1)
+        rollups.add(new_key, 1)
+
+
+@receiver(post_delete, sender=Ticket)
+def uncount_ticket_stats(sender, instance, **kwargs):
+    if instance._stored_stats is not None:
+        rollups.add(rollups.key_of(**instance._stored_stats), -1)
+
+
+@receiver(post_save, sender=SupportTicketMarks)
+def count_created_mark(sender, instance, created, **kwargs):
+    if created:
+        counters.bump(instance.ticket_id, 'mark_count', 1)
+        sla.respond(instance.ticket_id, instance.support_user_id)
+    else:
+        counters.touch(instance.ticket_id)
+
+
+@receiver(post_delete, sender=SupportTicketMarks)
+def count_deleted_mark(sender, instance, **kwargs):
+    counters.bump(instance.ticket_id, 'mark_count', -1)
+
+
+@receiver(m2m_changed, sender=Ticket.assigned_to.through)
+def count_assignees(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action == 'post_add' and pk_set:
+            counters.bump(instance.pk, 'assignee_count', len(pk_set))
+        elif action in ('post_remove', 'post_clear'):
+            counters.recount_assignees([instance.pk])
+        return
+
+    # user.assigned_supports.add/remove/clear(): the changed tickets are on the other side
+    if action == 'pre_clear':
+        instance._cleared_ticket_ids = list(instance.assigned_supports.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        counters.recount_assignees(instance._cleared_ticket_ids)
+    elif action in ('post_add', 'post_remove') and pk_set:
+        counters.recount_assignees(pk_set)
+
+
+@receiver(pre_save, sender=Ticket)
+def set_sla_deadlines(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'first_response_due', 'resolve_due'} <= update_fields:
+        sla.prepare(instance)
+
+
+@receiver(post_save, sender=Ticket)
+def stop_response_clock(sender, instance, **kwargs):
+    sla.saved(instance)
+
+
+@receiver(post_save, sender=Ticket)
+def record_ticket_changes(sender, instance, created, **kwargs):
+    if created:
+        activity.record([activity.event(instance.pk, TicketEvent.Action.CREATED)])
+    else:
+        activity.record(activity.changes(instance))
+
+
+@receiver(post_delete, sender=Ticket)
+def record_ticket_deleted(sender, instance, **kwargs):
+    activity.record([activity.event(instance.pk, TicketEvent.Action.DELETED)])
+
+
+@receiver(m2m_changed, sender=Ticket.assigned_to.through)
+def record_assignments(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # the rows are gone by post_clear, so clear() is recorded from what is still there
+        if reverse:
+            pairs = [(pk, instance.pk) for pk in instance.assigned_supports.values_list('pk', flat=True)]
+        else:
+            pairs = [(instance.pk, pk) for pk in instance.assigned_to.values_list('pk', flat=True)]
+        activity.record(activity.assignments(pairs, TicketEvent.Action.UNASSIGNED))
+        return
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+
+    pairs = [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in pk_set]
+    event_action = TicketEvent.Action.ASSIGNED if action == 'post_add' else TicketEvent.Action.UNASSIGNED
+    activity.record(activity.assignments(pairs, event_action))
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+@receiver(post_save, sender=SupportTicketMarks)
+@receiver(post_delete, sender=SupportTicketMarks)
+@receiver(m2m_changed, sender=Ticket.assigned_to.through)
+@receiver(tickets_bulk_changed)
+def invalidate_ticket_lists(sender, **kwargs):
+    bump_generation(TICKETS)
@@ -0,0 +1,163 @@
+"""
+Service level deadlines. Every ticket stores when its first response and its resolution are due,
+computed from created_at and TICKET_SLA_POLICIES for its priority. A deadline is running until the
+ticket gets its first response (a mark or comment by someone other than the creator, or leaving
+OPEN) or is closed; partial indexes hold only running deadlines, so breach sweeps and the
+`sla_breaching_within` filter are range scans that never touch answered or closed tickets.
+
+Each breach is recorded once as an SLA_BREACHED event, written right away rather than behind the
+request so that later sweeps see it. A deadline moved into the past (a priority change or
+recompute_deadlines) is behind the sweeper's window, so it is caught up where it is moved.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from . import activity
+from .models import Ticket, TicketEvent
+
+FIRST_RESPONSE = 'first_response'
+RESOLVE = 'resolve'
+
+AWAITING_RESPONSE = Q(first_responded_at__isnull=True)
+UNRESOLVED = ~Q(status=Ticket.Status.CLOSED)
+
+
+def policy(priority):
+    """(first response, resolve) time allowed for `priority`."""
+    first_response, resolve = settings.TICKET_SLA_POLICIES[priority]
+    return timedelta(hours=first_response), timedelta(hours=resolve)
+
+
+def deadlines(start, priority):
+    first_response, resolve = policy(priority)
+    return {'first_response_due': start + first_response, 'resolve_due': start + resolve}
+
+
+def prepare(ticket):
+    """Called before a ticket is saved: deadlines are set for new tickets and moved when the priority changes."""
+    if ticket.get_deferred_fields() & {'priority', 'created_at', 'first_response_due'}:
+        return
+
+    if ticket.first_response_due is None or priority_changed(ticket):
+        for field, due in deadlines(ticket.created_at or timezone.now(), ticket.priority).items():
+            setattr(ticket, field, due)
+
+
+def priority_changed(ticket):
+    return ticket.priority != getattr(ticket, '_loaded', {}).get('priority', ticket.priority)
+
+
+def saved(ticket):
+    """
+    Called after a ticket is saved: a ticket that has left OPEN counts as responded to, and deadlines a
+    priority change moved into the past are recorded as breached.
+    """
+    if ticket.status != Ticket.Status.OPEN and ticket.__dict__.get('first_responded_at', False) is None:
+        now = timezone.now()
+        Ticket.objects.filter(pk=ticket.pk, first_responded_at__isnull=True).update(first_responded_at=now)
+        ticket.first_responded_at = now
+    if priority_changed(ticket):
+        catch_up(Ticket.objects.filter(pk=ticket.pk))
+
+
+def respond(ticket_id, user_id):
+    """Stop the first response clock of a ticket when `user_id` is not its creator; one UPDATE, no read."""
+    Ticket.objects.filter(pk=ticket_id, first_responded_at__isnull=True).exclude(created_by_id=user_id).update(
+        first_responded_at=timezone.now())
+
+
+def recompute_deadlines(queryset):
+    """Recompute the deadlines of `queryset` from created_at and the current policies, one UPDATE per priority."""
+    updated = 0
+    for priority in Ticket.Priority.values:
+        first_response, resolve = policy(priority)
+        updated += queryset.filter(priority=priority).update(first_response_due=F('created_at') + first_response,
+                                                              resolve_due=F('created_at') + resolve)
+    catch_up(queryset)
+    return updated
+
+
+def due_between(start, end):
+    """Tickets with a running deadline in [start, end)."""
+    return ((AWAITING_RESPONSE & Q(first_response_due__gte=start, first_response_due__lt=end))
+            | (UNRESOLVED & Q(resolve_due__gte=start, resolve_due__lt=end)))
+
+
+def unrecorded(deadline):
+    return ~Exists(TicketEvent.objects.filter(ticket_id=OuterRef('id'), action=TicketEvent.Action.SLA_BREACHED,
+                                              field=deadline))
+
+
+def find_breaches(since, until, tickets=None):
+    """
+    (ticket id, deadline, due) of every running deadline of `tickets` (all by default) that passed in
+    [since, until), or before `until` when `since` is None, and has no breach recorded yet.
+    """
+    tickets = Ticket.objects.all() if tickets is None else tickets
+    response_due = {'first_response_due__lt': until} | ({} if since is None else {'first_response_due__gte': since})
+    resolve_due = {'resolve_due__lt': until} | ({} if since is None else {'resolve_due__gte': since})
+
+    responses = tickets.filter(AWAITING_RESPONSE, unrecorded(FIRST_RESPONSE), **response_due).values_list(
+        'id', 'first_response_due')
+    resolutions = tickets.filter(UNRESOLVED, unrecorded(RESOLVE), **resolve_due).values_list('id', 'resolve_due')
+    return ([(ticket_id, FIRST_RESPONSE, due) for ticket_id, due in responses]
+            + [(ticket_id, RESOLVE, due) for ticket_id, due in resolutions])
+
+
+def record_breaches(breaches):
+    """Write an SLA_BREACHED event per breach and tell the change feed and list caches about the tickets."""
+    from .signals import tickets_bulk_changed
+
+    if breaches:
+        TicketEvent.objects.bulk_create([
+            activity.event(ticket_id, TicketEvent.Action.SLA_BREACHED, deadline, new=due.isoformat())
+            for ticket_id, deadline, due in breaches
+        ])
+        tickets_bulk_changed.send(Ticket, action='updated',
+                                  ticket_ids=sorted({ticket_id for ticket_id, _, _ in breaches}))
+    return breaches
+
+
+def sweep(since, until):
+    """
+    Record each deadline that passed in [since, until). Consecutive sweeps pass the previous `until`
+    as `since`; a breach already recorded is not recorded again. Returns the breaches found.
+    """
+    return record_breaches(find_breaches(since, until))
+
+
+def catch_up(tickets):
+    """Record the running deadlines of `tickets` already past; for deadlines just moved behind the sweeper."""
+    return record_breaches(find_breaches(None, timezone.now(), tickets))
+
+
+class SLAFilter(BaseFilterBackend):
+    """
+    `?sla_breaching_within=<minutes>`: tickets with a running deadline in the next <minutes>.
+    `?sla_breached=true`: tickets with a running deadline already past.
+    """
+    within_param = 'sla_breaching_within'
+    breached_param = 'sla_breached'
+
+    def filter_queryset(self, request, queryset, view):
+        now = timezone.now()
+
+        within = request.query_params.get(self.within_param)
+        if within is not None:
+            try:
+                minutes = int(within)
+            except ValueError:
+                minutes = -1
+            if minutes < 0:
+                raise ValidationError({self.within_param: ['A whole number of minutes is required.']})
+            queryset = queryset.filter(due_between(now, now + timedelta(minutes=minutes)))
+
+        if request.query_params.get(self.breached_param) in ('true', '1'):
+            queryset = queryset.filter((AWAITING_RESPONSE & Q(first_response_due__lt=now))
+                                       | (UNRESOLVED & Q(resolve_due__lt=now)))
+        return queryset
@@ -0,0 +1,127 @@
+from django.db import DatabaseError, transaction
+from rest_framework.reverse import reverse
+
+from .utils import BaseTest
+from .. import activity
+from ..models import Ticket, TicketEvent
+
+
+class TicketActivityTests(BaseTest):
+
+    def setUp(self):
+        activity.get_buffer().events.clear()
+
+    def logged(self, ticket):
+        return list(TicketEvent.objects.filter(ticket_id=ticket.id).order_by('id')
+                    .values_list('actor_id', 'action', 'field', 'old_value', 'new_value'))
+
+    def test_admin_update_is_recorded_after_flush(self):
+        self.authenticate(self.user_data3)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse('ticket_admin-detail', kwargs={'id': self.ticket1.id}),
+                                          {'status': 'IN_PROGRESS', 'description': 'not tracked'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.logged(self.ticket1), [])
+
+        self.assertEqual(activity.flush(), 1)
+        self.assertEqual(self.logged(self.ticket1), [(self.user3.id, 'CHANGED', 'status', 'OPEN', 'IN_PROGRESS')])
+
+    def test_support_close_take_and_release(self):
+        self.ticket1.created_by = self.user2
+        self.ticket1.save()
+        activity.get_buffer().events.clear()
+
+        self.authenticate(self.user_data2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.support_ticket_url_detail + 'release/')
+            self.client.post(self.support_ticket_url_detail + 'take/')
+            self.client.delete(self.support_ticket_url_detail)
+        activity.flush()
+
+        self.assertEqual(self.logged(self.ticket1), [
+            (self.user2.id, 'UNASSIGNED', 'assigned_to', None, str(self.user2.id)),
+            (self.user2.id, 'ASSIGNED', 'assigned_to', None, str(self.user2.id)),
+            (self.user2.id, 'CHANGED', 'status', 'OPEN', 'CLOSED'),
+        ])
+
+    def test_rolled_back_changes_are_not_recorded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Ticket.objects.get(id=self.ticket1.id).delete()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        activity.flush()
+        self.assertEqual(self.logged(self.ticket1), [])
+
+    def test_bulk_endpoints_are_recorded(self):
+        self.authenticate(self.user_data3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.admin_ticket_url + 'bulk/', format='json', data=[
+                {"id": self.ticket2.id, "priority": "HIGH", "assigned_to": [self.user2.id]}])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.admin_ticket_url + 'bulk/close/', {"ids": [self.ticket2.id]}, format='json')
+        activity.flush()
+
+        self.assertEqual(self.logged(self.ticket2), [
+            (self.user3.id, 'CHANGED', 'priority', 'MEDIUM', 'HIGH'),
+            (self.user3.id, 'UNASSIGNED', 'assigned_to', None, str(self.user3.id)),
+            (self.user3.id, 'ASSIGNED', 'assigned_to', None, str(self.user2.id)),
+            (self.user3.id, 'CHANGED', 'status', 'OPEN', 'CLOSED'),
+        ])
+
+    def test_full_batch_is_written_without_flush(self):
+        buffer = activity.EventBuffer(batch_size=2, interval=60, background=False)
+        buffer.add([activity.event(self.ticket1.id, TicketEvent.Action.CREATED)])
+        self.assertEqual(TicketEvent.objects.count(), 0)
+
+        buffer.add([activity.event(self.ticket2.id, TicketEvent.Action.CREATED)])
+        self.assertEqual(TicketEvent.objects.count(), 2)
+        self.assertEqual(buffer.events, [])
+
+    def poison(self):
+        event = activity.event(self.ticket1.id, TicketEvent.Action.CREATED)
+        event.action = None  # rejected by the NOT NULL constraint
+        return event
+
+    def test_failing_batch_is_split_after_retries(self):
+        buffer = activity.EventBuffer(batch_size=10, interval=60, background=False, max_attempts=2)
+        buffer.add([activity.event(self.ticket2.id, TicketEvent.Action.CREATED), self.poison()])
+        with self.assertRaises(DatabaseError):
+            buffer.flush()
+        self.assertEqual(len(buffer.events), 2)
+
+        with self.assertLogs('ticket.activity', 'ERROR'):
+            self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(buffer.events, [])
+        self.assertEqual(list(TicketEvent.objects.values_list('ticket_id', flat=True)), [self.ticket2.id])
+
+    def test_buffer_is_bounded_and_add_does_not_raise(self):
+        buffer = activity.EventBuffer(batch_size=3, interval=60, background=False, max_events=2)
+        with self.assertLogs('ticket.activity', 'ERROR'):
+            buffer.add([activity.event(self.ticket1.id, TicketEvent.Action.CREATED, new=i) for i in range(3)])
+        self.assertEqual([event.new_value for event in buffer.events], ['1', '2'])
+
+        buffer = activity.EventBuffer(batch_size=1, interval=60, background=False)
+        with self.assertLogs('ticket.activity', 'ERROR'):
+            buffer.add([self.poison()])
+        self.assertEqual(len(buffer.events), 1)
+
+    def test_events_endpoint_pages_by_keyset(self):
+        TicketEvent.objects.bulk_create([
+            activity.event(self.ticket1.id, TicketEvent.Action.CHANGED, 'priority', 'LOW', str(i)) for i in range(5)
+        ])
+        url = reverse('ticket-events', kwargs={'id': self.ticket1.id})
+
+        self.authenticate(self.user_data1)
+        response = self.client.get(url, {'page_size': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([event['new_value'] for event in response.data['results']], ['0', '1', '2'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([event['new_value'] for event in response.data['results']], ['3', '4'])
+        self.assertIsNone(response.data['next'])
+
+        self.authenticate(self.user_data2)
+        self.assertEqual(self.client.get(reverse('ticket-events', kwargs={'id': self.ticket1.id})).status_code, 403)
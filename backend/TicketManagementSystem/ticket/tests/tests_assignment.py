@@ -0,0 +1,100 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from users.models import CustomUser
+from .utils import BaseTest
+from ..assignment import SupportLoad, assign_open_tickets
+from ..models import Ticket
+
+
+class SupportLoadTests(BaseTest):
+
+    def test_picks_least_loaded(self):
+        load = SupportLoad({1: 2, 2: 0, 3: 1})
+        self.assertEqual([load.pick() for _ in range(5)], [2, 2, 3, 1, 2])
+        self.assertEqual(load.counts, {1: 3, 2: 3, 3: 2})
+        self.assertIsNone(SupportLoad().pick())
+
+    def test_reconcile_counts_open_tickets_of_active_supports(self):
+        idle = CustomUser.objects.create_user(username='idle', email='idle@mail.com', password='x', role='SUPPORT')
+        CustomUser.objects.create_user(username='gone', email='gone@mail.com', password='x', role='SUPPORT',
+                                       is_active=False)
+        closed = Ticket.objects.create(title='Closed', description='d', created_by=self.user1, status='CLOSED')
+        closed.assigned_to.add(self.user2)
+
+        load = SupportLoad()
+        load.reconcile()
+        self.assertEqual(load.counts, {self.user2.id: 1, idle.id: 0})
+
+
+class AssignOpenTicketsTests(BaseTest):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.support = CustomUser.objects.create_user(username='support', email='support@mail.com',
+                                                     password='x', role='SUPPORT')
+
+    def create_tickets(self, prefix, count, priority='MEDIUM', status='OPEN'):
+        return Ticket.objects.bulk_create([
+            Ticket(title=f'{prefix} {i}', description='d', created_by=self.user1, priority=priority, status=status)
+            for i in range(count)
+        ])
+
+    def assignees(self, tickets):
+        return {ticket.title: list(ticket.assigned_to.values_list('id', flat=True)) for ticket in tickets}
+
+    def test_assigns_by_priority_and_load(self):
+        low = self.create_tickets('Low', 1, priority='LOW')
+        high = self.create_tickets('High', 2, priority='HIGH')
+        self.create_tickets('Progress', 1, status='IN_PROGRESS')
+        load = SupportLoad()
+        load.reconcile()
+
+        self.assertEqual(assign_open_tickets(load, 2), 2)
+        # user2 already has ticket1, so the idle support gets the first high priority ticket
+        self.assertEqual(self.assignees(high), {'High 0': [self.support.id], 'High 1': [self.user2.id]})
+        self.assertEqual(self.assignees(low), {'Low 0': []})
+
+        self.assertEqual(assign_open_tickets(load, 2), 1)
+        self.assertEqual(self.assignees(low), {'Low 0': [self.support.id]})
+        self.assertEqual(Ticket.objects.get(title='Low 0').assignee_count, 1)
+        self.assertEqual(assign_open_tickets(load, 2), 0)
+
+    def test_skips_tickets_assigned_meanwhile(self):
+        taken, waiting = self.create_tickets('Taken', 2, priority='HIGH')
+        # take() between reading the queue and writing, as seen through a stale counter
+        Ticket.assigned_to.through.objects.create(ticket_id=taken.id, customuser_id=self.user2.id)
+        load = SupportLoad({self.user2.id: 0, self.support.id: 0})
+
+        self.assertEqual(assign_open_tickets(load, 10), 1)
+        self.assertEqual(self.assignees([taken, waiting]), {'Taken 0': [self.user2.id], 'Taken 1': [self.support.id]})
+        # the pick for the skipped ticket is given back
+        self.assertEqual(load.counts, {self.user2.id: 0, self.support.id: 1})
+        self.assertEqual(load.pick(), self.user2.id)
+        self.assertEqual(Ticket.objects.get(id=taken.id).assignee_count, 1)
+
+    def test_query_count_is_constant(self):
+        load = SupportLoad({self.user2.id: 0, self.support.id: 0})
+        self.create_tickets('Small', 2, priority='HIGH')
+        with CaptureQueriesContext(connection) as small_batch:
+            assign_open_tickets(load, 100)
+
+        self.create_tickets('Large', 50, priority='HIGH')
+        with CaptureQueriesContext(connection) as large_batch:
+            assign_open_tickets(load, 100)
+
+        self.assertEqual(len(small_batch.captured_queries), len(large_batch.captured_queries))
+
+    def test_command_assigns_waiting_tickets(self):
+        tickets = self.create_tickets('Waiting', 5)
+        out = StringIO()
+        call_command('assign_tickets', '--once', '--batch-size', '2', stdout=out)
+
+        self.assertIn('Assigned 5 tickets', out.getvalue())
+        assigned = [users for users in self.assignees(tickets).values()]
+        self.assertEqual(sorted(map(len, assigned)), [1] * 5)
+        self.assertEqual(sum(users == [self.support.id] for users in assigned), 3)
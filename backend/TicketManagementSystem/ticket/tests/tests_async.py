@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from rest_framework.reverse import reverse
+
+from .utils import BaseTest
+from comment.models import Comment
+
+
+class AsyncReadEndpointTests(BaseTest):
+    """The async endpoints must answer exactly like their sync DRF counterparts."""
+
+    def setUp(self):
+        cache.clear()
+
+    def assert_same(self, sync_url, async_url, params=None):
+        expected = self.client.get(sync_url, params)
+        response = self.client.get(async_url, params)
+
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.json(), expected.json())
+        return response
+
+    def test_user_tickets(self):
+        self.authenticate(self.user_data1)
+        self.assert_same(self.user_ticket_url, reverse('async_ticket_list'), {'ordering': '-id'})
+        self.assert_same(self.user_ticket_url, reverse('async_ticket_list'), {'search': 'title'})
+        self.assert_same(self.user_ticket_url_detail, reverse('async_ticket_detail', kwargs={'id': self.ticket1.id}))
+
+        response = self.client.get(reverse('async_ticket_detail', kwargs={'id': 999999}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_support_tickets(self):
+        self.authenticate(self.user_data2)
+        self.assert_same(self.support_ticket_url, reverse('async_ticket_support_list'))
+        self.assert_same(self.support_ticket_url_detail,
+                         reverse('async_ticket_support_detail', kwargs={'id': self.ticket1.id}))
+
+        response = self.client.get(reverse('async_ticket_support_detail', kwargs={'id': self.ticket2.id}))
+        self.assertEqual(response.status_code, 403)
+
+    def test_admin_tickets(self):
+        self.authenticate(self.user_data3)
+        self.assert_same(self.admin_ticket_url, reverse('async_ticket_admin_list'), {'status': 'OPEN'})
+        self.assert_same(self.admin_ticket_url, reverse('async_ticket_admin_list'), {'pagination': 'cursor'})
+        self.assert_same(self.admin_ticket_url_detail,
+                         reverse('async_ticket_admin_detail', kwargs={'id': self.ticket1.id}))
+
+        self.assertEqual(self.client.get(reverse('async_ticket_admin_list'), {'page': 5}).status_code, 404)
+        self.assertEqual(self.client.get(reverse('async_ticket_admin_list'), {'id': 'x'}).status_code, 400)
+
+    def test_role_and_authentication_checks(self):
+        self.assertEqual(self.client.get(reverse('async_ticket_list')).status_code, 401)
+
+        self.authenticate(self.user_data1)
+        self.assertEqual(self.client.get(reverse('async_ticket_admin_list')).status_code, 403)
+        self.assertEqual(self.client.post(reverse('async_ticket_list')).status_code, 405)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalid')
+        self.assertEqual(self.client.get(reverse('async_ticket_list')).status_code, 401)
+
+    def test_comments_and_me(self):
+        Comment.objects.create(created_by=self.user1, ticket=self.ticket1, comment_text="Some comment")
+        self.authenticate(self.user_data1)
+
+        self.assert_same(reverse('user_comments-list', kwargs={'ticket_id': self.ticket1.id}),
+                         reverse('async_user_comments_list', kwargs={'ticket_id': self.ticket1.id}))
+        self.assert_same(reverse('users_me'), reverse('async_users_me'))
+
+    async def test_served_by_asgi_handler(self):
+        token = (await self.async_client.post(reverse('token_obtain_pair'), {
+            "username": self.user_data1["username"], "password": self.user_data1["password"]},
+            content_type='application/json')).json()['access']
+
+        response = await self.async_client.get(reverse('async_ticket_list'),
+                                               headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([ticket['id'] for ticket in response.json()['results']], [self.ticket1.id, self.ticket2.id])
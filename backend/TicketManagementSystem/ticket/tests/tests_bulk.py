@@ -0,0 +1,101 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .utils import BaseTest
+from ..models import Ticket
+
+
+class AdminBulkTicketTests(BaseTest):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.bulk_url = cls.admin_ticket_url + 'bulk/'
+        cls.bulk_close_url = cls.admin_ticket_url + 'bulk/close/'
+
+    def setUp(self):
+        self.authenticate(self.user_data3)
+
+    def ticket_data(self, title, **kwargs):
+        return {"title": title, "description": "Some description", "created_by": self.user1.id, **kwargs}
+
+    def test_bulk_create(self):
+        items = [
+            self.ticket_data("Bulk 1", assigned_to=[self.user2.id]),
+            self.ticket_data("Bulk 2", priority="HIGH"),
+            self.ticket_data("Some title"),
+            self.ticket_data("Bulk 1"),
+            self.ticket_data("Bulk 3", assigned_to=[self.user1.id]),
+        ]
+        response = self.client.post(self.bulk_url, data=items, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        results = response.data['results']
+        self.assertEqual([result.get('status') for result in results], ['created', 'created', None, None, None])
+        self.assertIn('title', results[2]['errors'])
+        self.assertIn('title', results[3]['errors'])
+        self.assertIn('assigned_to', results[4]['errors'])
+
+        created = Ticket.objects.get(id=results[0]['id'])
+        self.assertEqual(list(created.assigned_to.values_list('id', flat=True)), [self.user2.id])
+        self.assertEqual(Ticket.objects.get(id=results[1]['id']).priority, "HIGH")
+
+        response = self.client.get(self.admin_ticket_url, {'search': 'bulk'})
+        self.assertEqual(response.data['count'], 2)
+
+    def test_bulk_create_query_count_is_constant(self):
+        with CaptureQueriesContext(connection) as small_batch:
+            self.client.post(self.bulk_url, data=[self.ticket_data("Small 1", assigned_to=[self.user2.id])],
+                             format='json')
+
+        items = [self.ticket_data(f"Large {i}", assigned_to=[self.user2.id]) for i in range(20)]
+        with CaptureQueriesContext(connection) as large_batch:
+            self.client.post(self.bulk_url, data=items, format='json')
+
+        self.assertEqual(len(small_batch.captured_queries), len(large_batch.captured_queries))
+
+    def test_bulk_update(self):
+        items = [
+            {"id": self.ticket1.id, "status": "IN_PROGRESS", "assigned_to": []},
+            {"id": self.ticket2.id, "title": "Some title"},
+            {"id": 32121321, "status": "CLOSED"},
+        ]
+        response = self.client.patch(self.bulk_url, data=items, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        results = response.data['results']
+        self.assertEqual(results[0]['status'], 'updated')
+        self.assertIn('title', results[1]['errors'])
+        self.assertIn('id', results[2]['errors'])
+
+        self.ticket1.refresh_from_db()
+        self.assertEqual(self.ticket1.status, "IN_PROGRESS")
+        self.assertFalse(self.ticket1.assigned_to.exists())
+
+    def test_bulk_close(self):
+        response = self.client.post(self.bulk_close_url, data={"ids": [self.ticket1.id, 32121321]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['status'], 'closed')
+        self.assertIn('errors', response.data['results'][1])
+
+        self.ticket1.refresh_from_db()
+        self.assertEqual(self.ticket1.status, "CLOSED")
+        self.assertIsNotNone(self.ticket1.closed_at)
+
+    def test_bulk_close_keeps_closed_tickets(self):
+        self.client.post(self.bulk_close_url, data={"ids": [self.ticket1.id]}, format='json')
+        closed_at = Ticket.objects.get(id=self.ticket1.id).closed_at
+
+        response = self.client.post(self.bulk_close_url, data={"ids": [self.ticket1.id]}, format='json')
+        self.assertEqual(response.data['results'], [{'index': 0, 'id': self.ticket1.id, 'status': 'closed'}])
+        self.assertEqual(Ticket.objects.get(id=self.ticket1.id).closed_at, closed_at)
+
+    def test_bulk_rejects_oversized_batch(self):
+        items = [self.ticket_data(f"Title {i}") for i in range(501)]
+        response = self.client.post(self.bulk_url, data=items, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_forbidden_for_support(self):
+        self.authenticate(self.user_data2)
+        response = self.client.post(self.bulk_url, data=[self.ticket_data("Bulk 1")], format='json')
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,73 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from importlib.util import find_spec
+from io import BytesIO
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .utils import BaseTest
+from .. import compiled
+from ..models import Ticket
+from ..serializers import AdminTicketResponseSerializer, SupportTicketResponseSerializer, TicketResponseSerializer
+
+HAS_ORJSON = find_spec('orjson') is not None
+if HAS_ORJSON:
+    from TicketManagementSystem.parsers import ORJSONParser
+    from TicketManagementSystem.renderers import ORJSONRenderer
+
+
+class CompiledSerializerTests(BaseTest):
+
+    def setUp(self):
+        super().setUp()
+        self.request = Request(APIRequestFactory().get('/'))
+
+    def assert_same_output(self, serializer_class, queryset):
+        tickets = list(queryset.order_by('id'))
+        expected = serializer_class(tickets, many=True, context={'request': self.request}).data
+        self.assertEqual(compiled.serialize(serializer_class, tickets, self.request, many=True),
+                         json.loads(json.dumps(expected)))
+        self.assertEqual(compiled.serialize(serializer_class, tickets[0], self.request), expected[0])
+
+    def test_matches_drf_output(self):
+        self.ticket2.completed_by = None
+        self.ticket2.save()
+
+        self.assert_same_output(TicketResponseSerializer, Ticket.objects.for_user())
+        self.assert_same_output(SupportTicketResponseSerializer, Ticket.objects.for_support())
+        self.assert_same_output(AdminTicketResponseSerializer, Ticket.objects.for_admin())
+
+    def test_list_endpoint_unchanged(self):
+        self.authenticate(self.user_data3)
+        response = self.client.get(self.admin_ticket_url)
+
+        with override_settings(COMPILED_SERIALIZERS=False):
+            expected = self.client.get(self.admin_ticket_url)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response.json()['results'][0]['support_marks'], [{'id': self.mark1.id}])
+
+
+@skipUnless(HAS_ORJSON, "orjson is an optional dependency (JSON_BACKEND falls back to 'json')")
+class ORJSONTests(SimpleTestCase):
+
+    def test_renders_like_json_renderer(self):
+        moment = datetime(2024, 5, 1, 12, 30, 15, 123456)
+        data = {'id': 1, 'title': 'Ticket', 'price': Decimal('1.50'), 'tags': ['a'], 'nested': {'ok': True},
+                'aware': moment.replace(tzinfo=dt_timezone.utc), 'naive': moment, 'whole': moment.replace(microsecond=0),
+                'offset': moment.replace(tzinfo=dt_timezone(timedelta(hours=2))), 'day': moment.date(),
+                'time': moment.time()}
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+        self.assertIn(b'"aware":"2024-05-01T12:30:15.123456Z"', ORJSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_parser(self):
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(BytesIO(b'{"title": "x"}')), {'title': 'x'})
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b'{"title":'))
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.reverse import reverse
+
+from .utils import BaseTest
+from ..models import Ticket
+from comment.models import Comment
+
+
+class ConditionalGetTests(BaseTest):
+
+    def assert_revalidates(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        return response
+
+    def test_retrieve_not_modified(self):
+        self.authenticate(self.user_data1)
+        first = self.assert_revalidates(self.user_ticket_url_detail)
+
+        self.authenticate(self.user_data2)
+        self.assert_revalidates(self.support_ticket_url_detail)
+
+        self.authenticate(self.user_data3)
+        self.assert_revalidates(self.admin_ticket_url_detail)
+
+        Comment.objects.create(created_by=self.user1, ticket=self.ticket1, comment_text="Some comment")
+        self.authenticate(self.user_data1)
+        response = self.client.get(self.user_ticket_url_detail, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['comment_count'], 1)
+
+    def test_not_modified_before_loading_ticket(self):
+        self.authenticate(self.user_data3)
+        etag = self.client.get(self.admin_ticket_url_detail)['ETag']
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.admin_ticket_url_detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_if_modified_since_is_not_answered(self):
+        self.authenticate(self.user_data1)
+        response = self.client.get(self.user_ticket_url_detail)
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get(self.user_ticket_url_detail, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+    def test_ticket_left_the_list(self):
+        self.ticket1.assigned_to.add(self.user2)
+        self.ticket2.assigned_to.add(self.user2)
+        self.authenticate(self.user_data2)
+        response = self.client.get(self.support_ticket_url)
+        self.assertEqual([ticket['id'] for ticket in response.data['results']], [self.ticket1.id, self.ticket2.id])
+        self.assertNotIn('Last-Modified', response)
+
+        self.ticket1.assigned_to.remove(self.user2)
+        response = self.client.get(self.support_ticket_url, HTTP_IF_NONE_MATCH=response['ETag'],
+                                   HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([ticket['id'] for ticket in response.data['results']], [self.ticket2.id])
+
+    def test_sla_state_changed(self):
+        self.authenticate(self.user_data3)
+        Ticket.objects.filter(pk=self.ticket1.pk).update(first_responded_at=None,
+                                                         first_response_due=timezone.now() + timedelta(hours=2))
+        etag = self.client.get(self.admin_ticket_url_detail)['ETag']
+
+        # only time has passed: nothing the ticket's timestamps would show
+        Ticket.objects.filter(pk=self.ticket1.pk).update(first_response_due=timezone.now() - timedelta(minutes=1))
+        response = self.client.get(self.admin_ticket_url_detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['sla_status'], 'breached')
+
+    def test_permission_checked_before_not_modified(self):
+        self.authenticate(self.user_data3)
+        etag = self.client.get(self.admin_ticket_url_detail)['ETag']
+
+        self.authenticate(self.user_data2)
+        url = reverse('ticket_support-detail', kwargs={'id': self.ticket2.id})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 403)
+
+    def test_list_pages(self):
+        self.authenticate(self.user_data3)
+        etag = self.assert_revalidates(self.admin_ticket_url)['ETag']
+
+        self.ticket2.assigned_to.add(self.user2)
+        response = self.client.get(self.admin_ticket_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        self.assert_revalidates(self.admin_ticket_url + '?pagination=cursor')
+
+        self.authenticate(self.user_data2)
+        self.assert_revalidates(self.support_ticket_url)
+
+    def test_user_detail(self):
+        self.authenticate(self.user_data1)
+        url = reverse('user-detail', kwargs={'id': self.user1.id})
+        etag = self.assert_revalidates(url)['ETag']
+
+        self.user1.email = 'changed@mail.com'
+        self.user1.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
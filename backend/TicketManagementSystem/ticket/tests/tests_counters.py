@@ -0,0 +1,88 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from .utils import BaseTest
+from ..models import Ticket, SupportTicketMarks
+from comment.models import Comment
+from users.models import CustomUser
+
+
+class TicketCounterTests(BaseTest):
+
+    def counters(self, ticket):
+        ticket.refresh_from_db()
+        return ticket.comment_count, ticket.mark_count, ticket.assignee_count
+
+    def test_fixture_counters(self):
+        self.assertEqual(self.counters(self.ticket1), (0, 1, 1))
+        self.assertIsNotNone(self.ticket1.last_activity_at)
+
+    def test_comment_counter(self):
+        root = Comment.objects.create(created_by=self.user1, ticket=self.ticket1, comment_text="root")
+        Comment.objects.create(created_by=self.user1, ticket=self.ticket1, parent=root, comment_text="reply")
+        self.assertEqual(self.counters(self.ticket1), (2, 1, 1))
+
+        root.delete()
+        self.assertEqual(self.counters(self.ticket1), (0, 1, 1))
+
+    def test_mark_counter(self):
+        SupportTicketMarks.objects.create(ticket=self.ticket1, support_user=self.user2, support_status="IN_PROGRESS")
+        self.assertEqual(self.counters(self.ticket1)[1], 2)
+
+        self.mark1.delete()
+        self.assertEqual(self.counters(self.ticket1)[1], 1)
+
+    def test_assignee_counter(self):
+        self.ticket1.assigned_to.add(self.user2, self.user3)
+        self.assertEqual(self.counters(self.ticket1)[2], 2)
+
+        self.ticket1.assigned_to.remove(self.user3, self.user1)
+        self.assertEqual(self.counters(self.ticket1)[2], 1)
+
+        self.user3.assigned_supports.add(self.ticket1)
+        self.assertEqual(self.counters(self.ticket1)[2], 2)
+
+        self.user2.assigned_supports.clear()
+        self.assertEqual(self.counters(self.ticket1)[2], 1)
+
+        self.ticket1.assigned_to.clear()
+        self.assertEqual(self.counters(self.ticket1)[2], 0)
+
+    def test_admin_patch_assignees_keeps_count(self):
+        support = CustomUser.objects.create_user(username='support', email='support@mail.com', password='x',
+                                                 role='SUPPORT')
+        self.authenticate(self.user_data3)
+        response = self.client.patch(self.admin_ticket_url_detail, {'assigned_to': [self.user2.id, support.id]},
+                                     format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['assignee_count'], 2)
+        self.assertEqual(self.counters(self.ticket1)[2], 2)
+
+    def test_save_leaves_counters_alone(self):
+        stale = Ticket.objects.get(id=self.ticket1.id)
+        Comment.objects.create(created_by=self.user1, ticket=self.ticket1, comment_text="meanwhile")
+
+        stale.status = Ticket.Status.IN_PROGRESS
+        stale.save()
+        self.assertEqual(self.counters(self.ticket1), (1, 1, 1))
+
+    def test_repair_command(self):
+        Comment.objects.create(created_by=self.user1, ticket=self.ticket1, comment_text="Some comment")
+        Ticket.objects.update(comment_count=7, mark_count=0, assignee_count=5)
+
+        call_command('repair_ticket_counters', batch_size=1, stdout=StringIO())
+
+        self.assertEqual(self.counters(self.ticket1), (1, 1, 1))
+        self.assertEqual(self.counters(self.ticket2), (0, 1, 1))
+
+    def test_admin_order_and_filter_by_counters(self):
+        self.authenticate(self.user_data3)
+        Comment.objects.create(created_by=self.user1, ticket=self.ticket2, comment_text="Some comment")
+
+        response = self.client.get(self.admin_ticket_url, {'ordering': '-comment_count'})
+        self.assertEqual(response.data['results'][0]['id'], self.ticket2.id)
+        self.assertEqual(response.data['results'][0]['comment_count'], 1)
+
+        response = self.client.get(self.admin_ticket_url, {'comment_count__gte': 1})
+        self.assertEqual([ticket['id'] for ticket in response.data['results']], [self.ticket2.id])
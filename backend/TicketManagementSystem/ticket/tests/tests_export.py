@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+
+from .utils import BaseTest
+from comment.models import Comment
+
+
+class AdminTicketExportTests(BaseTest):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.export_url = cls.admin_ticket_url + 'export/'
+        Comment.objects.create(created_by=cls.user1, ticket=cls.ticket1, comment_text="Some comment")
+
+    def setUp(self):
+        self.authenticate(self.user_data3)
+
+    def test_export_ndjson(self):
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.ticket1.id, self.ticket2.id])
+        self.assertEqual(rows[0]['assigned_to'], [self.user2.id])
+        self.assertEqual(rows[0]['mark_count'], 1)
+        self.assertEqual(rows[0]['comment_count'], 1)
+        self.assertEqual(rows[1]['comment_count'], 0)
+
+    def test_export_csv_uses_list_filters(self):
+        response = self.client.get(self.export_url, {'export_format': 'csv', 'assigned_to__id': self.user3.id})
+        self.assertEqual(response.status_code, 200)
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['id'], str(self.ticket2.id))
+        self.assertEqual(rows[0]['assigned_to'], str(self.user3.id))
+
+    def test_export_unsupported_format(self):
+        response = self.client.get(self.export_url, {'export_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_forbidden_for_user(self):
+        self.authenticate(self.user_data1)
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from comment.models import Comment
+from users.models import CustomUser, Role
+from .utils import BaseTest
+from ..models import SupportTicketMarks
+
+
+@override_settings(LIST_CACHE_TIMEOUT=60)
+class ListCacheTests(BaseTest):
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url, **headers):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, **headers)
+        return response, len(context.captured_queries)
+
+    def test_second_request_served_from_cache(self):
+        self.authenticate(self.user_data2)
+        first, first_queries = self.get(self.support_ticket_url)
+        second, second_queries = self.get(self.support_ticket_url)
+
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertLess(second_queries, first_queries)
+
+        response, _ = self.get(self.support_ticket_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_keyed_by_query_string(self):
+        self.authenticate(self.user_data1)
+        self.get(self.user_ticket_url)
+        response, _ = self.get(self.user_ticket_url + '?status=CLOSED')
+        self.assertEqual(response.json()['results'], [])
+
+    def test_writes_invalidate(self):
+        self.authenticate(self.user_data1)
+        response, _ = self.get(self.user_ticket_url)
+        self.assertEqual(response.json()['results'][0]['comment_count'], 0)
+
+        Comment.objects.create(created_by=self.user1, ticket=self.ticket1, comment_text="Some comment")
+        response, _ = self.get(self.user_ticket_url)
+        self.assertEqual(response.json()['results'][0]['comment_count'], 1)
+
+        self.ticket1.title = "Renamed"
+        self.ticket1.save()
+        response, _ = self.get(self.user_ticket_url)
+        self.assertEqual(response.json()['results'][0]['title'], "Renamed")
+
+        self.authenticate(self.user_data2)
+        response, _ = self.get(self.support_ticket_url)
+        SupportTicketMarks.objects.filter(id=self.mark1.id).delete()
+        self.assertNotEqual(self.get(self.support_ticket_url)[0].json(), response.json())
+
+    def test_keyed_by_user(self):
+        other_data = {"username": "support2", "password": "Dsdasj2dskl1"}
+        other = CustomUser.objects.create_user(email="support2@mail.com", role=Role.SUPPORT, **other_data)
+        self.ticket2.assigned_to.add(other)
+
+        self.authenticate(self.user_data2)
+        response, _ = self.get(self.support_ticket_url)
+        self.assertEqual([ticket['id'] for ticket in response.json()['results']], [self.ticket1.id])
+
+        self.authenticate(other_data)
+        response, _ = self.get(self.support_ticket_url)
+        self.assertEqual([ticket['id'] for ticket in response.json()['results']], [self.ticket2.id])
@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .utils import BaseTest
+from ..models import Ticket
+
+
+class TicketCursorPaginationTests(BaseTest):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(5):
+            Ticket.objects.create(title=f"Cursor title {i}", description="Some description", created_by=cls.user1)
+
+    def setUp(self):
+        self.authenticate(self.user_data3)
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get(self.admin_ticket_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 7)
+
+    def test_cursor_mode_walks_all_tickets_without_count(self):
+        url = self.admin_ticket_url + '?pagination=cursor&page_size=3'
+        seen = []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(' in q['sql'] for q in context.captured_queries))
+            seen += [ticket['id'] for ticket in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(seen, list(Ticket.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_cursor_mode_descending_created_at(self):
+        response = self.client.get(self.admin_ticket_url + '?pagination=cursor&ordering=-created_at')
+        self.assertEqual(response.status_code, 200)
+        ids = [ticket['id'] for ticket in response.data['results']]
+        self.assertEqual(ids, list(Ticket.objects.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+    def test_support_cursor_mode_only_assigned(self):
+        self.authenticate(self.user_data2)
+        response = self.client.get(self.support_ticket_url + '?pagination=cursor')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([ticket['id'] for ticket in response.data['results']], [self.ticket1.id])
+
+    def test_cursor_mode_refuses_unsupported_ordering(self):
+        response = self.client.get(self.admin_ticket_url + '?pagination=cursor&ordering=priority')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.data)
+
+        # page numbers still accept it
+        response = self.client.get(self.admin_ticket_url + '?ordering=priority')
+        self.assertEqual(response.status_code, 200)
+
+    def test_cursor_mode_refuses_search_rank_ordering(self):
+        response = self.client.get(self.admin_ticket_url + '?pagination=cursor&search=cursor')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(self.admin_ticket_url + '?pagination=cursor&search=cursor&ordering=id')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 5)
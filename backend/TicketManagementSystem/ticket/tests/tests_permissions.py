@@ -0,0 +1,55 @@
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .utils import BaseTest
+from ..models import Ticket, SupportTicketMarks
+from ..permissions import IsAssignedTo, IsAssignedToMarks, is_assigned
+
+
+class AssignmentPermissionTests(BaseTest):
+
+    def make_request(self, user):
+        request = Request(APIRequestFactory().get('/'))
+        request.user = user
+        return request
+
+    def test_is_assigned_memoized_per_request(self):
+        request = self.make_request(self.user2)
+        with self.assertNumQueries(2):
+            self.assertTrue(is_assigned(request, self.ticket1.id))
+            self.assertTrue(is_assigned(request, str(self.ticket1.id)))
+            self.assertFalse(is_assigned(request, self.ticket2.id))
+            self.assertFalse(is_assigned(request, self.ticket2.id))
+
+        self.assertFalse(is_assigned(request, 'not-a-ticket'))
+
+    def test_marks_object_permission_single_query(self):
+        marks = [self.mark1] + [
+            SupportTicketMarks.objects.create(ticket=self.ticket1, support_user=self.user2, support_status="IN_PROGRESS")
+            for _ in range(3)
+        ]
+        marks = list(SupportTicketMarks.objects.filter(id__in=[mark.id for mark in marks]))
+        request = self.make_request(self.user2)
+        permission = IsAssignedToMarks()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(all(permission.has_object_permission(request, None, mark) for mark in marks))
+
+    def test_assigned_to_uses_prefetched_assignees(self):
+        ticket = Ticket.objects.for_support().get(id=self.ticket1.id)
+        request = self.make_request(self.user2)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(IsAssignedTo().has_object_permission(request, None, ticket))
+
+    def test_assigned_to_user_queryset_filter(self):
+        self.ticket2.assigned_to.add(self.user2)
+
+        tickets = Ticket.objects.assigned_to_user(self.user2).order_by('id')
+        self.assertEqual(list(tickets), [self.ticket1, self.ticket2])
+        self.assertEqual(list(Ticket.objects.assigned_to_user(self.user1)), [])
+
+    def test_support_create_mark_for_unexisting_ticket(self):
+        self.authenticate(self.user_data2)
+        response = self.client.post(self.support_ticket_url + '321/marks/', data={}, format='json')
+        self.assertEqual(response.status_code, 403)
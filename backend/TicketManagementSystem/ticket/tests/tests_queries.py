@@ -0,0 +1,47 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .utils import BaseTest
+from ..models import Ticket, SupportTicketMarks
+
+
+class TicketListQueryCountTests(BaseTest):
+
+    def create_tickets(self, count, prefix):
+        for i in range(count):
+            ticket = Ticket.objects.create(
+                title=f"{prefix} {i}",
+                description="Some description",
+                created_by=self.user1,
+                completed_by=self.user2,
+            )
+            ticket.assigned_to.add(self.user2, self.user3)
+            SupportTicketMarks.objects.create(ticket=ticket, support_user=self.user2, support_status="IN_PROGRESS")
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assert_constant_queries(self, url):
+        self.client.get(url)
+        self.create_tickets(1, "small")
+        small_page = self.count_queries(url)
+
+        self.create_tickets(20, "large")
+        large_page = self.count_queries(url)
+
+        self.assertEqual(small_page, large_page)
+
+    def test_admin_list_query_count_is_constant(self):
+        self.authenticate(self.user_data3)
+        self.assert_constant_queries(self.admin_ticket_url)
+
+    def test_support_list_query_count_is_constant(self):
+        self.authenticate(self.user_data2)
+        self.assert_constant_queries(self.support_ticket_url)
+
+    def test_user_list_query_count_is_constant(self):
+        self.authenticate(self.user_data1)
+        self.assert_constant_queries(self.user_ticket_url)
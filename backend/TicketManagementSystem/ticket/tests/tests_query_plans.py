@@ -0,0 +1,70 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.utils import timezone
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from comment.models import Comment
+from metrics.benchmark import bench_users, seed
+from metrics.query_plans import explain, full_scans, record_queries
+from users.models import Role
+from ..models import Ticket
+
+
+@skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN output is SQLite specific")
+class HotQueryPlanTests(APITestCase):
+    """Every SELECT behind the hot list/filter endpoints must be answered from an index, never a table scan."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(users=20, supports=20, tickets=300, comments=3, comment_depth=2)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.users = bench_users()
+        cls.ticket = Comment.objects.values_list('ticket', flat=True).first()
+
+    def hot_requests(self):
+        user, support = self.users[Role.USER], self.users[Role.SUPPORT]
+        now = timezone.now()
+        admin_list = reverse('ticket_admin-list')
+        # one-sided ranges matching most rows are cheaper as a scan; the admin UI sends bounded windows
+        window = f'last_activity_at__gte={(now - timedelta(hours=1)).isoformat()}&last_activity_at__lte={now.isoformat()}'
+        return [
+            (Role.USER, 'get', reverse('ticket-list'), None),
+            (Role.USER, 'get', reverse('ticket-list') + '?status=OPEN', None),
+            (Role.SUPPORT, 'get', reverse('ticket_support-list'), None),
+            (Role.SUPPORT, 'get', reverse('ticket_support-list') + '?status=OPEN&priority=HIGH', None),
+            (Role.ADMIN, 'get', admin_list + '?status=OPEN', None),
+            (Role.ADMIN, 'get', admin_list + '?priority=HIGH', None),
+            (Role.ADMIN, 'get', admin_list + f'?created_by__id={user.id}', None),
+            (Role.ADMIN, 'get', admin_list + f'?assigned_to__id={support.id}', None),
+            (Role.ADMIN, 'get', admin_list + '?' + window.replace('+', '%2B'), None),
+            (Role.ADMIN, 'get', admin_list + '?ordering=created_at', None),
+            (Role.ADMIN, 'get', admin_list + '?pagination=cursor&ordering=-created_at', None),
+            (Role.ADMIN, 'get', admin_list + '?sla_breaching_within=60', None),
+            (Role.ADMIN, 'get', admin_list + '?sla_breached=true', None),
+            (Role.ADMIN, 'post', reverse('ticket_admin-tickets-created'),
+             {'created_first': now - timedelta(days=2), 'created_second': now}),
+            (Role.ADMIN, 'get', reverse('ticket_admin-marks', kwargs={'id': self.ticket}), None),
+            (Role.USER, 'get', reverse('user_comments-list', kwargs={'ticket_id': self.ticket}), None),
+            (Role.USER, 'get', reverse('user_comments-thread', kwargs={'ticket_id': self.ticket}), None),
+        ]
+
+    def test_no_full_scans(self):
+        for role, method, url, body in self.hot_requests():
+            with self.subTest(url=url):
+                self.client.force_authenticate(self.users[role])
+                with record_queries() as queries:
+                    response = getattr(self.client, method)(url, body, format='json')
+                self.assertEqual(response.status_code, 200)
+
+                for sql, params in queries:
+                    plan = explain(sql, params)
+                    self.assertEqual(full_scans(plan), [], f"{sql}\n{plan}")
+
+    def test_full_scan_detected(self):
+        plan = explain(*Ticket.objects.filter(description='x').query.sql_with_params())
+        self.assertEqual(full_scans(plan), ['ticket_ticket'])
+        self.assertEqual(full_scans(explain(*Ticket.objects.filter(status='OPEN').query.sql_with_params())), [])
@@ -0,0 +1,60 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .utils import BaseTest
+from ..models import Ticket
+
+
+class TicketSearchTests(BaseTest):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.printer_ticket = Ticket.objects.create(title="Printer jammed", description="The office printer is jammed",
+                                                   created_by=cls.user1)
+        cls.network_ticket = Ticket.objects.create(title="Network down", description="Printer cannot reach network",
+                                                   created_by=cls.user1)
+
+    def search(self, url, term):
+        response = self.client.get(url, {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return [ticket['id'] for ticket in response.data['results']]
+
+    def test_admin_search_is_ranked(self):
+        self.authenticate(self.user_data3)
+        ids = self.search(self.admin_ticket_url, 'printer')
+        self.assertEqual(ids, [self.printer_ticket.id, self.network_ticket.id])
+
+    def test_admin_search_prefix(self):
+        self.authenticate(self.user_data3)
+        self.assertEqual(self.search(self.admin_ticket_url, 'netw'), [self.network_ticket.id])
+
+    def test_user_search_only_title(self):
+        self.authenticate(self.user_data1)
+        self.assertEqual(self.search(self.user_ticket_url, 'printer'), [self.printer_ticket.id])
+
+    def test_search_index_follows_save_and_delete(self):
+        self.authenticate(self.user_data3)
+        self.printer_ticket.title = "Scanner jammed"
+        self.printer_ticket.save()
+        self.assertEqual(self.search(self.admin_ticket_url, 'scanner'), [self.printer_ticket.id])
+
+        self.printer_ticket.delete()
+        self.assertEqual(self.search(self.admin_ticket_url, 'scanner'), [])
+
+    def test_save_reindexes_only_changed_text(self):
+        ticket = Ticket.objects.get(id=self.printer_ticket.id)
+        ticket.status = Ticket.Status.IN_PROGRESS
+        with CaptureQueriesContext(connection) as context:
+            ticket.save()
+        self.assertFalse([query for query in context.captured_queries if 'fts' in query['sql']])
+
+        ticket.description = "The scanner is jammed"
+        with CaptureQueriesContext(connection) as context:
+            ticket.save()
+        self.assertEqual(connection.vendor == 'sqlite',
+                         any('fts' in query['sql'] for query in context.captured_queries))
+
+    def test_search_ignores_query_syntax(self):
+        self.authenticate(self.user_data3)
+        self.assertEqual(self.search(self.admin_ticket_url, '"network" *'), [self.network_ticket.id])
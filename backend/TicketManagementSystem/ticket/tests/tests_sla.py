@@ -0,0 +1,131 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.reverse import reverse
+
+from comment.models import Comment
+from .utils import BaseTest
+from .. import activity, sla
+from ..models import SupportTicketMarks, Ticket, TicketEvent
+
+
+class SLATests(BaseTest):
+
+    def setUp(self):
+        activity.get_buffer().events.clear()
+
+    def create(self, title, hours_ago=0, **kwargs):
+        """A ticket without a response yet, created `hours_ago`."""
+        ticket = Ticket.objects.create(title=title, description='d', created_by=self.user1, **kwargs)
+        start = timezone.now() - timedelta(hours=hours_ago)
+        Ticket.objects.filter(id=ticket.id).update(created_at=start, **sla.deadlines(start, ticket.priority))
+        ticket.refresh_from_db()
+        return ticket
+
+    def test_deadlines_follow_priority(self):
+        ticket = Ticket.objects.create(title='New', description='d', created_by=self.user1, priority='HIGH')
+        # computed just before created_at is stamped
+        self.assertAlmostEqual(ticket.first_response_due - ticket.created_at, timedelta(hours=1),
+                               delta=timedelta(seconds=1))
+        self.assertAlmostEqual(ticket.resolve_due - ticket.created_at, timedelta(hours=8), delta=timedelta(seconds=1))
+
+        ticket = Ticket.objects.get(id=ticket.id)
+        ticket.priority = 'LOW'
+        ticket.save()
+        self.assertEqual(ticket.resolve_due - ticket.created_at, timedelta(hours=72))
+
+    def test_first_response(self):
+        ticket = Ticket.objects.create(title='New', description='d', created_by=self.user1)
+        Comment.objects.create(ticket=ticket, created_by=self.user1, comment_text='still broken')
+        ticket.refresh_from_db()
+        self.assertIsNone(ticket.first_responded_at)
+
+        SupportTicketMarks.objects.create(ticket=ticket, support_user=self.user2, support_status='IN_PROGRESS')
+        ticket.refresh_from_db()
+        self.assertIsNotNone(ticket.first_responded_at)
+
+        other = Ticket.objects.create(title='Other', description='d', created_by=self.user1)
+        other.status = 'IN_PROGRESS'
+        other.save()
+        self.assertIsNotNone(other.first_responded_at)
+
+    def test_sla_status(self):
+        self.assertEqual(self.create('New', priority='HIGH').sla_status, 'at_risk')
+        self.assertEqual(self.create('Waiting', priority='HIGH', hours_ago=2).sla_status, 'breached')
+
+        ticket = self.create('Answered', priority='HIGH', hours_ago=2)
+        ticket.first_responded_at = timezone.now()
+        self.assertEqual(ticket.sla_status, 'on_track')
+        ticket.status = 'CLOSED'
+        self.assertIsNone(ticket.sla_status)
+
+    def test_sla_in_responses(self):
+        ticket = self.create('Late', hours_ago=30)
+        self.authenticate(self.user_data3)
+        response = self.client.get(reverse('ticket_admin-detail', kwargs={'id': ticket.id}))
+        self.assertEqual(response.data['sla_status'], 'breached')
+        self.assertEqual(response.data['first_response_due'], ticket.first_response_due.isoformat().replace('+00:00', 'Z'))
+
+    def test_breaching_within_filter(self):
+        soon = self.create('Soon', hours_ago=3.5)  # first response due in 30 minutes
+        late = self.create('Late', hours_ago=30)
+        self.create('Answered', hours_ago=3.5, status='IN_PROGRESS')
+        self.authenticate(self.user_data3)
+
+        def ids(query):
+            response = self.client.get(self.admin_ticket_url, query)
+            self.assertEqual(response.status_code, 200)
+            return [ticket['id'] for ticket in response.data['results']]
+
+        self.assertEqual(ids({'sla_breaching_within': 10}), [])
+        self.assertEqual(ids({'sla_breaching_within': 60}), [soon.id])
+        self.assertEqual(ids({'sla_breached': 'true'}), [late.id])
+        self.assertEqual(self.client.get(self.admin_ticket_url, {'sla_breaching_within': 'soon'}).status_code, 400)
+
+    def test_sweep_reports_each_breach_once(self):
+        ticket = self.create('Late', hours_ago=5)  # first response was due an hour ago
+        start = timezone.now() - timedelta(hours=2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual([(ticket_id, deadline) for ticket_id, deadline, _ in sla.sweep(start, timezone.now())],
+                             [(ticket.id, sla.FIRST_RESPONSE)])
+        self.assertEqual(sla.sweep(timezone.now(), timezone.now() + timedelta(minutes=1)), [])
+        activity.flush()
+        self.assertEqual(list(TicketEvent.objects.values_list('ticket_id', 'action', 'field')),
+                         [(ticket.id, 'SLA_BREACHED', 'first_response')])
+
+    def breaches(self):
+        return list(TicketEvent.objects.filter(action='SLA_BREACHED').values_list('ticket_id', 'field'))
+
+    def test_priority_change_records_breach_behind_the_sweeper(self):
+        ticket = self.create('Late', hours_ago=3)  # MEDIUM: first response due in an hour
+        sla.sweep(timezone.now() - timedelta(hours=1), timezone.now())
+        self.assertEqual(self.breaches(), [])
+
+        ticket.priority = 'HIGH'  # due an hour after creation: two hours ago, before the last sweep
+        ticket.save()
+        self.assertEqual(self.breaches(), [(ticket.id, 'first_response')])
+
+        ticket.title = 'Still late'
+        ticket.save()
+        sla.sweep(timezone.now() - timedelta(hours=3), timezone.now())
+        self.assertEqual(self.breaches(), [(ticket.id, 'first_response')])
+
+    def test_recompute_records_breaches_it_moves_into_the_past(self):
+        ticket = self.create('Late', hours_ago=3)
+        with self.settings(TICKET_SLA_POLICIES={**settings.TICKET_SLA_POLICIES, 'MEDIUM': (1, 24)}):
+            sla.recompute_deadlines(Ticket.objects.filter(id=ticket.id))
+        self.assertEqual(self.breaches(), [(ticket.id, 'first_response')])
+
+    def test_commands(self):
+        ticket = self.create('Late', hours_ago=5)
+        out = StringIO()
+        call_command('sweep_sla_breaches', '--once', '--lookback', '180', stdout=out)
+        self.assertIn('Recorded 1 SLA breaches', out.getvalue())
+
+        call_command('recompute_sla_deadlines', stdout=out)
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.resolve_due - ticket.created_at, timedelta(hours=24))
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncHour
+from django.urls import reverse
+from django.utils import timezone
+
+from .utils import BaseTest
+from .. import rollups
+from ..bulk import bulk_close_tickets
+from ..models import Ticket, TicketHourlyStats
+
+
+class TicketStatsTests(BaseTest):
+
+    def stats(self):
+        rows = TicketHourlyStats.objects.filter(count__gt=0).values_list(*rollups.KEY_FIELDS, 'count')
+        return {tuple(row[:5]): row[5] for row in rows}
+
+    def expected(self):
+        rows = (Ticket.objects.values(hour=TruncHour('created_at'))
+                .annotate(completer=Coalesce('completed_by_id', 0), total=Count('id'))
+                .values_list('hour', 'status', 'priority', 'created_by_id', 'completer', 'total'))
+        return {tuple(row[:5]): row[5] for row in rows}
+
+    def test_rollup_follows_ticket_writes(self):
+        self.assertEqual(self.stats(), self.expected())
+
+        ticket = Ticket.objects.create(title="Third", description="d", created_by=self.user1)
+        ticket.status = Ticket.Status.CLOSED
+        ticket.completed_by = self.user2
+        ticket.save()
+        self.ticket1.priority = Ticket.Priority.HIGH
+        self.ticket1.save(update_fields=['priority'])
+        Ticket.objects.only('id', 'title').get(pk=self.ticket2.pk).save()
+        self.assertEqual(self.stats(), self.expected())
+
+        self.ticket2.delete()
+        bulk_close_tickets([self.ticket1.id])
+        self.assertEqual(self.stats(), self.expected())
+
+    def test_rollup_moves_stored_row_not_loaded_one(self):
+        first, second = Ticket.objects.get(pk=self.ticket1.pk), Ticket.objects.get(pk=self.ticket1.pk)
+        first.status = Ticket.Status.CLOSED
+        first.save()
+        # loaded as OPEN before the close: the rollup must still move the ticket out of CLOSED
+        second.status = Ticket.Status.IN_PROGRESS
+        second.save()
+        self.assertEqual(self.stats(), self.expected())
+
+    def test_refresh_hours_keeps_concurrently_added_rows(self):
+        rollups.add((rollups.hour_of(self.ticket1.created_at), 'CLOSED', 'LOW', self.user1.id, 0), 1)
+        rollups.refresh_hours([self.ticket1.created_at])
+        self.assertEqual(self.stats(), self.expected())
+
+    def test_rebuild_command(self):
+        TicketHourlyStats.objects.update(count=100)
+        call_command('rebuild_ticket_stats', stdout=StringIO())
+        self.assertEqual(self.stats(), self.expected())
+
+    def test_tickets_created(self):
+        self.authenticate(self.user_data3)
+        now = timezone.now()
+        Ticket.objects.filter(pk=self.ticket2.pk).update(created_at=now - timedelta(days=2))
+        call_command('rebuild_ticket_stats', stdout=StringIO())
+
+        url = reverse('ticket_admin-tickets-created')
+        for start, end, count in [(now - timedelta(days=3), now + timedelta(hours=1), 2),
+                                  (now - timedelta(days=1), now + timedelta(days=1), 1),
+                                  (now - timedelta(days=3), now - timedelta(days=1), 1),
+                                  (now - timedelta(minutes=1), now + timedelta(minutes=1), 1)]:
+            response = self.client.post(url, {'created_first': start.isoformat(), 'created_second': end.isoformat()},
+                                        format='json')
+            self.assertEqual(response.data, {'result': count})
+
+    def test_most_active_support(self):
+        self.authenticate(self.user_data3)
+        Ticket.objects.create(title="Done", description="d", created_by=self.user1, completed_by=self.user2,
+                              status=Ticket.Status.CLOSED)
+
+        response = self.client.get(reverse('ticket_admin-most-active-support'))
+        self.assertEqual(response.data, {'most_active_support': [{'completed_by': self.user2.id, 'total': 3}]})
+
+    def test_histogram(self):
+        self.authenticate(self.user_data3)
+        now = timezone.now()
+        url = reverse('ticket_admin-histogram')
+        params = {'start': (now - timedelta(days=1)).isoformat(), 'end': (now + timedelta(hours=1)).isoformat()}
+
+        response = self.client.get(url, {**params, 'bucket': 'hour', 'group_by': 'priority'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(row['count'] for row in response.data['results']), 2)
+        self.assertEqual({row['priority'] for row in response.data['results']},
+                         set(Ticket.objects.values_list('priority', flat=True)))
+
+        response = self.client.get(url, params)
+        self.assertEqual([row['count'] for row in response.data['results']],
+                         [TicketHourlyStats.objects.aggregate(total=Sum('count'))['total']])
+
+        response = self.client.get(url, {**params, 'group_by': 'title'})
+        self.assertEqual(response.status_code, 400)
+        self.authenticate(self.user_data1)
+        self.assertEqual(self.client.get(url, params).status_code, 403)
@@ -0,0 +1,59 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .utils import BaseTest
+from ..models import Ticket
+
+
+class UniqueTitleTests(BaseTest):
+
+    def title_lookups(self, context):
+        return [query['sql'] for query in context.captured_queries
+                if query['sql'].startswith('SELECT') and '"ticket_ticket"."title" =' in query['sql']]
+
+    def test_create_relies_on_index(self):
+        self.authenticate(self.user_data1)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.user_ticket_url, {"title": "New title", "description": "Text"},
+                                        format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.title_lookups(context), [])
+
+    def test_duplicate_title_same_response_in_both_modes(self):
+        self.authenticate(self.user_data1)
+        data = {"title": self.ticket1.title, "description": "Text"}
+
+        response = self.client.post(self.user_ticket_url, data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"title": ["This field must be unique."]})
+
+        with override_settings(UNIQUE_CHECKS='query'):
+            expected = self.client.post(self.user_ticket_url, data, format='json')
+        self.assertEqual(response.data, expected.data)
+        self.assertEqual(Ticket.objects.filter(title=self.ticket1.title).count(), 1)
+
+    def test_update_keeps_own_title(self):
+        self.authenticate(self.user_data3)
+        response = self.client.patch(self.admin_ticket_url_detail, {"title": self.ticket1.title}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.patch(self.admin_ticket_url_detail, {"title": self.ticket2.title}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"title": ["This field must be unique."]})
+
+    def test_bulk_title_taken_concurrently(self):
+        self.authenticate(self.user_data3)
+        items = [{"title": title, "description": "Text", "created_by": self.user1.id}
+                 for title in ("Bulk 1", self.ticket1.title)]
+
+        # the first check misses the clash, as if ticket1 had been created right after it
+        with mock.patch('ticket.bulk.taken_titles', side_effect=[{}, {self.ticket1.title: self.ticket1.id}]):
+            response = self.client.post(self.admin_ticket_url + 'bulk/', data=items, format='json')
+
+        results = response.data['results']
+        self.assertEqual(results[0]['status'], 'created')
+        self.assertEqual(results[1]['errors'], {'title': ['This field must be unique.']})
+        self.assertTrue(Ticket.objects.filter(title="Bulk 1").exists())
@@ -1,4 +1,4 @@
-from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from .models import Ticket, SupportTicketMarks
@@ -7,25 +7,35 @@ from rest_framework.exceptions import MethodNotAllowed
 from .serializers import (TicketCreateSerializer, TicketResponseSerializer, TicketUpdateSerializer,
                           AdminTicketCreateSerializer, AdminTicketUpdateSerializer, AdminTicketResponseSerializer,
                           SupportTicketResponseSerializer, SupportUpdateTicketSerializer, SupportCreateMarksSerializer,
-                          SupportResponseMarksSerializer, SupportUpdateMarksSerializer, AdminCreatedTicketsSerializer, )
+                          SupportResponseMarksSerializer, SupportUpdateMarksSerializer, AdminCreatedTicketsSerializer,
+                          AdminBulkTicketCloseSerializer, AdminTicketHistogramSerializer, )
 
 from rest_framework.decorators import action
 from users.permissions import (IsSuperUserPermission, IsSupportPermission)
+from users.response_cache import TICKETS, cached_list
 from rest_framework.response import Response
 from .permissions import IsOwnerPermission, IsAssignedTo, IsOwnerPermissionMarks, IsAssignedToMarks
+from .pagination import TicketPagination
+from .conditional import ConditionalTicketMixin
+from .activity import TicketActivityMixin
+from .search import TicketSearchFilter
+from .sla import SLAFilter
+from .export import EXPORT_FORMATS
+from . import rollups
+from .bulk import bulk_create_tickets, bulk_update_tickets, bulk_close_tickets
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from django.utils import timezone
 
-from users.models import CustomUser
 
-
-class UserTicketViewSet(viewsets.ModelViewSet):
-    queryset = Ticket.objects.all()
+class UserTicketViewSet(TicketActivityMixin, ConditionalTicketMixin, viewsets.ModelViewSet):
+    queryset = Ticket.objects.for_user()
+    pagination_class = TicketPagination
     lookup_field = 'id'
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
-    filterset_fields = ['id', 'status']
-    ordering_fields = ['id', 'status']
+    filter_backends = [DjangoFilterBackend, OrderingFilter, TicketSearchFilter]
+    filterset_fields = ['id', 'status', 'comment_count', 'assignee_count']
+    ordering_fields = ['id', 'status', 'comment_count', 'assignee_count', 'last_activity_at']
+    ordering = ['id']
     search_fields = ['title']
 
     def get_serializer_class(self):
@@ -48,18 +58,12 @@ class UserTicketViewSet(viewsets.ModelViewSet):
         return Response(TicketResponseSerializer(serializer.instance, context={'request': request}).data, status=201)
 
     def retrieve(self, request, *args, **kwargs):
-        ticket = self.get_object()
-        return Response(TicketResponseSerializer(ticket, context={'request': request}).data, status=200)
+        return self.conditional_retrieve(request, TicketResponseSerializer)
 
+    @cached_list(TICKETS)
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset()).filter(created_by=request.user.id).order_by('id')
-        page = self.paginate_queryset(queryset)
-
-        if page is not None:
-            serializer = TicketResponseSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
-
-        return Response(TicketResponseSerializer(queryset, context={'request': request}, many=True).data, status=200)
+        queryset = self.filter_queryset(self.get_queryset()).filter(created_by=request.user.id)
+        return self.conditional_list(request, queryset, TicketResponseSerializer)
 
     def update(self, request, *args, **kwargs):
         ticket = self.get_object()
@@ -88,13 +92,16 @@ class UserTicketViewSet(viewsets.ModelViewSet):
         return Response({'message': 'Ticket has been closed'}, status=200)
 
 
-class SupportTicketViewSet(viewsets.ModelViewSet):
-    queryset = Ticket.objects.all()
+class SupportTicketViewSet(TicketActivityMixin, ConditionalTicketMixin, viewsets.ModelViewSet):
+    queryset = Ticket.objects.for_support()
+    pagination_class = TicketPagination
     permission_classes = [IsSupportPermission, IsAssignedTo, IsOwnerPermission]
     lookup_field = 'id'
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
-    filterset_fields = ['id', 'status', 'priority']
-    ordering_fields = ['id', 'status', 'priority']
+    filter_backends = [DjangoFilterBackend, OrderingFilter, TicketSearchFilter, SLAFilter]
+    filterset_fields = ['id', 'status', 'priority', 'comment_count', 'mark_count', 'assignee_count']
+    ordering_fields = ['id', 'status', 'priority', 'comment_count', 'mark_count', 'assignee_count',
+                       'last_activity_at', 'first_response_due', 'resolve_due']
+    ordering = ['id']
     search_fields = ['title']
 
     def get_permissions(self):
@@ -107,19 +114,12 @@ class SupportTicketViewSet(viewsets.ModelViewSet):
         raise MethodNotAllowed('POST')
 
     def retrieve(self, request, *args, **kwargs):
-        ticket = self.get_object()
-        support_marks = SupportTicketMarks.objects.filter(ticket=ticket)
-        return Response(SupportTicketResponseSerializer(ticket, context={'request': request}).data, status=200)
+        return self.conditional_retrieve(request, SupportTicketResponseSerializer)
 
+    @cached_list(TICKETS)
     def list(self, request, *args, **kwargs):
-        tickets = self.filter_queryset(self.get_queryset()).filter(assigned_to=request.user.id).order_by('id')
-        page = self.paginate_queryset(tickets)
-        if page is not None:
-            serializer = SupportTicketResponseSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
-
-        return Response(SupportTicketResponseSerializer(tickets, context={'request': request}, many=True).data,
-                        status=200)
+        tickets = self.filter_queryset(self.get_queryset()).assigned_to_user(request.user)
+        return self.conditional_list(request, tickets, SupportTicketResponseSerializer)
 
     def update(self, request, *args, **kwargs):
         ticket = self.get_object()
@@ -135,11 +135,10 @@ class SupportTicketViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         ticket = self.get_object()
-        user = CustomUser.objects.get(id=request.user.id)
 
         ticket.status = Ticket.Status.CLOSED
         ticket.closed_at = timezone.now()
-        ticket.completed_by = user
+        ticket.completed_by = request.user
 
         ticket.save()
         return Response({'message': 'Ticket has been closed'}, status=200)
@@ -225,16 +224,29 @@ class SupportTicketMarksViewSet(viewsets.ModelViewSet):
         mark.save()
         return Response({'message': 'Mark has been deleted'})
 
-class AdminTicketViewSet(viewsets.ModelViewSet):
-    queryset = Ticket.objects.all()
+class AdminTicketViewSet(TicketActivityMixin, ConditionalTicketMixin, viewsets.ModelViewSet):
+    queryset = Ticket.objects.for_admin()
+    pagination_class = TicketPagination
     permission_classes = [IsSuperUserPermission]
     serializer_class = AdminTicketResponseSerializer
     lookup_field = 'id'
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
-    filterset_fields = ['id', 'status', 'priority', 'assigned_to__id', 'created_by__id']
+    filter_backends = [DjangoFilterBackend, OrderingFilter, TicketSearchFilter, SLAFilter]
+    filterset_fields = {
+        'id': ['exact'],
+        'status': ['exact'],
+        'priority': ['exact'],
+        'assigned_to__id': ['exact'],
+        'created_by__id': ['exact'],
+        'comment_count': ['exact', 'gte', 'lte'],
+        'mark_count': ['exact', 'gte', 'lte'],
+        'assignee_count': ['exact', 'gte', 'lte'],
+        'last_activity_at': ['gte', 'lte'],
+    }
     search_fields = ['title', 'description']
-    ordering_fields = ['id', 'status', 'priority', 'created_at']
+    ordering_fields = ['id', 'status', 'priority', 'created_at', 'comment_count', 'mark_count', 'assignee_count',
+                       'last_activity_at', 'first_response_due', 'resolve_due']
     ordering = ['id']
+    bulk_max_items = 500
 
     def create(self, request, *args, **kwargs):
         serializer = AdminTicketCreateSerializer(data=request.data, context={'request': request})
@@ -244,18 +256,11 @@ class AdminTicketViewSet(viewsets.ModelViewSet):
                         status=201)
 
     def list(self, request, *args, **kwargs):
-        tickets = self.filter_queryset(self.get_queryset()).order_by('id')
-        page = self.paginate_queryset(tickets)
-        if page is not None:
-            serializer = AdminTicketResponseSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
-
-        serializer = AdminTicketResponseSerializer(tickets, many=True, context={'request': request})
-        return Response(serializer.data, status=200)
+        tickets = self.filter_queryset(self.get_queryset())
+        return self.conditional_list(request, tickets, AdminTicketResponseSerializer)
 
     def retrieve(self, request, *args, **kwargs):
-        ticket = self.get_object()
-        return Response(AdminTicketResponseSerializer(ticket, context={'request': request}).data, status=200)
+        return self.conditional_retrieve(request, AdminTicketResponseSerializer)
 
     def update(self, request, *args, **kwargs):
         ticket = self.get_object()
@@ -329,14 +334,62 @@ class AdminTicketViewSet(viewsets.ModelViewSet):
         created_first = serializer.validated_data['created_first']
         created_second = serializer.validated_data['created_second']
 
-        count = Ticket.objects.filter(created_at__gt=created_first, created_at__lt=created_second).count()
+        count = rollups.count_created(created_first, created_second)
 
         return Response({"result": count}, status=200)
 
     @action(detail=False, methods=['get'], url_path='most_active')
     def most_active_support(self, request, id=None, mark_id=None):
-        queryset = Ticket.objects.values('completed_by').filter(completed_by__isnull=False)
-        max_count = queryset.annotate(total=Count("id")).aggregate(Max("total"))["total__max"]
-        most_active = queryset.annotate(total=Count("id")).filter(total=max_count)
+        return Response({"most_active_support": rollups.most_active_support()}, status=200)
+
+    @action(detail=False, methods=['get'], url_path='histogram')
+    def histogram(self, request, id=None, mark_id=None):
+        """Tickets created per hour/day in [start, end), served from the hourly rollup."""
+        serializer = AdminTicketHistogramSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        data = serializer.validated_data
+        buckets = rollups.histogram(data['start'], data['end'], data['bucket'], data.get('group_by'))
+        return Response({"bucket": data['bucket'], "results": buckets}, status=200)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request, id=None, mark_id=None):
+        """Stream every ticket matching the list filters as NDJSON (default) or CSV (`?export_format=csv`)."""
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response({"error": f"Unsupported export format: {export_format}"}, status=400)
+
+        stream, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream(self.filter_queryset(self.get_queryset())), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="tickets.{export_format}"'
+        return response
+
+    def check_bulk_size(self, items):
+        if not isinstance(items, list) or not items:
+            return Response({"error": "Expected a non-empty list"}, status=400)
+        if len(items) > self.bulk_max_items:
+            return Response({"error": f"At most {self.bulk_max_items} items per request"}, status=400)
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request, id=None, mark_id=None):
+        """Create (POST) or partially update (PATCH) a list of tickets; returns one result or error per item."""
+        error = self.check_bulk_size(request.data)
+        if error:
+            return error
+
+        if request.method == 'POST':
+            return Response({"results": bulk_create_tickets(request.data)}, status=200)
+        return Response({"results": bulk_update_tickets(request.data)}, status=200)
+
+    @action(detail=False, methods=['post'], url_path='bulk/close')
+    def bulk_close(self, request, id=None, mark_id=None):
+        serializer = AdminBulkTicketCloseSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        error = self.check_bulk_size(ids)
+        if error:
+            return error
 
-        return Response({"most_active_support": list(most_active)}, status=200)
+        return Response({"results": bulk_close_tickets(ids)}, status=200)
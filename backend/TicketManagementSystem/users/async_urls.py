@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .async_views import users_me
+
+urlpatterns = [
+    path('me/', users_me, name='async_users_me'),
+]
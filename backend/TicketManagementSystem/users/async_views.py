@@ -0,0 +1,65 @@
+import functools
+
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .authentication import CachedJWTAuthentication
+from .models import CustomUser
+from .serializers import UserResponseSerializer
+
+
+def json_response(data, status=200, headers=None):
+    return HttpResponse(JSONRenderer().render(data), status=status, headers=headers,
+                        content_type='application/json')
+
+
+def error_response(exc):
+    detail = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+    headers = None
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        headers = {'WWW-Authenticate': CachedJWTAuthentication().authenticate_header(None)}
+    return json_response(detail, status=exc.status_code, headers=headers)
+
+
+def async_api_view(roles=None):
+    """
+    Turns `async def view(request, ...)` into a read-only JSON endpoint that runs on the event loop:
+    JWT authentication and role checks are awaited, DRF exceptions become DRF-style error responses.
+    The view receives a DRF `Request`, so query_params and serializer hyperlinks work as in the sync API.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in ('GET', 'HEAD'):
+                    raise exceptions.MethodNotAllowed(request.method)
+
+                authenticated = await CachedJWTAuthentication().aauthenticate(request)
+                if authenticated is None:
+                    raise exceptions.NotAuthenticated()
+                user, token = authenticated
+
+                if roles is not None and user.role not in roles:
+                    raise exceptions.PermissionDenied()
+
+                drf_request = Request(request)
+                drf_request.user, drf_request.auth = user, token
+                return await view(drf_request, *args, **kwargs)
+            except Http404:
+                return error_response(exceptions.NotFound())
+            except exceptions.APIException as exc:
+                return error_response(exc)
+
+        return wrapper
+
+    return decorator
+
+
+@async_api_view()
+async def users_me(request):
+    # request.user only has the fields authentication caches
+    user = await CustomUser.objects.aget(pk=request.user.pk)
+    return json_response(UserResponseSerializer(user, context={'request': request}).data)
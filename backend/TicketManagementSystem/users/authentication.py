@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def user_cache_key(user_id):
+    return f"auth_user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+    transaction.on_commit(lambda: cache.delete(user_cache_key(user_id)))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that keeps what authentication needs of the user (id, role, is_active and the
+    password hash's revoke claim, never the hash itself) in the cache for AUTH_USER_CACHE_TIMEOUT
+    seconds. Entries are dropped whenever the user is saved or deleted (see users.signals), and the
+    active and revoke checks run on cache hits too. On a hit request.user has only those fields
+    loaded; the others are fetched when first read.
+    """
+    cached_fields = ('id', 'is_active', 'role')  # in model field order, as from_db() takes them
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        entry = cache.get(key)
+        if entry is not None:
+            return self.cached_user(entry, validated_token)
+
+        user = super().get_user(validated_token)
+        cache.set(key, self.cache_entry(user), settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
+
+    def cache_entry(self, user):
+        revoke_claim = get_md5_hash_password(user.password) if api_settings.CHECK_REVOKE_TOKEN else None
+        return [getattr(user, field) for field in self.cached_fields] + [revoke_claim]
+
+    def cached_user(self, entry, validated_token):
+        *values, revoke_claim = entry
+        user = self.user_model.from_db(DEFAULT_DB_ALIAS, self.cached_fields, values)
+        self.check_user(user, validated_token, revoke_claim)
+        return user
+
+    def check_user(self, user, validated_token, revoke_claim):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != revoke_claim:
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+    async def aauthenticate(self, request):
+        """`authenticate` for async views: token checks are pure CPU, the user comes from the cache or `aget`."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = user_cache_key(user_id)
+        entry = await cache.aget(key)
+        if entry is not None:
+            return self.cached_user(entry, validated_token)
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        entry = self.cache_entry(user)
+        self.check_user(user, validated_token, entry[-1])
+        await cache.aset(key, entry, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
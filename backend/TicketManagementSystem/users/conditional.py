@@ -0,0 +1,27 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+
+
+def make_etag(*parts):
+    """Weak ETag over the values a response body is derived from."""
+    return 'W/"%s"' % hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def has_conditional_headers(request):
+    return 'If-None-Match' in request.headers
+
+
+# Responses are validated by ETag only: no Last-Modified is sent, so If-Modified-Since is never
+# answered with a 304. A timestamp cannot tell that a row left a list or that sla_status moved on.
+def not_modified(request, etag):
+    """A 304 response if the client's copy is still current, else None."""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        set_validators(response, etag)
+    return response
+
+
+def set_validators(response, etag):
+    response['ETag'] = etag
+    return response
@@ -51,5 +51,11 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'username'
     REQUIRED_FIELDS = ['email']
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date_joined'], name='users_date_joined_idx'),
+            models.Index(fields=['role', 'is_active'], name='users_role_active_idx'),
+        ]
+
     def __str__(self):
         return self.username
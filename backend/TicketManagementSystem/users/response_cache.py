@@ -0,0 +1,69 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+TICKETS = 'tickets'  # tickets, marks, comments and assignments
+USERS = 'users'
+
+GENERATION_KEY = 'list_cache:generation:{}'
+
+
+def generation(scope):
+    return cache.get_or_set(GENERATION_KEY.format(scope), 1, None)
+
+
+def bump_generation(scope):
+    """
+    Orphan every cached list response of `scope` at once by moving its generation counter. Bumped now
+    and again on commit, so a response cached from pre-commit data in between is orphaned too.
+    """
+    def bump():
+        try:
+            cache.incr(GENERATION_KEY.format(scope))
+        except ValueError:
+            cache.set(GENERATION_KEY.format(scope), 1, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def list_cache_key(request, scope):
+    query = hashlib.md5(request.get_full_path().encode(), usedforsecurity=False).hexdigest()
+    return f'list_cache:{scope}:{generation(scope)}:{request.user.id}:{request.user.role}:{query}'
+
+
+def cached_list(scope):
+    """
+    Cache a viewset/APIView `list` response per user, role, path + query string and generation of
+    `scope`. Only the response data and validators are stored; rendering still follows the request's
+    Accept header, and If-None-Match is answered from the cached ETag.
+    """
+    def decorator(list_method):
+        @wraps(list_method)
+        def wrapper(self, request, *args, **kwargs):
+            timeout = settings.LIST_CACHE_TIMEOUT
+            if not timeout:
+                return list_method(self, request, *args, **kwargs)
+
+            key = list_cache_key(request, scope)
+            cached = cache.get(key)
+            if cached is None:
+                response = list_method(self, request, *args, **kwargs)
+                if response.status_code == 200:
+                    cache.set(key, (response.data, response.get('ETag')), timeout)
+                return response
+
+            data, etag = cached
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = Response(data, status=200)
+            if etag:
+                response['ETag'] = etag
+            return response
+        return wrapper
+    return decorator
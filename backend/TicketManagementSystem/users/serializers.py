@@ -2,17 +2,17 @@ from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
 from .models import CustomUser
-from rest_framework.validators import UniqueValidator
+from .unique import IndexedUniqueValidator, UniqueIndexMixin
 
-class BaseUserSerializer(serializers.HyperlinkedModelSerializer):
+class BaseUserSerializer(UniqueIndexMixin, serializers.HyperlinkedModelSerializer):
     username = serializers.CharField(
-        validators=[UniqueValidator(
+        validators=[IndexedUniqueValidator(
             queryset=CustomUser.objects.all(),
             message="This username is already in use."
         )], required=False
     )
     email = serializers.EmailField(
-        validators=[UniqueValidator(
+        validators=[IndexedUniqueValidator(
             queryset=CustomUser.objects.all(),
             message="This email is already in use."
         )], required=False
@@ -29,12 +29,12 @@ class BaseUserSerializer(serializers.HyperlinkedModelSerializer):
 
 # USER SERIALIZERS#
 class UserCreateSerializer(BaseUserSerializer):
-    username = serializers.CharField(validators=[UniqueValidator(
+    username = serializers.CharField(validators=[IndexedUniqueValidator(
         queryset=CustomUser.objects.all(),
         message="This username is already in use."
     )], required=True)
 
-    email = serializers.EmailField(validators=[UniqueValidator(
+    email = serializers.EmailField(validators=[IndexedUniqueValidator(
         queryset=CustomUser.objects.all(),
         message="This email is already in use."
     )], required=True)
@@ -87,11 +87,11 @@ class UserResponseSerializer(BaseUserSerializer):
 
 # ADMIN SERIALIZERS#
 class AdminCreateUserSerializer(BaseUserSerializer):
-    username = serializers.CharField(validators=[UniqueValidator(
+    username = serializers.CharField(validators=[IndexedUniqueValidator(
         queryset=CustomUser.objects.all(),
         message="This username is already in use."
     )], required=True)
-    email = serializers.EmailField(validators=[UniqueValidator(
+    email = serializers.EmailField(validators=[IndexedUniqueValidator(
         queryset=CustomUser.objects.all(),
         message="This email is already in use."
     )], required=True)
@@ -173,3 +173,9 @@ class AdminResponseUserSerializer(BaseUserSerializer):
 class AdminUserRegisteredStatsSerializer(serializers.Serializer):
     start_date = serializers.DateTimeField(required=True)
     end_date = serializers.DateTimeField(required=True)
+
+
+class AdminUserStatsSerializer(serializers.Serializer):
+    period = serializers.ChoiceField(choices=['day', 'week', 'month'], default='month')
+    start_date = serializers.DateTimeField(required=False)
+    end_date = serializers.DateTimeField(required=False)
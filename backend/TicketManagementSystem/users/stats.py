@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import Trunc
+
+from .models import CustomUser, Role
+
+PERIODS = ('day', 'week', 'month')
+VERSION_KEY = "user_stats:version"
+
+
+def stats_version():
+    return cache.get_or_set(VERSION_KEY, 1, None)
+
+
+def invalidate_user_stats():
+    """Cached statistics are keyed by a version number; bumping it orphans every cached variant at once."""
+    def bump():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, 1, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def compute_user_stats(period='month', start=None, end=None):
+    """
+    Active/inactive totals, users per role and registrations per period, in a single grouped query:
+    every row is one registration period with conditional counts, totals are summed from the rows.
+    """
+    in_range = Q()
+    if start is not None:
+        in_range &= Q(date_joined__gte=start)
+    if end is not None:
+        in_range &= Q(date_joined__lte=end)
+
+    roles = {f'role_{role}': Count('id', filter=Q(role=role)) for role in Role.values}
+    rows = (CustomUser.objects.order_by()
+            .values(period_start=Trunc('date_joined', period))
+            .annotate(active=Count('id', filter=Q(is_active=True)), inactive=Count('id', filter=Q(is_active=False)),
+                      registered=Count('id', filter=in_range), **roles)
+            .order_by('period_start'))
+
+    result = {
+        'active': 0,
+        'inactive': 0,
+        'by_role': dict.fromkeys(Role.values, 0),
+        'registrations': {'period': period, 'results': []},
+    }
+    for row in rows:
+        result['active'] += row['active']
+        result['inactive'] += row['inactive']
+        for role in Role.values:
+            result['by_role'][role] += row[f'role_{role}']
+        if row['registered']:
+            result['registrations']['results'].append({'period_start': row['period_start'],
+                                                       'count': row['registered']})
+    result['total'] = result['active'] + result['inactive']
+    return result
+
+
+def get_user_stats(period='month', start=None, end=None):
+    key = "user_stats:{}:{}:{}:{}".format(stats_version(), period, start and start.isoformat(),
+                                          end and end.isoformat())
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_user_stats(period, start, end)
+        cache.set(key, stats, settings.USER_STATS_CACHE_TIMEOUT)
+    return stats
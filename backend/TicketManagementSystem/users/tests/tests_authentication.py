@@ -0,0 +1,87 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.settings import api_settings
+
+from ..authentication import user_cache_key
+from ..models import CustomUser
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_data = {
+            "username": "some_user1",
+            "email": "some_example1@mail.com",
+            "password": "Dsdasj2dskl1"
+        }
+
+        cls.user = CustomUser.objects.create_user(**cls.user_data)
+        cls.me_url = reverse('users_me')
+
+    def setUp(self):
+        cache.clear()
+        token_response = self.client.post(reverse('token_obtain_pair'), {
+            "username": self.user_data["username"],
+            "password": self.user_data["password"],
+        }, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token_response.data['access'])
+
+    def test_me_authenticated_without_users_query(self):
+        self.client.get(self.me_url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.me_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], self.user_data['username'])
+        # only the profile itself is read
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_cache_holds_no_password_hash(self):
+        self.client.get(self.me_url)
+        entry = cache.get(user_cache_key(self.user.id))
+        self.assertEqual(entry, [self.user.id, True, self.user.role, None])
+        self.assertNotIn(self.user.password, map(str, entry))
+
+    def access_token(self, password):
+        return self.client.post(reverse('token_obtain_pair'), {
+            "username": self.user_data["username"],
+            "password": password,
+        }, format='json').data['access']
+
+    def test_revoked_token_rejected_on_cache_hit(self):
+        with mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True):
+            old_token = self.access_token(self.user_data["password"])
+            self.user.set_password("Other-password-1")
+            self.user.save()
+
+            # the entry is cached again by a request with a token for the new password
+            self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.access_token("Other-password-1"))
+            self.assertEqual(self.client.get(self.me_url).status_code, 200)
+
+            self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + old_token)
+            self.assertEqual(self.client.get(self.me_url).status_code, 401)
+
+    def test_cache_invalidated_on_save(self):
+        self.client.get(self.me_url)
+
+        self.user.username = "renamed_user"
+        self.user.save()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.data['username'], "renamed_user")
+
+    def test_cache_invalidated_on_deactivation(self):
+        self.client.get(self.me_url)
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from ..models import CustomUser
+from ..response_cache import USERS, generation
+
+
+@override_settings(LIST_CACHE_TIMEOUT=60)
+class AdminUserListCacheTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_data = {"username": "admin", "email": "admin@mail.com", "password": "Dsdasj2dskl1"}
+        CustomUser.objects.create_superuser(**cls.admin_data)
+        cls.list_url = reverse('admin_create_user')
+
+    def setUp(self):
+        cache.clear()
+        token_response = self.client.post(reverse('token_obtain_pair'), {
+            "username": self.admin_data["username"],
+            "password": self.admin_data["password"],
+        }, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token_response.data['access'])
+
+    def usernames(self):
+        return [user['username'] for user in self.client.get(self.list_url).data['results']]
+
+    def test_user_writes_bump_generation(self):
+        self.assertEqual(self.usernames(), ["admin"])
+        before = generation(USERS)
+
+        CustomUser.objects.create_user(username="user", email="user@mail.com", password="Dsdasj2dskl1")
+        self.assertGreater(generation(USERS), before)
+        self.assertEqual(self.usernames(), ["admin", "user"])
+
+        CustomUser.objects.filter(username="user").delete()
+        self.assertEqual(self.usernames(), ["admin"])
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from ..models import CustomUser, Role
+
+
+class AdminUserStatsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_data = {"username": "admin", "email": "admin@mail.com", "password": "Dsdasj2dskl1"}
+        CustomUser.objects.create_superuser(**cls.admin_data)
+        CustomUser.objects.create_user(username="user", email="user@mail.com", password="Dsdasj2dskl1")
+        CustomUser.objects.create_user(username="support", email="support@mail.com", password="Dsdasj2dskl1",
+                                       role=Role.SUPPORT, is_active=False)
+        cls.old = CustomUser.objects.create_user(username="old", email="old@mail.com", password="Dsdasj2dskl1")
+        CustomUser.objects.filter(pk=cls.old.pk).update(date_joined=timezone.now() - timedelta(days=400))
+        cls.stats_url = reverse('admin_user_stats')
+
+    def setUp(self):
+        cache.clear()
+        token_response = self.client.post(reverse('token_obtain_pair'), {
+            "username": self.admin_data["username"],
+            "password": self.admin_data["password"],
+        }, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token_response.data['access'])
+
+    def test_stats(self):
+        response = self.client.get(self.stats_url, {'period': 'day'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['total'], response.data['active'], response.data['inactive']), (4, 3, 1))
+        self.assertEqual(response.data['by_role'], {'USER': 2, 'SUPPORT': 1, 'ADMIN': 1})
+        self.assertEqual([row['count'] for row in response.data['registrations']['results']], [1, 3])
+
+        start = (timezone.now() - timedelta(days=30)).isoformat()
+        response = self.client.get(self.stats_url, {'period': 'week', 'start_date': start})
+        self.assertEqual([row['count'] for row in response.data['registrations']['results']], [3])
+        self.assertEqual(response.data['total'], 4)
+
+    def test_stats_cached_until_user_write(self):
+        self.client.get(self.stats_url)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.stats_url)
+        self.assertEqual(len(context.captured_queries), 0)
+
+        CustomUser.objects.filter(username="user").get().delete()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.stats_url)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(response.data['total'], 3)
+
+    def test_invalid_period(self):
+        response = self.client.get(self.stats_url, {'period': 'year'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,33 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from ..models import CustomUser
+
+
+class UniqueUserFieldsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        CustomUser.objects.create_user(username="taken", email="taken@mail.com", password="Dsdasj2dskl1")
+
+    def test_register_duplicates(self):
+        data = {"username": "taken", "email": "taken@mail.com", "password": "Dsdasj2dskl1"}
+        response = self.client.post(reverse('user-list'), data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"username": ["This username is already in use."],
+                                         "email": ["This email is already in use."]})
+
+        data["username"] = "fresh"
+        response = self.client.post(reverse('user-list'), data, format='json')
+        self.assertEqual(response.data, {"email": ["This email is already in use."]})
+
+    def test_register_without_lookup(self):
+        data = {"username": "fresh", "email": "fresh@mail.com", "password": "Dsdasj2dskl1"}
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(reverse('user-list'), data, format='json')
+        self.assertEqual(response.status_code, 201)
+        lookups = [query['sql'] for query in context.captured_queries
+                   if '"users_customuser"."username" =' in query['sql']]
+        self.assertEqual(lookups, [])
@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+
+class IndexedUniqueValidator(UniqueValidator):
+    """
+    UniqueValidator that only runs its SELECT when UNIQUE_CHECKS is 'query'. In 'index' mode the unique
+    index decides at write time and UniqueIndexMixin reports the violation with this validator's message.
+    """
+
+    def __call__(self, value, serializer_field):
+        if settings.UNIQUE_CHECKS == 'query':
+            super().__call__(value, serializer_field)
+
+
+class UniqueIndexMixin:
+    """
+    Serializer mixin: `save()` runs in a savepoint and a unique violation becomes the same 400 the
+    UniqueValidators would have raised. Which fields clashed is looked up with one query, only on failure.
+    """
+
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            errors = self.unique_errors()
+            if not errors:
+                raise
+            raise serializers.ValidationError(errors)
+
+    def unique_errors(self):
+        checks = {}
+        for name, field in self.fields.items():
+            for validator in field.validators:
+                if isinstance(validator, UniqueValidator) and field.source in self.validated_data:
+                    checks[field.source] = (name, validator)
+        if not checks:
+            return {}
+
+        clash = Q()
+        for source in checks:
+            clash |= Q(**{source: self.validated_data[source]})
+        queryset = next(iter(checks.values()))[1].queryset.filter(clash)
+        if self.instance is not None:
+            queryset = queryset.exclude(pk=self.instance.pk)
+
+        errors = {}
+        for row in queryset.values(*checks):
+            for source, (name, validator) in checks.items():
+                if row[source] == self.validated_data[source]:
+                    errors[name] = [serializers.ErrorDetail(str(validator.message), code='unique')]
+        return errors
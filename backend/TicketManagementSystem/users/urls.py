@@ -3,7 +3,7 @@ from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from .views import (AdminListORCreateUserView, AdminChangeUserAPIView, AdminUsersByRoleStatsView,
-                    AdminUsersActiveInactiveStatsView, AdminUsersRegisteredStatsView,
+                    AdminUsersActiveInactiveStatsView, AdminUsersRegisteredStatsView, AdminUsersStatsView,
                     UserViewSet, UsersMeView)
 
 user_router = DefaultRouter()
@@ -16,6 +16,7 @@ admin_urlpatterns = [
     path('active_count/', AdminUsersActiveInactiveStatsView.as_view(), name='admin_count_active'),
     path('registered_count/', AdminUsersRegisteredStatsView.as_view(), name='admin_count_registered'),
     path('roles_count/', AdminUsersByRoleStatsView.as_view(), name='admin_count_roles'),
+    path('stats/', AdminUsersStatsView.as_view(), name='admin_user_stats'),
 ]
 
 urlpatterns = [
@@ -1,4 +1,5 @@
 from django.core.exceptions import ValidationError
+from django.db.models import Q
 from django.db.models.aggregates import Count
 from rest_framework.filters import SearchFilter, OrderingFilter
 from .models import CustomUser
@@ -9,7 +10,10 @@ from .permissions import (IsSuperUserPermission, IsOwnerPermission)
 from .serializers import (UserCreateSerializer, UserChangeSerializer,
                           UserResponseSerializer, AdminResponseUserSerializer,
                           AdminUpdateUserSerializer, AdminCreateUserSerializer,
-                          AdminUserRegisteredStatsSerializer)
+                          AdminUserRegisteredStatsSerializer, AdminUserStatsSerializer)
+from .stats import get_user_stats
+from .conditional import make_etag, not_modified, set_validators
+from .response_cache import USERS, cached_list
 
 from rest_framework.generics import (ListCreateAPIView)
 
@@ -29,12 +33,17 @@ class UserViewSet(ViewSet):
 
     def retrieve(self, request, *args, **kwargs):
         try:
-            user = CustomUser.objects.get(id=kwargs['id'])
-            self.check_object_permissions(request, user)
-            return Response(UserResponseSerializer(user, context={'request': request}).data, status=200)
+            user = CustomUser.objects.only('id', 'username', 'email').get(id=kwargs['id'])
         except CustomUser.DoesNotExist:
             return Response({"Error": "User not found"}, status=404)
 
+        self.check_object_permissions(request, user)
+        etag = make_etag(user.id, user.username, user.email)
+        response = not_modified(request, etag)
+        if response is None:
+            response = Response(UserResponseSerializer(user, context={'request': request}).data, status=200)
+        return set_validators(response, etag)
+
     def create(self, request, *args, **kwargs):
         try:
             serializer = UserCreateSerializer(data=request.data, context={'request': request})
@@ -76,7 +85,8 @@ class UsersMeView(APIView):
     permission_classes = [IsOwnerPermission]
 
     def get(self, request):
-        user = CustomUser.objects.get(id=request.user.id)
+        # request.user only has the fields authentication caches
+        user = CustomUser.objects.get(pk=request.user.pk)
         return Response(UserResponseSerializer(user, context={'request': request}).data, status=200)
 
 
@@ -93,6 +103,10 @@ class AdminListORCreateUserView(ListCreateAPIView):
     search_fields = ["username", "email"]
     ordering_fields = ["id", "role"]
 
+    @cached_list(USERS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def create(self, request, *args, **kwargs):
         try:
             serializer = (AdminCreateUserSerializer(data=request.data, context={'request': request}))
@@ -140,10 +154,9 @@ class AdminUsersActiveInactiveStatsView(APIView):
     permission_classes = [IsSuperUserPermission]
 
     def get(self, request, *args, **kwargs):
-        queryset = CustomUser.objects.all()
-        count_active = queryset.filter(is_active=True).count()
-        count_inactive = queryset.filter(is_active=False).count()
-        return Response({"Active": count_active, "Inactive": count_inactive})
+        counts = CustomUser.objects.aggregate(active=Count('id', filter=Q(is_active=True)),
+                                              inactive=Count('id', filter=Q(is_active=False)))
+        return Response({"Active": counts['active'], "Inactive": counts['inactive']})
 
 
 class AdminUsersRegisteredStatsView(APIView):
@@ -177,3 +190,15 @@ class AdminUsersByRoleStatsView(APIView):
     def get(self, request, *args, **kwargs):
         stats = CustomUser.objects.values("role").annotate(count=Count("role"))
         return Response({"users_by_role": stats})
+
+
+class AdminUsersStatsView(APIView):
+    """Return active/inactive, per-role and per-period registration counts in one response."""
+    permission_classes = [IsSuperUserPermission]
+
+    def get(self, request, *args, **kwargs):
+        serializer = AdminUserStatsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        return Response(get_user_stats(data['period'], data.get('start_date'), data.get('end_date')))